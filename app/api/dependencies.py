@@ -1,39 +1,121 @@
 """
 API dependencies
 """
+import asyncio
+import logging
+from typing import Optional
+from app.config import settings
+from app.models.base import SearchSource
 from app.services.jagriti_client import JagritiClient
 from app.services.case_service import CaseService
+from app.services.case_store import CaseStore
 from app.services.pdf_service import PDFService
+from app.services.sync_service import SyncService
 
-# Global instances
+logger = logging.getLogger(__name__)
+
+# Global instances, created and closed by the application lifespan
 _jagriti_client = None
 _case_service = None
 _pdf_service = None
+_case_store = None
+_sync_service = None
+_prewarm_task = None
 
-def get_jagriti_client() -> JagritiClient:
-    """Get Jagriti client instance"""
-    global _jagriti_client
+def init_dependencies():
+    """Create the shared client and services on app startup"""
+    global _jagriti_client, _case_service, _pdf_service, _case_store, _sync_service
     if _jagriti_client is None:
         _jagriti_client = JagritiClient()
-    return _jagriti_client
+    if _pdf_service is None:
+        _pdf_service = PDFService()
+    if _case_store is None and settings.CASE_STORE_ENABLED:
+        _case_store = CaseStore(
+            settings.CASE_STORE_PATH,
+            batch_size=settings.CASE_STORE_BATCH_SIZE,
+            flush_interval=settings.CASE_STORE_FLUSH_INTERVAL,
+            max_pending=settings.CASE_STORE_MAX_PENDING,
+            readers=settings.CASE_STORE_READERS,
+            mmap_size=settings.CASE_STORE_MMAP_BYTES
+        )
+    if _case_service is None:
+        _case_service = CaseService(_jagriti_client, _pdf_service, _case_store)
+    if _sync_service is None and settings.SYNC_ENABLED:
+        if _case_store is None:
+            logger.warning("Sync is enabled but the case store is disabled; not syncing")
+        else:
+            if settings.CASE_SEARCH_SOURCE == SearchSource.UPSTREAM:
+                logger.warning(
+                    "Sync is enabled but CASE_SEARCH_SOURCE is upstream; synced cases will not answer "
+                    "searches unless they ask for source=auto or source=local"
+                )
+            _sync_service = SyncService(
+                _case_service,
+                _case_store,
+                settings.SYNC_COMMISSION_IDS,
+                search_type=settings.SYNC_SEARCH_TYPE,
+                search_value=settings.SYNC_SEARCH_VALUE,
+                start_date=settings.SYNC_START_DATE,
+                window_days=settings.SYNC_WINDOW_DAYS,
+                overlap_days=settings.SYNC_OVERLAP_DAYS,
+                page_size=settings.SYNC_PAGE_SIZE,
+                concurrency=settings.SYNC_CONCURRENCY,
+                rate=settings.SYNC_RATE,
+                interval=settings.SYNC_INTERVAL
+            )
+
+def _require(instance, name: str):
+    """Return a dependency, failing clearly if the lifespan has not created it"""
+    if instance is None:
+        raise RuntimeError(f"{name} is not initialized; dependencies are created on app startup")
+    return instance
+
+def get_jagriti_client() -> JagritiClient:
+    """Get Jagriti client instance"""
+    return _require(_jagriti_client, "Jagriti client")
 
 def get_case_service() -> CaseService:
     """Get case service instance"""
-    global _case_service
-    if _case_service is None:
-        _case_service = CaseService(get_jagriti_client())
-    return _case_service
+    return _require(_case_service, "Case service")
 
 def get_pdf_service() -> PDFService:
     """Get PDF service instance"""
-    global _pdf_service
-    if _pdf_service is None:
-        _pdf_service = PDFService()
-    return _pdf_service
+    return _require(_pdf_service, "PDF service")
+
+def get_sync_service() -> Optional[SyncService]:
+    """Get the background sync service, or None when sync is disabled"""
+    return _sync_service
+
+async def _prewarm_catalog():
+    """Prewarm the catalog caches, logging instead of failing startup"""
+    try:
+        await get_jagriti_client().prewarm_catalog(settings.PREWARM_CONCURRENCY)
+    except Exception as e:
+        logger.warning(f"Catalog prewarm failed: {e}")
+
+def start_catalog_prewarm():
+    """Start prewarming the state and commission caches in the background"""
+    global _prewarm_task
+    if _prewarm_task is None:
+        _prewarm_task = asyncio.get_running_loop().create_task(_prewarm_catalog())
 
 async def cleanup_dependencies():
     """Cleanup dependencies on app shutdown"""
-    global _jagriti_client
+    global _jagriti_client, _case_service, _pdf_service, _case_store, _sync_service, _prewarm_task
+    if _prewarm_task:
+        _prewarm_task.cancel()
+        await asyncio.gather(_prewarm_task, return_exceptions=True)
+        _prewarm_task = None
+    if _sync_service:
+        await _sync_service.stop()
+        _sync_service = None
+    _case_service = None
     if _jagriti_client:
         await _jagriti_client.close()
         _jagriti_client = None
+    if _pdf_service:
+        await _pdf_service.close()
+        _pdf_service = None
+    if _case_store:
+        await _case_store.close()
+        _case_store = None
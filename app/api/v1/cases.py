@@ -1,153 +1,214 @@
 """
 Case search API endpoints
 """
+import json
 import logging
+import math
 import os
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import FileResponse, StreamingResponse
-import io
-import base64
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
-from app.models.case import CaseSearchRequest, CaseSearchResponse
+from app.models.base import NameField, SearchRoute, SearchSource
+from app.models.case import (
+    CaseSearchRequest,
+    CaseResponse,
+    CaseSearchResponse,
+    StateWideSearchRequest,
+    StateWideSearchResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
+    LocalSearchResponse
+)
 from app.models.pdf import PDFUploadRequest, PDFUploadResponse
 from app.api.dependencies import get_case_service, get_pdf_service
+from app.config import settings
+from app.services.case_service import get_cache_status
+from app.services.pdf_service import PDFService
+from app.utils.http_files import file_response
+from app.utils.responses import FastJSONResponse
+from app.utils.metrics import PDF_BYTES_READ
 from app.utils.exceptions import (
     StateNotFoundException, 
     CommissionNotFoundException, 
-    CaseSearchException
+    CaseSearchException,
+    DocumentTooLargeException,
+    InvalidDocumentException,
+    UpstreamUnavailableException
 )
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/cases", tags=["cases"])
 
-@router.post("/by-case-number", response_model=CaseSearchResponse)
-async def search_by_case_number(
-    request: CaseSearchRequest, 
-    case_service=Depends(get_case_service)
-):
-    """Search cases by case number"""
+CACHE_STATUS_HEADER = "X-Cache"
+
+SOURCE_QUERY = Query(
+    None,
+    description="Answer from the local case store (`local`), Jagriti (`upstream`) or the store when it has matches (`auto`)"
+)
+
+async def _run_search(
+    search: Callable[[Any], Awaitable[BaseModel]],
+    request: Any,
+    description: str
+) -> FastJSONResponse:
+    """Run a case search, mapping service errors to HTTP errors and reporting cache status"""
+    with _search_errors(description):
+        result = await search(request)
+    return FastJSONResponse(result, headers={CACHE_STATUS_HEADER: get_cache_status()})
+
+@contextmanager
+def _search_errors(description: str) -> Iterator[None]:
+    """Map case service errors raised in the block to HTTP errors"""
     try:
-        return await case_service.search_by_case_number(request)
+        yield
     except StateNotFoundException as e:
         raise HTTPException(status_code=404, detail=str(e))
     except CommissionNotFoundException as e:
         raise HTTPException(status_code=404, detail=str(e))
     except CaseSearchException as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except UpstreamUnavailableException as e:
+        logger.warning(f"Jagriti unavailable for {description}: {e}")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
     except Exception as e:
-        logger.error(f"Unexpected error in case number search: {e}")
+        logger.error(f"Unexpected error in {description}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def _ndjson_lines(cases: AsyncIterator[CaseResponse]) -> AsyncIterator[str]:
+    """
+    Encode streamed cases as NDJSON
+    
+    StreamingResponse cancels this generator when the client disconnects,
+    which closes the case iterator and its page prefetch.
+    """
+    try:
+        async for case in cases:
+            yield case.model_dump_json() + "\n"
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.error(f"Error while streaming cases: {e}")
+        yield json.dumps({"error": str(e)}) + "\n"
+    finally:
+        await cases.aclose()
+
+@router.post("/by-case-number", response_model=CaseSearchResponse)
+async def search_by_case_number(
+    request: CaseSearchRequest, 
+    source: Optional[SearchSource] = SOURCE_QUERY,
+    case_service=Depends(get_case_service)
+):
+    """Search cases by case number"""
+    return await _run_search(partial(case_service.search_by_case_number, source=source), request, "case number search")
+
 @router.post("/by-complainant", response_model=CaseSearchResponse)
 async def search_by_complainant(
     request: CaseSearchRequest, 
+    source: Optional[SearchSource] = SOURCE_QUERY,
     case_service=Depends(get_case_service)
 ):
     """Search cases by complainant name"""
-    try:
-        return await case_service.search_by_complainant(request)
-    except StateNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CommissionNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CaseSearchException as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error in complainant search: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return await _run_search(partial(case_service.search_by_complainant, source=source), request, "complainant search")
 
 @router.post("/by-respondent", response_model=CaseSearchResponse)
 async def search_by_respondent(
     request: CaseSearchRequest, 
+    source: Optional[SearchSource] = SOURCE_QUERY,
     case_service=Depends(get_case_service)
 ):
     """Search cases by respondent name"""
-    try:
-        return await case_service.search_by_respondent(request)
-    except StateNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CommissionNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CaseSearchException as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error in respondent search: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return await _run_search(partial(case_service.search_by_respondent, source=source), request, "respondent search")
 
 @router.post("/by-complainant-advocate", response_model=CaseSearchResponse)
 async def search_by_complainant_advocate(
     request: CaseSearchRequest, 
+    source: Optional[SearchSource] = SOURCE_QUERY,
     case_service=Depends(get_case_service)
 ):
     """Search cases by complainant advocate name"""
-    try:
-        return await case_service.search_by_complainant_advocate(request)
-    except StateNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CommissionNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CaseSearchException as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error in complainant advocate search: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return await _run_search(partial(case_service.search_by_complainant_advocate, source=source), request, "complainant advocate search")
 
 @router.post("/by-respondent-advocate", response_model=CaseSearchResponse)
 async def search_by_respondent_advocate(
     request: CaseSearchRequest, 
+    source: Optional[SearchSource] = SOURCE_QUERY,
     case_service=Depends(get_case_service)
 ):
     """Search cases by respondent advocate name"""
-    try:
-        return await case_service.search_by_respondent_advocate(request)
-    except StateNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CommissionNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CaseSearchException as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error in respondent advocate search: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return await _run_search(partial(case_service.search_by_respondent_advocate, source=source), request, "respondent advocate search")
 
 @router.post("/by-industry-type", response_model=CaseSearchResponse)
 async def search_by_industry_type(
     request: CaseSearchRequest, 
+    source: Optional[SearchSource] = SOURCE_QUERY,
     case_service=Depends(get_case_service)
 ):
     """Search cases by industry type"""
-    try:
-        return await case_service.search_by_industry_type(request)
-    except StateNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CommissionNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CaseSearchException as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error in industry type search: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return await _run_search(partial(case_service.search_by_industry_type, source=source), request, "industry type search")
 
 @router.post("/by-judge", response_model=CaseSearchResponse)
 async def search_by_judge(
     request: CaseSearchRequest, 
+    source: Optional[SearchSource] = SOURCE_QUERY,
     case_service=Depends(get_case_service)
 ):
     """Search cases by judge"""
+    return await _run_search(partial(case_service.search_by_judge, source=source), request, "judge search")
+
+@router.post("/batch", response_model=BatchSearchResponse)
+async def search_batch(
+    request: BatchSearchRequest,
+    case_service=Depends(get_case_service)
+):
+    """
+    Run many searches in one request
+    
+    Each state/commission pair is resolved once and searches run on a bounded
+    worker pool. Results come back in request order, each with the status and
+    error the single-search endpoint would have returned.
+    """
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch contains {len(request.items)} items, the limit is {settings.BATCH_MAX_ITEMS}"
+        )
     try:
-        return await case_service.search_by_judge(request)
-    except StateNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CommissionNotFoundException as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except CaseSearchException as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        return FastJSONResponse(await case_service.search_batch(request.items))
     except Exception as e:
-        logger.error(f"Unexpected error in judge search: {e}")
+        logger.error(f"Unexpected error in batch search: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/local-search", response_model=LocalSearchResponse)
+async def local_search(
+    q: str = Query(min_length=1, description="Name to search for, e.g. 'Adv. Lakshmi Nar'"),
+    fields: Optional[List[NameField]] = Query(None, description="Name fields to search (default: all)"),
+    from_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    to_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    page: int = Query(0, ge=0, description="Page number (0-based)"),
+    size: int = Query(30, ge=1, le=100, description="Number of results per page"),
+    case_service=Depends(get_case_service)
+):
+    """
+    Search party and advocate names across every commission in the local case store
+    
+    Names are split into terms with honorifics ("Adv.", "M/s", "Shri") dropped
+    and common transliteration variants folded, so "Lakshmi" finds "Laxmi".
+    Every query term must match a name term exactly or as a prefix. Results
+    are ranked by match quality, then newest filing first. Only cases
+    previously returned by upstream searches are covered.
+    """
+    with _search_errors("local search"):
+        result = await case_service.local_search(q, fields, from_date, to_date, page, size)
+    return FastJSONResponse(result, headers={CACHE_STATUS_HEADER: get_cache_status()})
+
 # PDF Management Endpoints
 
 @router.post("/upload-document", response_model=PDFUploadResponse)
@@ -162,8 +223,8 @@ async def upload_case_document(request: PDFUploadRequest):
         safe_case_number = request.case_number.replace("/", "_").replace(" ", "_")
         filename = request.filename or f"case_{safe_case_number}.pdf"
         
-        # Store PDF and get download URL
-        download_url = pdf_service.store_pdf(request.base64_data, request.case_number)
+        # Store PDF off the event loop and get download URL
+        download_url = await pdf_service.store_pdf_async(request.base64_data, request.case_number, wait=True)
         
         return PDFUploadResponse(
             success=True,
@@ -176,58 +237,154 @@ async def upload_case_document(request: PDFUploadRequest):
         logger.error(f"Error uploading PDF for case {request.case_number}: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/upload-document/stream", response_model=PDFUploadResponse)
+async def upload_case_document_stream(
+    http_request: Request,
+    case_number: str = Query(description="Case number"),
+    filename: Optional[str] = Query(default=None, description="Custom filename (optional)")
+):
+    """
+    Upload a PDF as the raw request body and return download URL
+    
+    The body is streamed straight to storage instead of being sent as base64
+    JSON, so uploads do not need to fit in memory. Send the file bytes with
+    `Content-Type: application/pdf`.
+    """
+    content_length = http_request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.PDF_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=str(DocumentTooLargeException(settings.PDF_MAX_UPLOAD_BYTES)))
+    
+    try:
+        pdf_service = get_pdf_service()
+        download_url = await pdf_service.store_pdf_stream(http_request.stream(), case_number)
+        
+        return PDFUploadResponse(
+            success=True,
+            case_number=case_number,
+            document_link=download_url,
+            filename=filename or pdf_service.filename_for_case(case_number),
+            message="Document uploaded successfully"
+        )
+    except DocumentTooLargeException as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidDocumentException as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error uploading PDF stream for case {case_number}: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/download/{filename}")
-async def download_document(filename: str):
+async def download_document(filename: str, http_request: Request):
     """
     Download PDF document by filename
+    
+    Supports conditional requests (ETag / Last-Modified) and byte ranges.
     """
     try:
         pdf_service = get_pdf_service()
+        await pdf_service.wait_for_pdf(filename)
         file_path = pdf_service.get_pdf_path(filename)
         
         if not file_path:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        return FileResponse(
-            path=str(file_path),
-            media_type="application/pdf",
-            filename=filename,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+        return await _pdf_file_response(http_request, pdf_service, filename, file_path)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error downloading document {filename}: {e}")
         raise HTTPException(status_code=500, detail=f"Error downloading document: {str(e)}")
 
-@router.get("/download/case/{case_number}")
-async def download_case_document(case_number: str):
+@router.get("/download/case/{case_number:path}")
+async def download_case_document(case_number: str, http_request: Request):
     """
     Download PDF document by case number
+    
+    Supports conditional requests (ETag / Last-Modified) and byte ranges.
     """
     try:
         pdf_service = get_pdf_service()
+        await pdf_service.wait_for_pdf_by_case_number(case_number)
         file_path = pdf_service.get_pdf_by_case_number(case_number)
         
         if not file_path:
             raise HTTPException(status_code=404, detail="Document not found for this case")
         
         # Generate filename for download
-        safe_case_number = case_number.replace("/", "_").replace(" ", "_")
-        filename = f"case_{safe_case_number}.pdf"
+        filename = pdf_service.filename_for_case(case_number)
         
-        return FileResponse(
-            path=str(file_path),
-            media_type="application/pdf",
-            filename=filename,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+        return await _pdf_file_response(http_request, pdf_service, filename, file_path)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error downloading document for case {case_number}: {e}")
         raise HTTPException(status_code=500, detail=f"Error downloading document: {str(e)}")
+
+async def _pdf_file_response(
+    http_request: Request,
+    pdf_service: PDFService,
+    filename: str,
+    file_path: Path
+) -> Response:
+    """Serve a stored PDF with a content-derived ETag, validators and Range support"""
+    digest = pdf_service.get_pdf_digest(filename)
+    if digest is None:
+        digest = await run_in_threadpool(pdf_service.hash_pdf_file, file_path)
+    return file_response(
+        http_request,
+        file_path,
+        etag=f'"{digest}"',
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        cache_control=settings.PDF_CACHE_CONTROL,
+        bytes_read=PDF_BYTES_READ
+    )
+
+# Generic per-search routes are registered last so fixed paths above take precedence
+
+@router.post("/{route}/state-wide", response_model=StateWideSearchResponse)
+async def search_state_wide(
+    route: SearchRoute,
+    request: StateWideSearchRequest,
+    source: Optional[SearchSource] = SOURCE_QUERY,
+    case_service=Depends(get_case_service)
+):
+    """
+    Search every district commission in a state
+    
+    - **route**: Search to run, e.g. `by-respondent` for `/cases/by-respondent/state-wide`
+    
+    Results from all commissions are merged and de-duplicated by case number.
+    Commissions that fail are listed in `failures` instead of failing the request.
+    """
+    return await _run_search(
+        lambda req: case_service.search_state_wide(req, route.search_type, source),
+        request,
+        "state-wide search"
+    )
+
+@router.post(
+    "/{route}/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "One case per line"}}
+)
+async def stream_search(
+    route: SearchRoute,
+    request: CaseSearchRequest,
+    case_service=Depends(get_case_service)
+):
+    """
+    Stream every matching case as NDJSON
+    
+    - **route**: Search to run, e.g. `by-respondent` for `/cases/by-respondent/stream`
+    
+    State and commission are resolved once, then upstream pages are walked
+    from `page` onwards and each case is written as one JSON line as soon as
+    its page arrives. If the search fails mid-stream, a final
+    `{"error": ...}` line is written.
+    """
+    with _search_errors("streaming search"):
+        commission_id = await case_service.resolve_commission(request)
+    
+    cases = case_service.iter_cases(commission_id, request, route.search_type)
+    return StreamingResponse(_ndjson_lines(cases), media_type="application/x-ndjson")
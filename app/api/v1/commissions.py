@@ -2,15 +2,20 @@
 Commission-related API endpoints
 """
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+import math
+from fastapi import APIRouter, Depends, HTTPException, Response
 from app.models.commission import CommissionsResponse
 from app.api.dependencies import get_jagriti_client
-from app.utils.exceptions import JagritiAPIError
+from app.utils.exceptions import JagritiAPIError, UpstreamUnavailableException
+from app.utils.responses import SerializedBodyCache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/commissions", tags=["commissions"])
 
+# Serialized once per state per catalog refresh
+_bodies = SerializedBodyCache(lambda commissions: CommissionsResponse(commissions=commissions))
+
 @router.get("/{state_id}", response_model=CommissionsResponse)
 async def get_commissions(state_id: str, jagriti_client=Depends(get_jagriti_client)):
     """
@@ -22,10 +27,15 @@ async def get_commissions(state_id: str, jagriti_client=Depends(get_jagriti_clie
     """
     try:
         commissions_data = await jagriti_client.get_commissions(state_id)
-        return CommissionsResponse(commissions=commissions_data)
+        return Response(_bodies.body(str(state_id), commissions_data), media_type="application/json")
     except JagritiAPIError as e:
         logger.error(f"Jagriti API error fetching commissions for state {state_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch commissions: {str(e)}")
+    except UpstreamUnavailableException as e:
+        logger.warning(f"Jagriti unavailable fetching commissions for state {state_id}: {e}")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
     except Exception as e:
         logger.error(f"Unexpected error fetching commissions for state {state_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -2,15 +2,20 @@
 State-related API endpoints
 """
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+import math
+from fastapi import APIRouter, Depends, HTTPException, Response
 from app.models.state import StatesResponse
 from app.api.dependencies import get_jagriti_client
-from app.utils.exceptions import JagritiAPIError
+from app.utils.exceptions import JagritiAPIError, UpstreamUnavailableException
+from app.utils.responses import SerializedBodyCache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/states", tags=["states"])
 
+# Serialized once per catalog refresh
+_bodies = SerializedBodyCache(lambda states: StatesResponse(states=states))
+
 @router.get("", response_model=StatesResponse)
 async def get_states(jagriti_client=Depends(get_jagriti_client)):
     """
@@ -21,10 +26,15 @@ async def get_states(jagriti_client=Depends(get_jagriti_client)):
     """
     try:
         states_data = await jagriti_client.get_states()
-        return StatesResponse(states=states_data)
+        return Response(_bodies.body("states", states_data), media_type="application/json")
     except JagritiAPIError as e:
         logger.error(f"Jagriti API error fetching states: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch states: {str(e)}")
+    except UpstreamUnavailableException as e:
+        logger.warning(f"Jagriti unavailable fetching states: {e}")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
     except Exception as e:
         logger.error(f"Unexpected error fetching states: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -20,14 +20,116 @@ class Settings:
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     
     # Jagriti API Configuration
-    JAGRITI_BASE_URL: str = "https://e-jagriti.gov.in"
+    JAGRITI_BASE_URL: str = os.getenv("JAGRITI_BASE_URL", "https://e-jagriti.gov.in")
     JAGRITI_TIMEOUT: float = 30.0
     
+    # Jagriti Connection Pool Configuration (timeouts in seconds)
+    JAGRITI_MAX_CONNECTIONS: int = int(os.getenv("JAGRITI_MAX_CONNECTIONS", "100"))
+    JAGRITI_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("JAGRITI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    JAGRITI_KEEPALIVE_EXPIRY: float = float(os.getenv("JAGRITI_KEEPALIVE_EXPIRY", "30"))
+    JAGRITI_CONNECT_TIMEOUT: float = float(os.getenv("JAGRITI_CONNECT_TIMEOUT", "5"))
+    JAGRITI_READ_TIMEOUT: float = float(os.getenv("JAGRITI_READ_TIMEOUT", str(JAGRITI_TIMEOUT)))
+    JAGRITI_POOL_TIMEOUT: float = float(os.getenv("JAGRITI_POOL_TIMEOUT", "5"))
+    # Multiplex requests over HTTP/2 (needs the h2 package; falls back to HTTP/1.1 without it)
+    JAGRITI_HTTP2: bool = os.getenv("JAGRITI_HTTP2", "False").lower() == "true"
+    
+    # Adaptive Jagriti Concurrency Limit (AIMD)
+    JAGRITI_LIMIT_INITIAL: int = int(os.getenv("JAGRITI_LIMIT_INITIAL", "8"))
+    JAGRITI_LIMIT_MIN: int = int(os.getenv("JAGRITI_LIMIT_MIN", "1"))
+    JAGRITI_LIMIT_MAX: int = int(os.getenv("JAGRITI_LIMIT_MAX", "64"))
+    # Factor the limit is multiplied by on errors or latency growth
+    JAGRITI_LIMIT_BACKOFF: float = float(os.getenv("JAGRITI_LIMIT_BACKOFF", "0.5"))
+    # Latency above this multiple of the observed baseline counts as congestion
+    JAGRITI_LIMIT_LATENCY_TOLERANCE: float = float(os.getenv("JAGRITI_LIMIT_LATENCY_TOLERANCE", "2.0"))
+    # Seconds a request may queue for a slot before answering 503
+    JAGRITI_LIMIT_QUEUE_TIMEOUT: float = float(os.getenv("JAGRITI_LIMIT_QUEUE_TIMEOUT", "10"))
+    
+    # Jagriti Retries, Circuit Breaker and Hedging (delays in seconds)
+    JAGRITI_RETRY_ATTEMPTS: int = int(os.getenv("JAGRITI_RETRY_ATTEMPTS", "3"))
+    JAGRITI_RETRY_BASE_DELAY: float = float(os.getenv("JAGRITI_RETRY_BASE_DELAY", "0.2"))
+    JAGRITI_RETRY_MAX_DELAY: float = float(os.getenv("JAGRITI_RETRY_MAX_DELAY", "2"))
+    # Retries (and hedges) allowed per regular call, plus a small steady allowance
+    JAGRITI_RETRY_BUDGET_RATIO: float = float(os.getenv("JAGRITI_RETRY_BUDGET_RATIO", "0.2"))
+    JAGRITI_RETRY_BUDGET_MIN_PER_SECOND: float = float(os.getenv("JAGRITI_RETRY_BUDGET_MIN_PER_SECOND", "1"))
+    JAGRITI_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("JAGRITI_BREAKER_FAILURE_THRESHOLD", "5"))
+    JAGRITI_BREAKER_RESET_TIMEOUT: float = float(os.getenv("JAGRITI_BREAKER_RESET_TIMEOUT", "30"))
+    JAGRITI_HEDGE_ENABLED: bool = os.getenv("JAGRITI_HEDGE_ENABLED", "False").lower() == "true"
+    JAGRITI_HEDGE_PERCENTILE: float = float(os.getenv("JAGRITI_HEDGE_PERCENTILE", "0.95"))
+    JAGRITI_HEDGE_MIN_DELAY: float = float(os.getenv("JAGRITI_HEDGE_MIN_DELAY", "0.05"))
+    # Bytes of each streamed documentBase64 value kept in memory before spilling to a temp file
+    SEARCH_SPOOL_MEMORY_BYTES: int = int(os.getenv("SEARCH_SPOOL_MEMORY_BYTES", str(256 * 1024)))
+    
+    # Catalog Cache Configuration (TTLs in seconds)
+    STATES_CACHE_TTL: float = float(os.getenv("STATES_CACHE_TTL", "3600"))
+    COMMISSIONS_CACHE_TTL: float = float(os.getenv("COMMISSIONS_CACHE_TTL", "3600"))
+    COMMISSIONS_CACHE_MAX_STATES: int = int(os.getenv("COMMISSIONS_CACHE_MAX_STATES", "64"))
+    PREWARM_CATALOG: bool = os.getenv("PREWARM_CATALOG", "False").lower() == "true"
+    PREWARM_CONCURRENCY: int = int(os.getenv("PREWARM_CONCURRENCY", "4"))
+    
+    # Search Result Cache Configuration (TTLs in seconds)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "True").lower() == "true"
+    RESULT_CACHE_MAX_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESULT_CACHE_TTL: float = float(os.getenv("RESULT_CACHE_TTL", "600"))
+    RESULT_CACHE_NEGATIVE_TTL: float = float(os.getenv("RESULT_CACHE_NEGATIVE_TTL", "120"))
+    # Per search type overrides of RESULT_CACHE_TTL, keyed by SearchType value
+    RESULT_CACHE_TTLS: dict = {
+        1: 1800.0,  # Case number
+        7: 300.0,   # Judge
+    }
+    
+    # State-wide Search Configuration
+    STATE_WIDE_CONCURRENCY: int = int(os.getenv("STATE_WIDE_CONCURRENCY", "8"))
+    
+    # Batch Search Configuration
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "5000"))
+    
+    # Local Case Store Configuration (SQLite)
+    CASE_STORE_ENABLED: bool = os.getenv("CASE_STORE_ENABLED", "True").lower() == "true"
+    CASE_STORE_PATH: str = os.getenv("CASE_STORE_PATH", "data/cases.db")
+    CASE_STORE_BATCH_SIZE: int = int(os.getenv("CASE_STORE_BATCH_SIZE", "500"))
+    CASE_STORE_FLUSH_INTERVAL: float = float(os.getenv("CASE_STORE_FLUSH_INTERVAL", "0.5"))
+    CASE_STORE_MAX_PENDING: int = int(os.getenv("CASE_STORE_MAX_PENDING", "10000"))
+    CASE_STORE_READERS: int = int(os.getenv("CASE_STORE_READERS", "4"))
+    CASE_STORE_MMAP_BYTES: int = int(os.getenv("CASE_STORE_MMAP_BYTES", str(256 * 1024 * 1024)))
+    # Default source for searches: local, upstream or auto; auto when background sync is enabled,
+    # since synced cases are only read from the case store
+    CASE_SEARCH_SOURCE: str = os.getenv("CASE_SEARCH_SOURCE") or (
+        "auto" if os.getenv("SYNC_ENABLED", "False").lower() == "true" else "upstream"
+    )
+    
+    # Background Sync Configuration (requires the case store)
+    SYNC_ENABLED: bool = os.getenv("SYNC_ENABLED", "False").lower() == "true"
+    # Comma-separated commission IDs to keep in sync
+    SYNC_COMMISSION_IDS: list = [int(value) for value in os.getenv("SYNC_COMMISSION_IDS", "").split(",") if value.strip()]
+    SYNC_SEARCH_TYPE: int = int(os.getenv("SYNC_SEARCH_TYPE", "1"))
+    SYNC_SEARCH_VALUE: str = os.getenv("SYNC_SEARCH_VALUE", "")
+    SYNC_START_DATE: str = os.getenv("SYNC_START_DATE", "2025-01-01")
+    SYNC_WINDOW_DAYS: int = int(os.getenv("SYNC_WINDOW_DAYS", "7"))
+    SYNC_OVERLAP_DAYS: int = int(os.getenv("SYNC_OVERLAP_DAYS", "1"))
+    SYNC_PAGE_SIZE: int = int(os.getenv("SYNC_PAGE_SIZE", "100"))
+    SYNC_CONCURRENCY: int = int(os.getenv("SYNC_CONCURRENCY", "2"))
+    SYNC_RATE: float = float(os.getenv("SYNC_RATE", "2"))
+    SYNC_INTERVAL: float = float(os.getenv("SYNC_INTERVAL", "900"))
+    
+    # PDF Storage Configuration
+    PDF_WRITER_THREADS: int = int(os.getenv("PDF_WRITER_THREADS", "2"))
+    PDF_WRITE_QUEUE_DEPTH: int = int(os.getenv("PDF_WRITE_QUEUE_DEPTH", "32"))
+    PDF_WRITE_BEHIND: bool = os.getenv("PDF_WRITE_BEHIND", "True").lower() == "true"
+    PDF_MAX_UPLOAD_BYTES: int = int(os.getenv("PDF_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+    # "eager" stores search result PDFs during the search; "lazy" defers decoding them until first
+    # download or idle time, keeping the pending data in this process's memory (single process only)
+    PDF_MATERIALIZATION: str = os.getenv("PDF_MATERIALIZATION", "eager").lower()
+    PDF_LAZY_MAX_PENDING_BYTES: int = int(os.getenv("PDF_LAZY_MAX_PENDING_BYTES", str(128 * 1024 * 1024)))
+    PDF_LAZY_IDLE_SECONDS: float = float(os.getenv("PDF_LAZY_IDLE_SECONDS", "30"))
+    PDF_CACHE_CONTROL: str = os.getenv("PDF_CACHE_CONTROL", "private, max-age=3600")
+    
     # CORS Configuration
     CORS_ORIGINS: list = ["*"]
     CORS_CREDENTIALS: bool = True
     CORS_METHODS: list = ["*"]
     CORS_HEADERS: list = ["*"]
+    CORS_EXPOSE_HEADERS: list = ["X-Cache", "Server-Timing"]
     
     # Pagination Defaults
     DEFAULT_PAGE_SIZE: int = 30
@@ -39,6 +141,17 @@ class Settings:
     
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "json" for one JSON object per line, "text" for plain lines
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json").lower()
+    # Fraction of cases in each search page logged at DEBUG level
+    CASE_LOG_SAMPLE_RATE: float = float(os.getenv("CASE_LOG_SAMPLE_RATE", "0.01"))
+    
+    # Metrics Configuration
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    # Per-phase Server-Timing header on every response
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "True").lower() == "true"
+    # Requests taking at least this many seconds are logged with their phase breakdown (0 disables)
+    SLOW_REQUEST_LOG_SECONDS: float = float(os.getenv("SLOW_REQUEST_LOG_SECONDS", "0"))
 
 # Global settings instance
 settings = Settings()
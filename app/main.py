@@ -2,16 +2,48 @@
 Main FastAPI application
 """
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.config import settings
 from app.middleware.cors import setup_cors
+from app.middleware.metrics import setup_metrics
+from app.middleware.timing import setup_server_timing
 from app.api.v1 import states, commissions, cases
-from app.api.dependencies import cleanup_dependencies
+from app.utils.logs import setup_logging
+from app.utils.metrics import REGISTRY
+from app.api.dependencies import (
+    cleanup_dependencies,
+    get_case_service,
+    get_jagriti_client,
+    get_sync_service,
+    init_dependencies,
+    start_catalog_prewarm
+)
 
-# Configure logging
-logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up logging, create the Jagriti client and services on startup and close them on shutdown"""
+    # Records are formatted and written on a background thread, stopped (and flushed) on shutdown
+    log_listener = setup_logging(settings.LOG_LEVEL, json_format=settings.LOG_FORMAT == "json")
+    init_dependencies()
+    if settings.PREWARM_CATALOG:
+        # Optionally prewarm the state and commission caches
+        start_catalog_prewarm()
+        logger.info("Catalog prewarm started")
+    if get_sync_service():
+        get_sync_service().start()
+    try:
+        yield
+    finally:
+        try:
+            await cleanup_dependencies()
+            logger.info("Application shutdown complete")
+        finally:
+            log_listener.stop()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.API_TITLE,
@@ -19,11 +51,18 @@ app = FastAPI(
     version=settings.API_VERSION,
     docs_url=settings.API_DOCS_URL,
     redoc_url=settings.API_REDOC_URL,
+    lifespan=lifespan,
 )
 
 # Setup CORS
 setup_cors(app)
 
+if settings.METRICS_ENABLED:
+    setup_metrics(app)
+
+if settings.SERVER_TIMING_ENABLED:
+    setup_server_timing(app, settings.SLOW_REQUEST_LOG_SECONDS)
+
 # Include routers
 app.include_router(states.router)
 app.include_router(commissions.router)
@@ -39,11 +78,23 @@ async def root():
         "redoc": settings.API_REDOC_URL
     }
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on app shutdown"""
-    await cleanup_dependencies()
-    logger.info("Application shutdown complete")
+@app.get("/stats")
+async def stats():
+    """Cache hit/miss, request coalescing, connection pool and sync counters"""
+    case_service = get_case_service()
+    sync_service = get_sync_service()
+    return {
+        **get_jagriti_client().stats(),
+        "result_cache": case_service.result_cache.stats(),
+        "search_coalescing": case_service.coalescing_stats(),
+        "case_store": case_service.case_store.stats() if case_service.case_store else None,
+        "sync": {**sync_service.stats(), "progress": await sync_service.progress()} if sync_service else None,
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Upstream latency, API request and PDF storage metrics in Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 if __name__ == "__main__":
     import uvicorn
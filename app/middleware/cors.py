@@ -12,4 +12,5 @@ def setup_cors(app):
         allow_credentials=settings.CORS_CREDENTIALS,
         allow_methods=settings.CORS_METHODS,
         allow_headers=settings.CORS_HEADERS,
+        expose_headers=settings.CORS_EXPOSE_HEADERS,
     )
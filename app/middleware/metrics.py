@@ -0,0 +1,56 @@
+"""
+Request metrics middleware
+"""
+import time
+from app.utils.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_DURATION, SEARCH_CACHE_RESULTS
+
+# Routers whose requests are timed; other paths (docs, /metrics itself) are not
+METERED_PREFIXES = ("/cases", "/states", "/commissions")
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request durations and statuses
+
+    Requests are labelled with the matched route template (e.g.
+    ``/cases/{route}/stream``) rather than the raw path, so label cardinality
+    stays bounded. Responses carrying an X-Cache header are also counted by
+    cache status. Being a plain ASGI callable it adds no per-request task or
+    body buffering, unlike BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        cache_status = None
+
+        async def send_with_status(message):
+            nonlocal status, cache_status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"x-cache":
+                        cache_status = value.decode("latin-1")
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # The router records the matched route in the scope
+            route = getattr(scope.get("route"), "path", None)
+            if route and route.startswith(METERED_PREFIXES):
+                HTTP_REQUEST_DURATION.observe(time.perf_counter() - started_at, route, scope["method"], str(status))
+                if cache_status:
+                    SEARCH_CACHE_RESULTS.inc(1, route, cache_status)
+
+def setup_metrics(app):
+    """Setup request metrics middleware for the FastAPI app"""
+    app.add_middleware(MetricsMiddleware)
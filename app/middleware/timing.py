@@ -0,0 +1,50 @@
+"""
+Server-Timing header and slow request logging middleware
+"""
+import logging
+from app.utils.timing import end_request_timer, start_request_timer
+
+logger = logging.getLogger(__name__)
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware timing request phases
+
+    A RequestTimer is bound to the request's context, so ``span`` calls made
+    while handling it report into it. Phases finished before the response
+    starts are sent in a Server-Timing header. Requests taking at least
+    slow_request_seconds are logged with their full phase breakdown, including
+    phases that ran while a streaming body was sent.
+    """
+
+    def __init__(self, app, slow_request_seconds: float = 0.0):
+        self.app = app
+        self.slow_request_seconds = slow_request_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer, token = start_request_timer()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", timer.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request_timer(token)
+            elapsed = timer.elapsed()
+            if self.slow_request_seconds > 0 and elapsed >= self.slow_request_seconds:
+                logger.warning(
+                    f"Slow request {scope['method']} {scope['path']} took {elapsed * 1000:.1f}ms: {timer.breakdown()}"
+                )
+
+def setup_server_timing(app, slow_request_seconds: float = 0.0):
+    """Setup Server-Timing middleware for the FastAPI app"""
+    app.add_middleware(ServerTimingMiddleware, slow_request_seconds=slow_request_seconds)
@@ -1,16 +1,33 @@
 """
 Models package
 """
-from .base import BaseResponse, PaginationParams, DateRangeParams, SearchType, ErrorResponse
+from .base import BaseResponse, PaginationParams, DateRangeParams, SearchType, SearchRoute, SearchSource, NameField, ErrorResponse
 from .state import StateResponse, StatesResponse
 from .commission import CommissionResponse, CommissionsResponse
-from .case import CaseSearchRequest, CaseResponse, CaseSearchResponse
+from .case import (
+    CaseSearchRequest,
+    CaseResponse,
+    CaseSearchResponse,
+    StateWideSearchRequest,
+    CommissionSearchFailure,
+    CommissionSearchTotal,
+    StateWideSearchResponse,
+    BatchSearchItem,
+    BatchSearchRequest,
+    BatchSearchResult,
+    BatchSearchResponse,
+    LocalSearchHit,
+    LocalSearchResponse
+)
 
 __all__ = [
     "BaseResponse",
     "PaginationParams", 
     "DateRangeParams",
     "SearchType",
+    "SearchRoute",
+    "SearchSource",
+    "NameField",
     "ErrorResponse",
     "StateResponse",
     "StatesResponse",
@@ -18,5 +35,15 @@ __all__ = [
     "CommissionsResponse",
     "CaseSearchRequest",
     "CaseResponse",
-    "CaseSearchResponse"
+    "CaseSearchResponse",
+    "StateWideSearchRequest",
+    "CommissionSearchFailure",
+    "CommissionSearchTotal",
+    "StateWideSearchResponse",
+    "BatchSearchItem",
+    "BatchSearchRequest",
+    "BatchSearchResult",
+    "BatchSearchResponse",
+    "LocalSearchHit",
+    "LocalSearchResponse"
 ]
@@ -1,6 +1,7 @@
 """
 Base models and common types
 """
+from enum import Enum
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
@@ -29,6 +30,34 @@ class SearchType:
     INDUSTRY_TYPE = 6
     JUDGE = 7
 
+class NameField(str, Enum):
+    """Case name fields covered by local full-text search"""
+    COMPLAINANT = "complainant"
+    COMPLAINANT_ADVOCATE = "complainant_advocate"
+    RESPONDENT = "respondent"
+    RESPONDENT_ADVOCATE = "respondent_advocate"
+
+class SearchRoute(str, Enum):
+    """Search route names, as used in /cases/<route> paths"""
+    CASE_NUMBER = "by-case-number"
+    COMPLAINANT = "by-complainant"
+    RESPONDENT = "by-respondent"
+    COMPLAINANT_ADVOCATE = "by-complainant-advocate"
+    RESPONDENT_ADVOCATE = "by-respondent-advocate"
+    INDUSTRY_TYPE = "by-industry-type"
+    JUDGE = "by-judge"
+
+    @property
+    def search_type(self) -> int:
+        """SearchType value for this route"""
+        return getattr(SearchType, self.name)
+
+class SearchSource(str, Enum):
+    """Where a search is answered from"""
+    LOCAL = "local"
+    UPSTREAM = "upstream"
+    AUTO = "auto"
+
 class ErrorResponse(BaseModel):
     """Error response model"""
     success: bool = False
@@ -3,7 +3,7 @@ Case-related models
 """
 from typing import List, Optional
 from pydantic import BaseModel, Field
-from .base import BaseResponse, PaginationParams, DateRangeParams, SearchType
+from .base import BaseResponse, PaginationParams, DateRangeParams, SearchType, SearchRoute, NameField
 
 class CaseSearchRequest(BaseModel):
     """Case search request model"""
@@ -33,3 +33,71 @@ class CaseSearchResponse(BaseResponse):
     total_count: int = Field(description="Total number of cases")
     page: int = Field(description="Current page number")
     size: int = Field(description="Number of results per page")
+
+class StateWideSearchRequest(BaseModel):
+    """State-wide case search request model, searching every commission in the state"""
+    state: str = Field(description="State name (e.g., 'KARNATAKA')")
+    search_value: str = Field(description="Search value")
+    judge_id: str = Field(default="", description="Judge ID (only for judge search)")
+    page: int = Field(default=0, ge=0, description="Page number (0-based), applied to each commission")
+    size: int = Field(default=30, ge=1, le=100, description="Number of results per page, per commission")
+    from_date: str = Field(default="2025-01-01", description="Start date (YYYY-MM-DD)")
+    to_date: str = Field(default="2025-09-22", description="End date (YYYY-MM-DD)")
+
+class CommissionSearchFailure(BaseModel):
+    """Commission that failed during a state-wide search"""
+    commission_id: int = Field(description="Commission ID")
+    commission: str = Field(description="Commission name")
+    error: str = Field(description="Error message")
+
+class CommissionSearchTotal(BaseModel):
+    """Upstream match count for one commission in a state-wide search"""
+    commission_id: int = Field(description="Commission ID")
+    commission: str = Field(description="Commission name")
+    total_count: int = Field(description="Total number of matching cases in this commission")
+
+class StateWideSearchResponse(CaseSearchResponse):
+    """State-wide case search response model"""
+    total_count: int = Field(description="Number of distinct cases returned, after de-duplication")
+    commissions_searched: int = Field(description="Number of commissions searched")
+    commission_totals: List[CommissionSearchTotal] = Field(
+        default_factory=list,
+        description="Upstream total per commission that answered; a case filed in several commissions counts in each"
+    )
+    failures: List[CommissionSearchFailure] = Field(default_factory=list, description="Commissions whose search failed")
+
+class BatchSearchItem(BaseModel):
+    """Single search in a batch"""
+    search_type: SearchRoute = Field(description="Search to run (e.g., 'by-case-number')")
+    request: CaseSearchRequest = Field(description="Search request")
+
+class BatchSearchRequest(BaseModel):
+    """Batch search request model"""
+    items: List[BatchSearchItem] = Field(min_length=1, description="Searches to run")
+
+class BatchSearchResult(BaseModel):
+    """Outcome of a single search in a batch"""
+    index: int = Field(description="Position of the item in the request")
+    status: int = Field(description="HTTP status the single-search endpoint would have returned")
+    error: Optional[str] = Field(default=None, description="Error message if the search failed")
+    result: Optional[CaseSearchResponse] = Field(default=None, description="Search results if the search succeeded")
+
+class BatchSearchResponse(BaseResponse):
+    """Batch search response model, with results in request order"""
+    results: List[BatchSearchResult] = Field(description="Per-item results")
+
+class LocalSearchHit(BaseModel):
+    """Case matched by a local full-text search"""
+    commission_id: int = Field(description="Commission the case was found under")
+    score: float = Field(description="Relevance score, higher is better")
+    matched_fields: List[NameField] = Field(description="Name fields that matched the query")
+    case: CaseResponse = Field(description="Matched case")
+
+class LocalSearchResponse(BaseResponse):
+    """Local full-text search response model"""
+    query: str = Field(description="Query as sent")
+    terms: List[str] = Field(description="Normalized search terms the query was split into")
+    hits: List[LocalSearchHit] = Field(description="Matches, best first")
+    total_count: int = Field(description="Total number of matching cases")
+    page: int = Field(description="Current page number")
+    size: int = Field(description="Number of results per page")
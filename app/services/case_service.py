@@ -1,28 +1,80 @@
 """
 Case service for handling case-related business logic
 """
+import asyncio
 import logging
-from typing import List, Dict, Any
-from app.models.case import CaseSearchRequest, CaseResponse, CaseSearchResponse
-from app.models.base import SearchType
+from contextvars import ContextVar
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Hashable, Iterator, Optional, Tuple, Union
+from app.config import settings
+from app.models.case import (
+    CaseSearchRequest,
+    CaseResponse,
+    CaseSearchResponse,
+    StateWideSearchRequest,
+    CommissionSearchFailure,
+    CommissionSearchTotal,
+    StateWideSearchResponse,
+    BatchSearchItem,
+    BatchSearchResult,
+    BatchSearchResponse,
+    LocalSearchHit,
+    LocalSearchResponse
+)
+from app.models.base import NameField, SearchSource, SearchType
+from app.services.case_store import LOCAL_SEARCH_TYPES, CaseStore
 from app.services.jagriti_client import JagritiClient
 from app.services.pdf_service import PDFService
-from app.utils.exceptions import CaseSearchException
-from app.utils.helpers import transform_case_data
+from app.utils.cache import ByteLRUCache
+from app.utils.exceptions import (
+    CaseSearchException,
+    StateNotFoundException,
+    CommissionNotFoundException,
+    UpstreamUnavailableException
+)
+from app.utils.helpers import transform_case_data, sanitize_search_value
+from app.utils.logs import sampled
+from app.utils.singleflight import SingleFlight
+from app.utils.timing import span
 
 logger = logging.getLogger(__name__)
 
+# Result cache status of the last search in the current request (HIT, MISS, STALE, LOCAL or BYPASS)
+_cache_status: ContextVar[str] = ContextVar("result_cache_status", default="BYPASS")
+
+# Requests carrying the search value, judge, date window and pagination fields
+SearchParams = Union[CaseSearchRequest, StateWideSearchRequest]
+
+# Reports whether the case store holds every case a commission filed in a date window
+StoreCoverage = Callable[[int, str, str], Awaitable[bool]]
+
+def get_cache_status() -> str:
+    """Get the result cache status of the last search made in this request"""
+    return _cache_status.get()
+
 class CaseService:
     """Service for handling case operations"""
     
-    def __init__(self, jagriti_client: JagritiClient):
+    def __init__(
+        self,
+        jagriti_client: JagritiClient,
+        pdf_service: Optional[PDFService] = None,
+        case_store: Optional[CaseStore] = None
+    ):
         self.jagriti_client = jagriti_client
-        self.pdf_service = PDFService()  # Add PDF service
+        self.pdf_service = pdf_service or PDFService()
+        self.case_store = case_store
+        self.result_cache = ByteLRUCache(settings.RESULT_CACHE_MAX_BYTES, name="result cache")
+        # Concurrent identical upstream searches share one fetch, transform, PDF and store pass
+        self._inflight = SingleFlight()
+        # Set by the sync service; without it "auto" searches never answer from the store, which
+        # otherwise only holds the pages earlier searches happened to return
+        self.store_coverage: Optional[StoreCoverage] = None
     
     async def search_cases(
         self, 
         request: CaseSearchRequest, 
-        search_type: int
+        search_type: int,
+        source: Optional[SearchSource] = None
     ) -> CaseSearchResponse:
         """
         Search cases by the specified search type
@@ -30,20 +82,398 @@ class CaseService:
         Args:
             request: Case search request
             search_type: Type of search (SearchType enum)
+            source: Where to answer from (defaults to CASE_SEARCH_SOURCE)
             
         Returns:
             Case search response with results
         """
         try:
-            # Find state and commission IDs
-            state_id = await self.jagriti_client.find_state_id_by_name(request.state)
-            commission_id = await self.jagriti_client.find_commission_id_by_name(
-                state_id, request.commission
-            )
+            commission_id = await self.resolve_commission(request)
+            return await self._search_resolved(commission_id, request, search_type, source)
+            
+        except (StateNotFoundException, CommissionNotFoundException, UpstreamUnavailableException):
+            raise
+        except Exception as e:
+            logger.error(f"Error in case search: {e}")
+            raise CaseSearchException(f"Case search failed: {str(e)}")
+    
+    async def resolve_commission(self, request: CaseSearchRequest) -> int:
+        """
+        Resolve the state and commission names of a request to a commission ID
+        
+        Args:
+            request: Case search request
+            
+        Returns:
+            Commission ID
+            
+        Raises:
+            StateNotFoundException: If state is not found
+            CommissionNotFoundException: If commission is not found
+        """
+        state_id, commission_id = await self.jagriti_client.resolve(
+            request.state, request.commission
+        )
+        logger.info("Searching cases - State ID: %s, Commission ID: %s", state_id, commission_id)
+        return commission_id
+    
+    async def iter_cases(
+        self,
+        commission_id: int,
+        request: CaseSearchRequest,
+        search_type: int
+    ) -> AsyncIterator[CaseResponse]:
+        """
+        Yield every matching case, walking upstream pages from request.page onwards
+        
+        The next page is fetched while the current one is being consumed. Paging
+        stops once totalCount is reached or a page comes back empty, and the
+        prefetch is cancelled if the consumer stops early.
+        
+        Args:
+            commission_id: Resolved commission ID
+            request: Case search request; its page is the first page fetched
+            search_type: Type of search (SearchType enum)
+            
+        Yields:
+            Cases in upstream order
+        """
+        page = request.page
+        current = asyncio.ensure_future(self._search_resolved(commission_id, request, search_type))
+        prefetch = None
+        try:
+            while current is not None:
+                response = await current
+                current = None
+                
+                has_more = bool(response.cases) and (page + 1) * request.size < response.total_count
+                if has_more:
+                    page += 1
+                    next_request = request.model_copy(update={"page": page})
+                    prefetch = asyncio.ensure_future(
+                        self._search_resolved(commission_id, next_request, search_type)
+                    )
+                
+                for case in response.cases:
+                    yield case
+                
+                current, prefetch = prefetch, None
+        finally:
+            for task in (current, prefetch):
+                if task is not None and not task.done():
+                    task.cancel()
+    
+    async def search_state_wide(
+        self,
+        request: StateWideSearchRequest,
+        search_type: int,
+        source: Optional[SearchSource] = None
+    ) -> StateWideSearchResponse:
+        """
+        Search every district commission in a state and merge the results
+        
+        Commissions are searched concurrently, up to STATE_WIDE_CONCURRENCY at
+        a time. Cases are de-duplicated by case number, so total_count is the
+        number of distinct cases returned; each commission's upstream total is
+        reported separately. Commissions whose search fails are reported in
+        the response instead of failing it.
+        
+        Args:
+            request: State-wide search request
+            search_type: Type of search (SearchType enum)
+            source: Where to answer from (defaults to CASE_SEARCH_SOURCE)
+            
+        Returns:
+            Merged search response with per-commission totals and failures
+        """
+        try:
+            with span("state"):
+                state_id = await self.jagriti_client.find_state_id_by_name(request.state)
+            with span("commission"):
+                commissions = await self.jagriti_client.get_commissions(str(state_id))
+        except (StateNotFoundException, UpstreamUnavailableException):
+            raise
+        except Exception as e:
+            logger.error(f"Error loading commissions for state-wide search: {e}")
+            raise CaseSearchException(f"Case search failed: {str(e)}")
+        
+        semaphore = asyncio.Semaphore(max(1, settings.STATE_WIDE_CONCURRENCY))
+        
+        async def search_commission(commission: Dict[str, Any]) -> Tuple[CaseSearchResponse, str]:
+            async with semaphore:
+                response = await self._search_resolved(commission["commissionId"], request, search_type, source)
+                return response, get_cache_status()
+        
+        results = await asyncio.gather(
+            *(search_commission(commission) for commission in commissions),
+            return_exceptions=True
+        )
+        
+        cases: List[CaseResponse] = []
+        seen_case_numbers = set()
+        commission_totals: List[CommissionSearchTotal] = []
+        failures: List[CommissionSearchFailure] = []
+        statuses = set()
+        for commission, result in zip(commissions, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                logger.warning(f"State-wide search failed for commission {commission.get('commissionNameEn')}: {result}")
+                failures.append(CommissionSearchFailure(
+                    commission_id=commission["commissionId"],
+                    commission=commission.get("commissionNameEn", ""),
+                    error=str(result)
+                ))
+                continue
+            
+            response, status = result
+            statuses.add(status)
+            commission_totals.append(CommissionSearchTotal(
+                commission_id=commission["commissionId"],
+                commission=commission.get("commissionNameEn", ""),
+                total_count=response.total_count
+            ))
+            for case in response.cases:
+                if case.case_number not in seen_case_numbers:
+                    seen_case_numbers.add(case.case_number)
+                    cases.append(case)
+        
+        _cache_status.set(statuses.pop() if len(statuses) == 1 else "MISS")
+        return StateWideSearchResponse.model_construct(
+            cases=cases,
+            total_count=len(cases),
+            page=request.page,
+            size=request.size,
+            commissions_searched=len(commissions),
+            commission_totals=commission_totals,
+            failures=failures
+        )
+    
+    async def search_batch(self, items: List[BatchSearchItem]) -> BatchSearchResponse:
+        """
+        Run many searches, resolving each state/commission pair only once
+        
+        Items are grouped by (state, commission) and each group is resolved
+        once; the searches then run on a pool of BATCH_CONCURRENCY workers.
+        A failing item is reported with its status and error and does not
+        affect the others.
+        
+        Args:
+            items: Searches to run
+            
+        Returns:
+            Batch response with one result per item, in input order
+        """
+        workers = max(1, settings.BATCH_CONCURRENCY)
+        results: List[BatchSearchResult] = [None] * len(items)
+        
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, item in enumerate(items):
+            key = (item.request.state, item.request.commission)
+            groups.setdefault(key, []).append(index)
+        
+        resolved: Dict[Tuple[str, str], int] = {}
+        
+        async def resolve_worker(pending: Iterator[Tuple[str, str]]) -> None:
+            for key in pending:
+                try:
+                    resolved[key] = await self.resolve_commission(items[groups[key][0]].request)
+                except Exception as e:
+                    for index in groups[key]:
+                        results[index] = self._batch_failure(index, e)
+        
+        async def search_worker(pending: Iterator[int]) -> None:
+            for index in pending:
+                if results[index] is not None:
+                    continue
+                item = items[index]
+                commission_id = resolved[(item.request.state, item.request.commission)]
+                try:
+                    response = await self._search_resolved(
+                        commission_id, item.request, item.search_type.search_type
+                    )
+                    results[index] = BatchSearchResult(index=index, status=200, result=response)
+                except Exception as e:
+                    results[index] = self._batch_failure(index, e)
+        
+        # Workers share one iterator, so each key or item is taken exactly once
+        pending_groups = iter(groups)
+        await asyncio.gather(*(resolve_worker(pending_groups) for _ in range(workers)))
+        pending_items = iter(range(len(items)))
+        await asyncio.gather(*(search_worker(pending_items) for _ in range(workers)))
+        
+        return BatchSearchResponse(results=results)
+    
+    @staticmethod
+    def _batch_failure(index: int, error: Exception) -> BatchSearchResult:
+        """Build a failed batch result with the status the single-search endpoint would return"""
+        if isinstance(error, (StateNotFoundException, CommissionNotFoundException)):
+            return BatchSearchResult(index=index, status=404, error=str(error))
+        if isinstance(error, CaseSearchException):
+            return BatchSearchResult(index=index, status=400, error=str(error))
+        if isinstance(error, UpstreamUnavailableException):
+            return BatchSearchResult(index=index, status=503, error=str(error))
+        logger.error(f"Error in batch search item {index}: {error}")
+        return BatchSearchResult(index=index, status=400, error=f"Case search failed: {str(error)}")
+    
+    async def _search_resolved(
+        self,
+        commission_id: int,
+        request: SearchParams,
+        search_type: int,
+        source: Optional[SearchSource] = None
+    ) -> CaseSearchResponse:
+        """
+        Search an already resolved commission, going through the local store or result cache
+        
+        With source "local" the search is answered from the case store only;
+        with "auto" the store answers when store_coverage reports it complete
+        for the commission and date window, and the upstream search runs
+        otherwise.
+        
+        Args:
+            commission_id: Resolved commission ID
+            request: Case search request
+            search_type: Type of search (SearchType enum)
+            source: Where to answer from (defaults to CASE_SEARCH_SOURCE)
+            
+        Returns:
+            Case search response with results
+        """
+        source = SearchSource(source or settings.CASE_SEARCH_SOURCE)
+        if source != SearchSource.UPSTREAM:
+            local = await self._search_local(commission_id, request, search_type, required=source == SearchSource.LOCAL)
+            if local is not None:
+                _cache_status.set("LOCAL")
+                return local
+        
+        key = self._result_cache_key(commission_id, request, search_type)
+        if not settings.RESULT_CACHE_ENABLED:
+            _cache_status.set("BYPASS")
+            return await self._search_shared(key, commission_id, request, search_type)
+        
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            _cache_status.set("HIT")
+            return cached
+        
+        _cache_status.set("MISS")
+        try:
+            return await self._search_shared(key, commission_id, request, search_type)
+        except UpstreamUnavailableException as e:
+            # Circuit open or upstream saturated: an expired result beats an error
+            stale = self.result_cache.get_stale(key)
+            if stale is None:
+                raise
+            logger.warning(f"Serving stale results for commission {commission_id}: {e}")
+            _cache_status.set("STALE")
+            return stale
+    
+    async def _search_shared(
+        self,
+        key: Hashable,
+        commission_id: int,
+        request: SearchParams,
+        search_type: int
+    ) -> CaseSearchResponse:
+        """
+        Run an upstream search and cache its response, joining an identical one in flight
+        
+        Each upstream result is consumed by exactly one search, which matters
+        because its spooled PDF data is released once stored.
+        """
+        return await self._inflight.do(key, lambda: self._search_and_cache(key, commission_id, request, search_type))
+    
+    async def _search_and_cache(
+        self,
+        key: Hashable,
+        commission_id: int,
+        request: SearchParams,
+        search_type: int
+    ) -> CaseSearchResponse:
+        """Run an upstream search and store its response in the result cache"""
+        response = await self._search_upstream(commission_id, request, search_type)
+        if settings.RESULT_CACHE_ENABLED:
+            self._cache_result(key, response, search_type)
+        return response
+    
+    async def _search_local(
+        self,
+        commission_id: int,
+        request: SearchParams,
+        search_type: int,
+        required: bool
+    ) -> Optional[CaseSearchResponse]:
+        """
+        Answer a search from the local case store
+        
+        Args:
+            commission_id: Resolved commission ID
+            request: Case search request
+            search_type: Type of search (SearchType enum)
+            required: Raise instead of returning None when the store cannot answer
             
-            logger.info(f"Searching cases - State ID: {state_id}, Commission ID: {commission_id}")
+        Returns:
+            Local results, or None if the store is unavailable, fails, cannot
+            run this search type or is not known to hold every matching case
+            (and required is False)
+        """
+        if self.case_store is None or search_type not in LOCAL_SEARCH_TYPES:
+            if required:
+                reason = "is disabled" if self.case_store is None else "cannot answer this search type"
+                raise CaseSearchException(f"Local case store {reason}")
+            return None
+        
+        if not required:
+            # Partial results would come with a short total_count and empty later pages
+            try:
+                complete = self.store_coverage is not None and await self.store_coverage(
+                    commission_id, request.from_date, request.to_date
+                )
+            except Exception as e:
+                logger.warning(f"Local coverage check failed for commission {commission_id}, searching upstream: {e}")
+                return None
+            if not complete:
+                return None
+        
+        try:
+            with span("local"):
+                cases, total = await self.case_store.search(
+                    commission_id,
+                    search_type,
+                    sanitize_search_value(request.search_value),
+                    request.from_date,
+                    request.to_date,
+                    request.page,
+                    request.size
+                )
+        except Exception as e:
+            if required:
+                raise
+            # A locked or corrupt store must not fail searches upstream can answer
+            logger.warning(f"Local search failed for commission {commission_id}, searching upstream: {e}")
+            return None
+        
+        return CaseSearchResponse.model_construct(cases=cases, total_count=total, page=request.page, size=request.size)
+    
+    async def _search_upstream(
+        self,
+        commission_id: int,
+        request: SearchParams,
+        search_type: int
+    ) -> CaseSearchResponse:
+        """
+        Run a search against Jagriti for an already resolved commission
+        
+        Args:
+            commission_id: Resolved commission ID
+            request: Case search request
+            search_type: Type of search (SearchType enum)
             
-            # Search cases
+        Returns:
+            Case search response with results
+        """
+        with span("upstream"):
             result = await self.jagriti_client.get_case_details_by_search(
                 commission_id=commission_id,
                 search_type=search_type,
@@ -54,81 +484,194 @@ class CaseService:
                 from_date=request.from_date,
                 to_date=request.to_date
             )
-            
-            if result.get("status") == 200 and result.get("data"):
-                cases = []
-                for case_data in result["data"]:
-                    # Log the case data to see what fields are available
-                    logger.info(f"Case data fields: {list(case_data.keys())}")
-                    
-                    # Transform case data
-                    transformed_case = transform_case_data(case_data)
-                    
-                    # Check if we have base64 PDF data from Jagriti
-                    base64_pdf_data = case_data.get("documentBase64")  # From Jagriti response
-                    
-                    if base64_pdf_data:
-                        logger.info(f"Found base64 PDF data for case {transformed_case['case_number']}")
-                        # Store PDF and get download URL
-                        try:
-                            document_link = self.pdf_service.store_pdf(base64_pdf_data, transformed_case['case_number'])
-                            logger.info(f"PDF stored successfully, download URL: {document_link}")
-                        except Exception as e:
-                            logger.warning(f"Failed to store PDF for case {transformed_case['case_number']}: {e}")
-                            document_link = transformed_case.get('document_link', 'https://e-jagriti.gov.in/.../case123')
-                    else:
-                        logger.info(f"No base64 PDF data found for case {transformed_case['case_number']}")
-                        # Use original document link
-                        document_link = transformed_case.get('document_link', 'https://e-jagriti.gov.in/.../case123')
-                    
-                    # Update document link
-                    transformed_case['document_link'] = document_link
-                    logger.info(f"Final document_link for case {transformed_case['case_number']}: {document_link}")
-                    
-                    cases.append(CaseResponse(**transformed_case))
+        
+        if result.get("status") == 200 and result.get("data"):
+            cases = []
+            debug = logger.isEnabledFor(logging.DEBUG)
+            for case_data in result["data"]:
+                # Transform case data; the original document link is kept unless a PDF is stored.
+                # Every field is already a string, so the model is built without validation.
+                with span("transform"):
+                    case = CaseResponse.model_construct(**transform_case_data(case_data))
                 
-                return CaseSearchResponse(
-                    cases=cases,
-                    total_count=result.get("totalCount", len(cases)),
-                    page=request.page,
-                    size=request.size
-                )
-            else:
-                return CaseSearchResponse(
-                    cases=[],
-                    total_count=0,
-                    page=request.page,
-                    size=request.size
-                )
+                # Check if we have base64 PDF data from Jagriti
+                base64_pdf_data = case_data.get("documentBase64")  # From Jagriti response
                 
-        except Exception as e:
-            logger.error(f"Error in case search: {e}")
-            raise CaseSearchException(f"Case search failed: {str(e)}")
+                if base64_pdf_data:
+                    # Store PDF and get download URL
+                    try:
+                        with span("pdf"):
+                            case.document_link = await self.pdf_service.register_pdf(base64_pdf_data, case.case_number)
+                    except Exception as e:
+                        logger.warning("Failed to store PDF for case %s: %s", case.case_number, e)
+                
+                if debug and sampled(settings.CASE_LOG_SAMPLE_RATE):
+                    logger.debug(
+                        "Case %s fields: %s, base64 PDF: %s, document_link: %s",
+                        case.case_number, sorted(case_data), bool(base64_pdf_data), case.document_link
+                    )
+                
+                cases.append(case)
+            
+            if self.case_store is not None:
+                await self.case_store.put(commission_id, cases)
+            
+            return CaseSearchResponse.model_construct(
+                cases=cases,
+                total_count=int(result.get("totalCount") or len(cases)),
+                page=request.page,
+                size=request.size
+            )
+        else:
+            return CaseSearchResponse.model_construct(
+                cases=[],
+                total_count=0,
+                page=request.page,
+                size=request.size
+            )
+    
+    @staticmethod
+    def _result_cache_key(
+        commission_id: int,
+        request: SearchParams,
+        search_type: int
+    ) -> Hashable:
+        """Build the result cache key from the resolved commission and sanitized request"""
+        return (
+            str(commission_id),
+            search_type,
+            sanitize_search_value(request.search_value),
+            request.judge_id,
+            request.from_date,
+            request.to_date,
+            request.page,
+            request.size,
+        )
+    
+    def _cache_result(self, key: Hashable, response: CaseSearchResponse, search_type: int) -> None:
+        """Store a search response, using the negative TTL for empty results"""
+        if response.cases:
+            ttl = settings.RESULT_CACHE_TTLS.get(search_type, settings.RESULT_CACHE_TTL)
+        else:
+            ttl = settings.RESULT_CACHE_NEGATIVE_TTL
+        size = len(response.model_dump_json())
+        self.result_cache.set(key, response, size, ttl)
     
-    async def search_by_case_number(self, request: CaseSearchRequest) -> CaseSearchResponse:
+    def coalescing_stats(self) -> Dict[str, int]:
+        """Return how many upstream searches ran and how many callers joined one in flight"""
+        return self._inflight.stats()
+    
+    async def search_by_case_number(
+        self, request: CaseSearchRequest, source: Optional[SearchSource] = None
+    ) -> CaseSearchResponse:
         """Search cases by case number"""
-        return await self.search_cases(request, SearchType.CASE_NUMBER)
+        return await self.search_cases(request, SearchType.CASE_NUMBER, source)
     
-    async def search_by_complainant(self, request: CaseSearchRequest) -> CaseSearchResponse:
+    async def search_by_complainant(
+        self, request: CaseSearchRequest, source: Optional[SearchSource] = None
+    ) -> CaseSearchResponse:
         """Search cases by complainant name"""
-        return await self.search_cases(request, SearchType.COMPLAINANT)
+        return await self.search_cases(request, SearchType.COMPLAINANT, source)
     
-    async def search_by_respondent(self, request: CaseSearchRequest) -> CaseSearchResponse:
+    async def search_by_respondent(
+        self, request: CaseSearchRequest, source: Optional[SearchSource] = None
+    ) -> CaseSearchResponse:
         """Search cases by respondent name"""
-        return await self.search_cases(request, SearchType.RESPONDENT)
+        return await self.search_cases(request, SearchType.RESPONDENT, source)
     
-    async def search_by_complainant_advocate(self, request: CaseSearchRequest) -> CaseSearchResponse:
+    async def search_by_complainant_advocate(
+        self, request: CaseSearchRequest, source: Optional[SearchSource] = None
+    ) -> CaseSearchResponse:
         """Search cases by complainant advocate name"""
-        return await self.search_cases(request, SearchType.COMPLAINANT_ADVOCATE)
+        return await self.search_cases(request, SearchType.COMPLAINANT_ADVOCATE, source)
     
-    async def search_by_respondent_advocate(self, request: CaseSearchRequest) -> CaseSearchResponse:
+    async def search_by_respondent_advocate(
+        self, request: CaseSearchRequest, source: Optional[SearchSource] = None
+    ) -> CaseSearchResponse:
         """Search cases by respondent advocate name"""
-        return await self.search_cases(request, SearchType.RESPONDENT_ADVOCATE)
+        return await self.search_cases(request, SearchType.RESPONDENT_ADVOCATE, source)
     
-    async def search_by_industry_type(self, request: CaseSearchRequest) -> CaseSearchResponse:
+    async def search_by_industry_type(
+        self, request: CaseSearchRequest, source: Optional[SearchSource] = None
+    ) -> CaseSearchResponse:
         """Search cases by industry type"""
-        return await self.search_cases(request, SearchType.INDUSTRY_TYPE)
+        return await self.search_cases(request, SearchType.INDUSTRY_TYPE, source)
     
-    async def search_by_judge(self, request: CaseSearchRequest) -> CaseSearchResponse:
+    async def search_by_judge(
+        self, request: CaseSearchRequest, source: Optional[SearchSource] = None
+    ) -> CaseSearchResponse:
         """Search cases by judge"""
-        return await self.search_cases(request, SearchType.JUDGE)
+        return await self.search_cases(request, SearchType.JUDGE, source)
+    
+    async def refresh_search(
+        self,
+        commission_id: int,
+        request: CaseSearchRequest,
+        search_type: int
+    ) -> CaseSearchResponse:
+        """
+        Fetch a search from Jagriti for a resolved commission, bypassing caches
+        
+        The cases land in the case store. The response is not put in the
+        result cache: sync pages use a search value and page size user
+        searches do not, so they would only evict real entries. Used by the
+        background sync.
+        
+        Args:
+            commission_id: Resolved commission ID
+            request: Case search request; state and commission names are not used
+            search_type: Type of search (SearchType enum)
+            
+        Returns:
+            Case search response with results
+        """
+        return await self._search_upstream(commission_id, request, search_type)
+    
+    async def local_search(
+        self,
+        query: str,
+        fields: Optional[List[NameField]] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        page: int = 0,
+        size: int = 30
+    ) -> LocalSearchResponse:
+        """
+        Full-text search of party and advocate names across all stored cases
+        
+        Args:
+            query: Free-text name query
+            fields: Name fields to search, defaults to all
+            from_date: Optional start of the filing date window (YYYY-MM-DD)
+            to_date: Optional end of the filing date window (YYYY-MM-DD)
+            page: Page number (0-based)
+            size: Number of results per page
+            
+        Returns:
+            Ranked matches from every commission
+        """
+        if self.case_store is None:
+            raise CaseSearchException("Local case store is disabled")
+        
+        terms, matches, total = await self.case_store.search_names(
+            query,
+            [field.value for field in fields] if fields else None,
+            from_date,
+            to_date,
+            page,
+            size
+        )
+        if not terms:
+            raise CaseSearchException("Query contains no searchable name terms")
+        _cache_status.set("LOCAL")
+        
+        hits = [
+            LocalSearchHit(
+                commission_id=match.commission_id,
+                score=match.score,
+                matched_fields=match.fields,
+                case=match.case
+            )
+            for match in matches
+        ]
+        return LocalSearchResponse(query=query, terms=terms, hits=hits, total_count=total, page=page, size=size)
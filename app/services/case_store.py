@@ -0,0 +1,512 @@
+"""
+Persistent local store of cases seen in search results
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from app.models.base import SearchType
+from app.models.case import CaseResponse
+from app.utils.helpers import normalize_date
+from app.utils.metrics import CASE_STORE_FAILED_ROWS
+from app.utils.tokenize import tokenize_name, tokenize_query
+
+logger = logging.getLogger(__name__)
+
+# Case fields stored per row, in CaseResponse order
+CASE_FIELDS = (
+    "case_number",
+    "case_stage",
+    "filing_date",
+    "complainant",
+    "complainant_advocate",
+    "respondent",
+    "respondent_advocate",
+    "document_link",
+)
+
+# Column matched by each name search; case numbers are matched exactly
+_NAME_COLUMNS = {
+    SearchType.COMPLAINANT: "complainant",
+    SearchType.RESPONDENT: "respondent",
+    SearchType.COMPLAINANT_ADVOCATE: "complainant_advocate",
+    SearchType.RESPONDENT_ADVOCATE: "respondent_advocate",
+}
+
+# Search types the store can answer; industry type and judge are not part of a case record
+LOCAL_SEARCH_TYPES = frozenset({SearchType.CASE_NUMBER, *_NAME_COLUMNS})
+
+# Name fields in the full-text index; postings store the position in this tuple
+NAME_FIELDS = (
+    "complainant",
+    "complainant_advocate",
+    "respondent",
+    "respondent_advocate",
+)
+_NAME_OFFSETS = [CASE_FIELDS.index(field) for field in NAME_FIELDS]
+_FILING_DATE = CASE_FIELDS.index("filing_date")
+
+# Full-text scoring: exact term matches outweigh prefix matches, and a case
+# whose query terms all occur in one name field beats one where they are spread
+EXACT_MATCH_WEIGHT = 1.0
+PREFIX_MATCH_WEIGHT = 0.5
+SAME_FIELD_BONUS = 0.5
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS cases (
+        commission_id INTEGER NOT NULL,
+        case_number TEXT NOT NULL COLLATE NOCASE,
+        case_stage TEXT NOT NULL DEFAULT '',
+        filing_date TEXT NOT NULL DEFAULT '',
+        complainant TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+        complainant_advocate TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+        respondent TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+        respondent_advocate TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+        document_link TEXT NOT NULL DEFAULT '',
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (commission_id, case_number)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS cases_case_number ON cases (case_number)",
+    "CREATE INDEX IF NOT EXISTS cases_filing_date ON cases (filing_date)",
+    "CREATE INDEX IF NOT EXISTS cases_complainant ON cases (complainant)",
+    "CREATE INDEX IF NOT EXISTS cases_complainant_advocate ON cases (complainant_advocate)",
+    "CREATE INDEX IF NOT EXISTS cases_respondent ON cases (respondent)",
+    "CREATE INDEX IF NOT EXISTS cases_respondent_advocate ON cases (respondent_advocate)",
+    # Inverted index over the name fields, clustered by term for prefix range scans
+    """
+    CREATE TABLE IF NOT EXISTS postings (
+        term TEXT NOT NULL,
+        commission_id INTEGER NOT NULL,
+        case_number TEXT NOT NULL COLLATE NOCASE,
+        field INTEGER NOT NULL,
+        PRIMARY KEY (term, commission_id, case_number, field)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS postings_case ON postings (commission_id, case_number)",
+]
+
+_UPSERT = f"""
+    INSERT INTO cases (commission_id, {", ".join(CASE_FIELDS)}, updated_at)
+    VALUES ({", ".join("?" * (len(CASE_FIELDS) + 2))})
+    ON CONFLICT (commission_id, case_number) DO UPDATE SET
+    {", ".join(f"{field} = excluded.{field}" for field in CASE_FIELDS[1:])},
+    updated_at = excluded.updated_at
+"""
+
+_DELETE_POSTINGS = "DELETE FROM postings WHERE commission_id = ? AND case_number = ?"
+_INSERT_POSTING = "INSERT OR IGNORE INTO postings (term, commission_id, case_number, field) VALUES (?, ?, ?, ?)"
+
+CaseRow = Tuple[Any, ...]
+
+# Attempts at writing a batch before its cases are dropped, and the delay before each retry
+WRITE_ATTEMPTS = 3
+WRITE_RETRY_DELAY = 0.1
+
+class NameMatch(NamedTuple):
+    """Case found by a full-text name search"""
+    commission_id: int
+    case: CaseResponse
+    score: float
+    fields: List[str]
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so the value matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _postings(row: CaseRow) -> Iterator[Tuple[str, int, str, int]]:
+    """Yield the postings of an upsert row (commission_id, *CASE_FIELDS, updated_at)"""
+    commission_id, case_number = row[0], row[1]
+    for field, offset in enumerate(_NAME_OFFSETS):
+        for term in tokenize_name(row[1 + offset]):
+            yield term, commission_id, case_number, field
+
+class CaseStore:
+    """
+    SQLite store of every case returned by upstream searches
+
+    Cases are keyed by (commission, case number) and indexed by case number,
+    filing date and party/advocate names. The database runs in WAL mode, so
+    readers never block the writer. Writes are write-behind: ``put`` queues
+    rows and a background task upserts them in batched transactions on a
+    single writer thread. Reads run on a small pool of reader threads, each
+    with its own connection.
+
+    The same transaction that upserts a case rewrites its postings in an
+    inverted index of normalized name terms, so ``search_names`` can match
+    names by term and term prefix across every commission. The index lives in
+    the database file, which is memory-mapped, so it is warm on restart
+    without being rebuilt.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_pending: int = 10000,
+        readers: int = 4,
+        mmap_size: int = 256 * 1024 * 1024
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.mmap_size = mmap_size
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="case-store-writer")
+        self._readers = ThreadPoolExecutor(max_workers=max(1, readers), thread_name_prefix="case-store-reader")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._pending: List[CaseRow] = []
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.written = 0
+        self.batches = 0
+        # Cases dropped after failed writes; a store that dropped cases is missing some
+        self.failed = 0
+
+        # Create the schema up front so a broken path fails at startup
+        self._writer.submit(self._create_schema).result()
+        logger.info(f"Case store opened at {self.path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _create_schema(self) -> None:
+        conn = self._connection()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            # Databases written before the full-text index existed get it built once
+            unindexed = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM cases) AND NOT EXISTS (SELECT 1 FROM postings)"
+            ).fetchone()[0]
+            if unindexed:
+                rows = conn.execute(f"SELECT commission_id, {', '.join(CASE_FIELDS)} FROM cases").fetchall()
+                conn.executemany(_INSERT_POSTING, (posting for row in rows for posting in _postings(row)))
+                logger.info(f"Built full-text index for {len(rows)} stored cases")
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, batch: List[CaseRow]) -> None:
+        """Upsert a batch of rows and rewrite their postings"""
+        # Only the last row queued for a case survives the upsert, so only it is indexed
+        batch = list({(row[0], row[1].lower()): row for row in batch}.values())
+        conn.executemany(_UPSERT, batch)
+        conn.executemany(_DELETE_POSTINGS, ((row[0], row[1]) for row in batch))
+        conn.executemany(_INSERT_POSTING, (posting for row in batch for posting in _postings(row)))
+
+    async def run_read(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Run a read-only function against the database on a reader thread
+
+        Args:
+            fn: Called with the reader thread's connection
+
+        Returns:
+            Whatever fn returns
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, lambda: fn(self._connection()))
+
+    async def run_write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Run a function in a transaction on the writer thread
+
+        Args:
+            fn: Called with the writer connection inside a transaction
+
+        Returns:
+            Whatever fn returns
+        """
+        def write() -> Any:
+            conn = self._connection()
+            with conn:
+                return fn(conn)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, write)
+
+    # Write-behind
+
+    async def put(self, commission_id: int, cases: Sequence[CaseResponse]) -> None:
+        """
+        Queue cases for upsert under a commission
+
+        Rows are flushed in batches every flush_interval seconds or as soon as
+        batch_size rows are waiting. Once max_pending rows are queued, callers
+        wait for a flush instead of growing the queue further.
+
+        Args:
+            commission_id: Commission the cases were found under
+            cases: Cases from a search response; filing dates are stored in ISO format
+        """
+        if not cases:
+            return
+        now = time.time()
+        for case in cases:
+            row = [getattr(case, field) for field in CASE_FIELDS]
+            # Date range filters compare filing dates as text, which needs ISO dates
+            row[_FILING_DATE] = normalize_date(row[_FILING_DATE])
+            self._pending.append((commission_id, *row, now))
+
+        if self._flusher is None:
+            self._flush_requested = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_periodically())
+        if len(self._pending) >= self.batch_size:
+            self._flush_requested.set()
+        if len(self._pending) >= self.max_pending:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write every queued row now
+
+        A batch that fails is retried up to WRITE_ATTEMPTS times in all. If
+        every attempt fails its cases are dropped and counted in ``failed``
+        (and the case_store_failed_rows_total metric), so callers that need
+        them on disk, such as the sync, can tell.
+        """
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            while self._pending:
+                batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                if await self._write_with_retries(batch):
+                    self.written += len(batch)
+                    self.batches += 1
+                else:
+                    self.failed += len(batch)
+                    CASE_STORE_FAILED_ROWS.inc(len(batch))
+
+    async def _write_with_retries(self, batch: List[CaseRow]) -> bool:
+        """Write a batch, retrying failed attempts; returns False if every attempt failed"""
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                await self.run_write(lambda conn: self._write_batch(conn, batch))
+                return True
+            except Exception as e:
+                if attempt == WRITE_ATTEMPTS:
+                    logger.error(f"Case store write of {len(batch)} cases failed {attempt} times, dropping them: {e}")
+                    return False
+                logger.warning(f"Case store write of {len(batch)} cases failed, retrying: {e}")
+                await asyncio.sleep(WRITE_RETRY_DELAY * attempt)
+        return False
+
+    async def _flush_periodically(self) -> None:
+        """Flush queued rows whenever a batch fills up or the flush interval passes"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    # Reads
+
+    async def search(
+        self,
+        commission_id: int,
+        search_type: int,
+        search_value: str,
+        from_date: str,
+        to_date: str,
+        page: int,
+        size: int
+    ) -> Tuple[List[CaseResponse], int]:
+        """
+        Search stored cases the way the upstream search endpoint would
+
+        Case numbers match exactly and names match as case-insensitive
+        substrings, within one commission and filing date window. Results are
+        newest filings first.
+
+        Args:
+            commission_id: Commission to search
+            search_type: One of LOCAL_SEARCH_TYPES
+            search_value: Sanitized search value
+            from_date: Start of the filing date window (YYYY-MM-DD)
+            to_date: End of the filing date window (YYYY-MM-DD)
+            page: Page number (0-based)
+            size: Page size
+
+        Returns:
+            Cases on the requested page and the total number of matches
+        """
+        if search_type == SearchType.CASE_NUMBER:
+            condition, value = "case_number = ?", search_value
+        else:
+            condition = f"{_NAME_COLUMNS[search_type]} LIKE ? ESCAPE '\\'"
+            value = f"%{_escape_like(search_value)}%"
+        where = f"commission_id = ? AND {condition} AND filing_date BETWEEN ? AND ?"
+        params = (commission_id, value, from_date, to_date)
+
+        def query(conn: sqlite3.Connection) -> Tuple[List[CaseRow], int]:
+            total = conn.execute(f"SELECT COUNT(*) FROM cases WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {', '.join(CASE_FIELDS)} FROM cases WHERE {where} "
+                f"ORDER BY filing_date DESC, case_number LIMIT ? OFFSET ?",
+                (*params, size, page * size)
+            ).fetchall()
+            return rows, total
+
+        rows, total = await self.run_read(query)
+        return [CaseResponse.model_construct(**dict(zip(CASE_FIELDS, row))) for row in rows], total
+
+    async def search_names(
+        self,
+        query: str,
+        fields: Optional[Sequence[str]] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        page: int = 0,
+        size: int = 30
+    ) -> Tuple[List[str], List[NameMatch], int]:
+        """
+        Full-text search of party and advocate names across every commission
+
+        The query is tokenized like the indexed names, and every query term
+        must match a term in one of the searched fields, either exactly or as
+        a prefix. Prefixes are folded as partial words (see tokenize_query),
+        so truncated words such as "Lak" still find "Lakshmi". Each term scores EXACT_MATCH_WEIGHT or PREFIX_MATCH_WEIGHT
+        for its best match, plus SAME_FIELD_BONUS when one field matches all
+        terms. Ties are broken by newest filing first.
+
+        Args:
+            query: Free-text name query, e.g. "Adv. Lakshmi Nar"
+            fields: Name fields to search (from NAME_FIELDS), defaults to all
+            from_date: Optional start of the filing date window (YYYY-MM-DD)
+            to_date: Optional end of the filing date window (YYYY-MM-DD)
+            page: Page number (0-based)
+            size: Page size
+
+        Returns:
+            Normalized query terms, matches on the requested page and the
+            total number of matches
+        """
+        query_terms = tokenize_query(query)
+        terms = [query_term.term for query_term in query_terms]
+        if not terms:
+            return terms, [], 0
+        field_ids = sorted({NAME_FIELDS.index(field) for field in fields or NAME_FIELDS})
+        field_list = ", ".join(str(field) for field in field_ids)
+
+        hits, params = [], []
+        for number, query_term in enumerate(query_terms):
+            ranges = " OR ".join(["(term >= ? AND term < ?)"] * len(query_term.prefixes))
+            hits.append(
+                f"SELECT commission_id, case_number, field, {number} AS term_no, "
+                f"CASE WHEN term = ? THEN {EXACT_MATCH_WEIGHT} ELSE {PREFIX_MATCH_WEIGHT} END AS weight "
+                f"FROM postings WHERE ({ranges}) AND field IN ({field_list})"
+            )
+            params.append(query_term.term)
+            for prefix in query_term.prefixes:
+                # Every term with this prefix sorts below prefix + the highest code point
+                params.extend((prefix, prefix + "\U0010ffff"))
+
+        filters, filter_params = [], []
+        if from_date:
+            filters.append("cases.filing_date >= ?")
+            filter_params.append(from_date)
+        if to_date:
+            filters.append("cases.filing_date <= ?")
+            filter_params.append(to_date)
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+        matches_sql = f"""
+            WITH hits AS ({" UNION ALL ".join(hits)}),
+            best AS (
+                SELECT commission_id, case_number, term_no, MAX(weight) AS weight
+                FROM hits GROUP BY commission_id, case_number, term_no
+            ),
+            matched AS (
+                SELECT commission_id, case_number, SUM(weight) AS score
+                FROM best GROUP BY commission_id, case_number
+                HAVING COUNT(*) = {len(terms)}
+            ),
+            per_field AS (
+                SELECT commission_id, case_number, field, COUNT(DISTINCT term_no) AS terms
+                FROM hits GROUP BY commission_id, case_number, field
+            ),
+            ranked AS (
+                SELECT matched.commission_id, matched.case_number,
+                    matched.score + CASE WHEN MAX(per_field.terms) = {len(terms)} THEN {SAME_FIELD_BONUS} ELSE 0 END AS score,
+                    GROUP_CONCAT(per_field.field) AS fields
+                FROM matched JOIN per_field USING (commission_id, case_number)
+                GROUP BY matched.commission_id, matched.case_number
+            )
+            SELECT ranked.commission_id, ranked.score, ranked.fields,
+                {", ".join(f"cases.{field}" for field in CASE_FIELDS)}
+            FROM ranked JOIN cases USING (commission_id, case_number)
+            {where}
+        """
+        params.extend(filter_params)
+
+        def query(conn: sqlite3.Connection) -> Tuple[List[CaseRow], int]:
+            total = conn.execute(f"SELECT COUNT(*) FROM ({matches_sql})", params).fetchone()[0]
+            rows = conn.execute(
+                f"{matches_sql} ORDER BY ranked.score DESC, cases.filing_date DESC, cases.case_number LIMIT ? OFFSET ?",
+                (*params, size, page * size)
+            ).fetchall()
+            return rows, total
+
+        rows, total = await self.run_read(query)
+        matches = [
+            NameMatch(
+                commission_id=row[0],
+                case=CaseResponse.model_construct(**dict(zip(CASE_FIELDS, row[3:]))),
+                score=row[1],
+                fields=[NAME_FIELDS[int(field)] for field in sorted(set(row[2].split(",")))],
+            )
+            for row in rows
+        ]
+        return terms, matches, total
+
+    async def count(self) -> int:
+        """Number of stored cases"""
+        return await self.run_read(lambda conn: conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return write-behind counters, including cases dropped after failed writes"""
+        return {
+            "path": str(self.path),
+            "pending": len(self._pending),
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+        }
+
+    async def close(self) -> None:
+        """Flush queued rows and close every connection"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
@@ -1,50 +1,165 @@
 """
 Jagriti API client for interacting with the Jagriti portal
 """
+import asyncio
 import httpx
+import importlib.util
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from app.config import settings
 from app.utils.exceptions import (
     JagritiAPIError, 
     StateNotFoundException, 
     CommissionNotFoundException,
-    CaseSearchException
+    CaseSearchException,
+    CircuitOpenException,
+    ConnectionPoolExhaustedException,
+    UpstreamUnavailableException
 )
-from app.utils.helpers import find_matching_item, sanitize_search_value
+from app.utils.cache import TTLCache
+from app.utils.concurrency import AdaptiveLimiter, LimiterPermit
+from app.utils.resilience import CircuitBreaker, LatencyWindow, RetryBudget, backoff_delay, hedged
+from app.utils.helpers import sanitize_search_value
+from app.utils.json_stream import StreamingObjectParser
+from app.utils.metrics import UPSTREAM_IN_FLIGHT, UPSTREAM_REQUEST_DURATION
+from app.utils.resolver import NameIndex
+from app.utils.singleflight import SingleFlight
+from app.utils.timing import span
 
 logger = logging.getLogger(__name__)
 
+# Upstream endpoints with their own circuit breaker and latency window
+ENDPOINTS = ("states", "commissions", "search")
+
+def _is_overload_signal(error: Exception) -> bool:
+    """Check whether a failed request suggests the upstream is overloaded"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, httpx.TransportError)
+
+def _h2_installed() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is available"""
+    return importlib.util.find_spec("h2") is not None
+
 class JagritiClient:
     """Client for interacting with Jagriti API"""
     
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Create the client and its connection pool
+        
+        Args:
+            transport: Transport to send requests through instead of a pooled
+                network connection (pool limits and HTTP/2 then do not apply)
+        """
         self.base_url = settings.JAGRITI_BASE_URL
+        self.http2 = settings.JAGRITI_HTTP2 and _h2_installed()
+        if settings.JAGRITI_HTTP2 and not self.http2:
+            logger.warning("JAGRITI_HTTP2 is set but the h2 package is not installed, using HTTP/1.1")
+        self.limits = httpx.Limits(
+            max_connections=settings.JAGRITI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.JAGRITI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.JAGRITI_KEEPALIVE_EXPIRY
+        )
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "Accept": "application/json,text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1"
+        }
+        if self.http2:
+            # Connection-specific headers are not allowed over HTTP/2
+            del headers["Connection"]
         self.client = httpx.AsyncClient(
-            timeout=settings.JAGRITI_TIMEOUT,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                "Accept": "application/json,text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
+            timeout=httpx.Timeout(
+                settings.JAGRITI_TIMEOUT,
+                connect=settings.JAGRITI_CONNECT_TIMEOUT,
+                read=settings.JAGRITI_READ_TIMEOUT,
+                pool=settings.JAGRITI_POOL_TIMEOUT
+            ),
+            limits=self.limits,
+            http2=self.http2,
+            transport=transport,
+            headers=headers
         )
+        # Adaptive limit on concurrent upstream requests
+        self._limiter = AdaptiveLimiter(
+            initial_limit=settings.JAGRITI_LIMIT_INITIAL,
+            min_limit=settings.JAGRITI_LIMIT_MIN,
+            max_limit=settings.JAGRITI_LIMIT_MAX,
+            backoff=settings.JAGRITI_LIMIT_BACKOFF,
+            latency_tolerance=settings.JAGRITI_LIMIT_LATENCY_TOLERANCE,
+            queue_timeout=settings.JAGRITI_LIMIT_QUEUE_TIMEOUT,
+            name="Jagriti"
+        )
+        # Retries, hedges and per-endpoint circuit breakers
+        self._retry_budget = RetryBudget(
+            ratio=settings.JAGRITI_RETRY_BUDGET_RATIO,
+            min_per_second=settings.JAGRITI_RETRY_BUDGET_MIN_PER_SECOND
+        )
+        self._breakers = {
+            endpoint: CircuitBreaker(
+                endpoint,
+                failure_threshold=settings.JAGRITI_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.JAGRITI_BREAKER_RESET_TIMEOUT
+            )
+            for endpoint in ENDPOINTS
+        }
+        self._latencies = {endpoint: LatencyWindow() for endpoint in ENDPOINTS}
+        self._retries = 0
+        self._hedges = 0
+        # Connection pool usage, counted around every upstream request
+        self._requests = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._pool_timeouts = 0
+        self._states_cache = TTLCache(settings.STATES_CACHE_TTL, name="states cache")
+        self._commissions_cache = TTLCache(
+            settings.COMMISSIONS_CACHE_TTL,
+            name="commissions cache",
+            max_entries=settings.COMMISSIONS_CACHE_MAX_STATES
+        )
+        # Concurrent identical upstream calls share one in-flight request
+        self._inflight = SingleFlight()
         
     async def get_states(self) -> List[Dict[str, Any]]:
         """
-        Get states from Jagriti API
+        Get states, served from the state catalog cache
+        
+        Stale catalogs keep being served while a single background
+        refresh fetches a new copy from the Jagriti API.
+        
+        Returns:
+            List of state data from Jagriti API
+        """
+        return (await self._get_states_index()).items
+
+    async def _get_states_index(self) -> NameIndex:
+        """Get the name index over the cached state catalog"""
+        return await self._states_cache.get("states", self._load_states_index)
+
+    async def _load_states_index(self) -> NameIndex:
+        """Fetch the state catalog and build its name index"""
+        return await self._inflight.do(
+            ("states",), lambda: self._build_index(self._fetch_states())
+        )
+
+    async def _fetch_states(self) -> List[Dict[str, Any]]:
+        """
+        Fetch states from Jagriti API
         
         Returns:
             List of state data from Jagriti API
         """
         try:
             api_url = f"{self.base_url}/services/report/report/getStateCommissionAndCircuitBench"
-            response = await self.client.get(api_url)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self._resilient("states", lambda: self._get_json("states", api_url))
             
             if data.get("status") == 200 and data.get("data"):
                 # Filter out circuit benches and get main states only
@@ -68,8 +183,12 @@ class JagritiClient:
                 states.sort(key=lambda x: x.get("commissionNameEn", ""))
                 return states
             
-            return []
+            # Raise rather than return an empty catalog, so it is never cached
+            # and a failed refresh keeps serving the previous catalog
+            raise JagritiAPIError(f"Failed to fetch states: {self._catalog_error(data)}")
             
+        except (UpstreamUnavailableException, JagritiAPIError):
+            raise
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching states: {e}")
             raise JagritiAPIError(f"Failed to fetch states: {str(e)}")
@@ -79,7 +198,37 @@ class JagritiClient:
 
     async def get_commissions(self, state_id: str) -> List[Dict[str, Any]]:
         """
-        Get commissions for a state from Jagriti API
+        Get commissions for a state, served from the per-state commission cache
+        
+        Args:
+            state_id: State commission ID
+            
+        Returns:
+            List of commission data for the state
+        """
+        return (await self._get_commissions_index(state_id)).items
+
+    async def _get_commissions_index(self, state_id: Any) -> NameIndex:
+        """Get the name index over a state's cached commission list"""
+        state_id = str(state_id)
+        return await self._commissions_cache.get(
+            state_id, lambda: self._load_commissions_index(state_id)
+        )
+
+    async def _load_commissions_index(self, state_id: str) -> NameIndex:
+        """Fetch a state's commissions and build their name index"""
+        return await self._inflight.do(
+            ("commissions", state_id), lambda: self._build_index(self._fetch_commissions(state_id))
+        )
+
+    @staticmethod
+    async def _build_index(items: Any) -> NameIndex:
+        """Await a catalog fetch and wrap the result in a name index"""
+        return NameIndex(await items)
+
+    async def _fetch_commissions(self, state_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch commissions for a state from Jagriti API
         
         Args:
             state_id: State commission ID
@@ -91,10 +240,9 @@ class JagritiClient:
             api_url = f"{self.base_url}/services/report/report/getDistrictCommissionByCommissionId"
             params = {"commissionId": state_id}
             
-            response = await self.client.get(api_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self._resilient(
+                "commissions", lambda: self._get_json("commissions", api_url, params)
+            )
             
             if data.get("status") == 200 and data.get("data"):
                 commissions = data["data"]
@@ -102,8 +250,10 @@ class JagritiClient:
                 commissions.sort(key=lambda x: x.get("commissionNameEn", ""))
                 return commissions
             
-            return []
+            raise JagritiAPIError(f"Failed to fetch commissions: {self._catalog_error(data)}")
             
+        except (UpstreamUnavailableException, JagritiAPIError):
+            raise
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching commissions for state {state_id}: {e}")
             raise JagritiAPIError(f"Failed to fetch commissions: {str(e)}")
@@ -111,6 +261,15 @@ class JagritiClient:
             logger.error(f"Error fetching commissions for state {state_id}: {e}")
             raise JagritiAPIError(f"Failed to fetch commissions: {str(e)}")
 
+    @staticmethod
+    def _catalog_error(data: Any) -> str:
+        """Describe a catalog response that carried no usable data"""
+        if not isinstance(data, dict):
+            return "unexpected response"
+        if data.get("status") != 200:
+            return f"status {data.get('status')}: {data.get('message', 'no message')}"
+        return "empty catalog"
+
     async def get_case_details_by_search(
         self, 
         commission_id: int, 
@@ -138,52 +297,137 @@ class JagritiClient:
         Returns:
             Search results from Jagriti API
         """
+        request_body = self._search_request_body(
+            commission_id, search_type, search_value, judge_id, page, size, from_date, to_date
+        )
+        
+        # Identical searches in flight at the same time share one upstream call
+        key = ("search", json.dumps(request_body, sort_keys=True))
+        return await self._inflight.do(key, lambda: self._post_search(request_body))
+
+    def _search_request_body(
+        self,
+        commission_id: int,
+        search_type: int,
+        search_value: str,
+        judge_id: str,
+        page: int,
+        size: int,
+        from_date: str,
+        to_date: str
+    ) -> Dict[str, Any]:
+        """Build a getCaseDetailsBySearchType request body"""
+        # Sanitize search value
+        sanitized_search_value = sanitize_search_value(search_value)
+        
+        return {
+            "commissionId": commission_id,
+            "page": page,
+            "size": size,
+            "fromDate": from_date,
+            "toDate": to_date,
+            "dateRequestType": 1,
+            "serchType": search_type,
+            "serchTypeValue": sanitized_search_value,
+            "judgeId": judge_id
+        }
+
+    async def _post_search(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Post a case search request body to Jagriti API
+        
+        Args:
+            request_body: getCaseDetailsBySearchType request body
+            
+        Returns:
+            Search results from Jagriti API, with documentBase64 values as SpooledBlob objects
+        """
         try:
-            api_url = f"{self.base_url}/services/case/caseFilingService/v2/getCaseDetailsBySearchType"
-            
-            # Sanitize search value
-            sanitized_search_value = sanitize_search_value(search_value)
-            
-            # Prepare request body
-            request_body = {
-                "commissionId": commission_id,
-                "page": page,
-                "size": size,
-                "fromDate": from_date,
-                "toDate": to_date,
-                "dateRequestType": 1,
-                "serchType": search_type,
-                "serchTypeValue": sanitized_search_value,
-                "judgeId": judge_id
-            }
+            return await self._resilient("search", lambda: self._collect_search(request_body))
+        except Exception as e:
+            raise self._search_error(e)
+
+    async def _collect_search(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one search attempt and collect its cases into the response dict"""
+        fields: Dict[str, Any] = {}
+        cases = [case async for case in self._stream_search(request_body, fields)]
+        if isinstance(fields.get("data"), list):
+            fields["data"] = cases
+        return fields
+
+    async def _stream_search(
+        self,
+        request_body: Dict[str, Any],
+        fields: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Post a search and parse the response body incrementally
+        
+        The body is never buffered whole: cases are yielded one at a time and
+        each documentBase64 string is written to a spool instead of memory.
+        Errors are raised as-is; callers map them with _search_error.
+        
+        Args:
+            request_body: getCaseDetailsBySearchType request body
+            fields: Filled with the response's top-level fields once parsing ends
             
-            response = await self.client.post(
-                api_url, 
-                json=request_body,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
-            )
+        Yields:
+            Case dicts from the response's data array
+        """
+        parser = StreamingObjectParser(
+            array_key="data",
+            spool_fields=("documentBase64",),
+            spool_memory=settings.SEARCH_SPOOL_MEMORY_BYTES
+        )
+        api_url = f"{self.base_url}/services/case/caseFilingService/v2/getCaseDetailsBySearchType"
+        
+        async with self._upstream("search") as permit, self.client.stream(
+            "POST",
+            api_url, 
+            json=request_body,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json"
+            }
+        ) as response:
             response.raise_for_status()
+            # Latency is measured to the headers; body size depends on the page
+            permit.responded()
             
-            data = response.json()
-            
-            if data.get("status") == 200:
-                return data
-            else:
-                error_msg = data.get("message", "Search failed")
-                logger.error(f"API returned error: {data}")
-                raise CaseSearchException(f"Search failed: {error_msg}")
-                
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error in case search: {e}")
-            raise CaseSearchException(f"Search failed: {str(e)}")
-        except CaseSearchException:
-            raise
-        except Exception as e:
-            logger.error(f"Error in case search: {e}")
-            raise CaseSearchException(f"Search failed: {str(e)}")
+            async for chunk in response.aiter_bytes():
+                cases = parser.feed(chunk)
+                self._check_search_status(parser.fields)
+                for case in cases:
+                    yield case
+                    
+        fields.update(parser.close())
+        self._check_search_status(fields, required=True)
+
+    @staticmethod
+    def _search_error(error: Exception) -> Exception:
+        """Map a failed search to the exception callers see"""
+        if isinstance(error, (CaseSearchException, UpstreamUnavailableException)):
+            return error
+        if isinstance(error, httpx.HTTPError):
+            logger.error(f"HTTP error in case search: {error}")
+        else:
+            logger.error(f"Error in case search: {error}")
+        return CaseSearchException(f"Search failed: {str(error)}")
+
+    def _check_search_status(self, fields: Dict[str, Any], required: bool = False) -> None:
+        """
+        Raise if a search response reports an error
+        
+        Args:
+            fields: Top-level response fields parsed so far
+            required: Whether a missing status counts as an error
+        """
+        if "status" not in fields and not required:
+            return
+        if fields.get("status") != 200:
+            error_msg = fields.get("message", "Search failed")
+            logger.error(f"API returned error: {fields}")
+            raise CaseSearchException(f"Search failed: {error_msg}")
 
     async def find_state_id_by_name(self, state_name: str) -> int:
         """
@@ -199,15 +443,15 @@ class JagritiClient:
             StateNotFoundException: If state is not found
         """
         try:
-            states = await self.get_states()
-            matching_state = find_matching_item(states, "commissionNameEn", state_name)
+            states_index = await self._get_states_index()
+            state_id = states_index.find_id(state_name)
             
-            if matching_state:
-                return matching_state.get("commissionId")
+            if state_id is not None:
+                return state_id
             
             raise StateNotFoundException(state_name)
             
-        except StateNotFoundException:
+        except (StateNotFoundException, UpstreamUnavailableException):
             raise
         except Exception as e:
             logger.error(f"Error finding state ID for '{state_name}': {e}")
@@ -228,28 +472,261 @@ class JagritiClient:
             CommissionNotFoundException: If commission is not found
         """
         try:
-            commissions = await self.get_commissions(str(state_id))
-            matching_commission = find_matching_item(commissions, "commissionNameEn", commission_name)
+            commissions_index = await self._get_commissions_index(state_id)
+            commission_id = commissions_index.find_id(commission_name)
             
-            if matching_commission:
-                return matching_commission.get("commissionId")
+            if commission_id is not None:
+                return commission_id
             
-            # Get state name for error message
-            states = await self.get_states()
-            state_name = "Unknown"
-            for state in states:
-                if state.get("commissionId") == state_id:
-                    state_name = state.get("commissionNameEn", "Unknown")
-                    break
+            raise CommissionNotFoundException(commission_name, self._cached_state_name(state_id))
             
-            raise CommissionNotFoundException(commission_name, state_name)
-            
-        except CommissionNotFoundException:
+        except (CommissionNotFoundException, UpstreamUnavailableException):
             raise
         except Exception as e:
             logger.error(f"Error finding commission ID for '{commission_name}': {e}")
             raise CommissionNotFoundException(commission_name, "Unknown")
 
+    async def resolve(self, state_name: str, commission_name: str) -> Tuple[int, int]:
+        """
+        Resolve state and commission names to their IDs in one call
+        
+        Args:
+            state_name: Name of the state
+            commission_name: Name of the commission within the state
+            
+        Returns:
+            Tuple of (state ID, commission ID)
+            
+        Raises:
+            StateNotFoundException: If state is not found
+            CommissionNotFoundException: If commission is not found
+        """
+        with span("state"):
+            state_id = await self.find_state_id_by_name(state_name)
+        with span("commission"):
+            commission_id = await self.find_commission_id_by_name(state_id, commission_name)
+        return state_id, commission_id
+
+    def _cached_state_name(self, state_id: int) -> str:
+        """
+        Look up a state name from the cached catalog without calling upstream
+        
+        Args:
+            state_id: State commission ID
+            
+        Returns:
+            State name, or "Unknown" if the catalog is not cached
+        """
+        states_index = self._states_cache.peek("states")
+        state = states_index.get_by_id(state_id) if states_index else None
+        return state.get("commissionNameEn", "Unknown") if state else "Unknown"
+
+    async def prewarm_catalog(self, concurrency: int = 4) -> int:
+        """
+        Load the state catalog and every state's commission list into the caches
+        
+        Args:
+            concurrency: Maximum number of commission fetches in flight at once
+            
+        Returns:
+            Number of states whose commissions were loaded
+        """
+        states = await self.get_states()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def warm(state: Dict[str, Any]) -> bool:
+            async with semaphore:
+                try:
+                    await self.get_commissions(str(state.get("commissionId")))
+                    return True
+                except (JagritiAPIError, UpstreamUnavailableException) as e:
+                    logger.warning(f"Prewarm failed for state {state.get('commissionNameEn')}: {e}")
+                    return False
+        
+        results = await asyncio.gather(*(warm(state) for state in states))
+        warmed = sum(results)
+        logger.info(f"Prewarmed commissions for {warmed}/{len(states)} states")
+        return warmed
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return hit/miss counters for the catalog caches"""
+        return {
+            "states": self._states_cache.stats(),
+            "commissions": self._commissions_cache.stats(),
+        }
+
+    async def _get_json(self, kind: str, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Run one GET attempt and decode its JSON body"""
+        async with self._upstream(kind):
+            response = await self.client.get(url, params=params)
+            response.raise_for_status()
+        return response.json()
+
+    async def _resilient(self, endpoint: str, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Call an idempotent endpoint with circuit breaking, retries and optional hedging
+        
+        While the endpoint's circuit is open, calls fail fast with
+        CircuitOpenException so callers can fall back to cached data. Attempts
+        failing with 5xx, 429, timeouts or connection errors are retried up to
+        JAGRITI_RETRY_ATTEMPTS times with jittered exponential backoff, as long
+        as the shared retry budget allows. With JAGRITI_HEDGE_ENABLED, an attempt
+        still running after the endpoint's JAGRITI_HEDGE_PERCENTILE latency gets
+        a second, racing attempt.
+        
+        Args:
+            endpoint: "states", "commissions" or "search"
+            attempt: Coroutine factory performing one attempt
+            
+        Returns:
+            Result of the first successful attempt
+        """
+        breaker = self._breakers[endpoint]
+        if not breaker.allow():
+            raise CircuitOpenException(endpoint, breaker.retry_after())
+        self._retry_budget.deposit()
+        
+        retry = 0
+        try:
+            while True:
+                try:
+                    result = await self._attempt(endpoint, attempt)
+                except Exception as e:
+                    if isinstance(e, UpstreamUnavailableException):
+                        # Local saturation, not an upstream verdict
+                        breaker.record_ignored()
+                        raise
+                    if not _is_overload_signal(e):
+                        # The upstream answered, even if with an error
+                        breaker.record_success()
+                        raise
+                    breaker.record_failure()
+                    retry += 1
+                    if (
+                        retry >= settings.JAGRITI_RETRY_ATTEMPTS
+                        or not breaker.allow()
+                        or not self._retry_budget.withdraw()
+                    ):
+                        raise
+                    self._retries += 1
+                    delay = backoff_delay(retry, settings.JAGRITI_RETRY_BASE_DELAY, settings.JAGRITI_RETRY_MAX_DELAY)
+                    logger.warning(f"Retrying Jagriti {endpoint} call in {delay:.2f}s after: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                breaker.record_success()
+                return result
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                # Cancelled mid-call or mid-backoff: free the half-open probe
+                # slot, or the circuit would never let another probe through
+                breaker.record_ignored()
+            raise
+
+    async def _attempt(self, endpoint: str, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one (possibly hedged) attempt, recording its latency on success"""
+        window = self._latencies[endpoint]
+        
+        async def timed() -> Any:
+            started_at = time.monotonic()
+            result = await attempt()
+            window.record(time.monotonic() - started_at)
+            return result
+        
+        delay = window.percentile(settings.JAGRITI_HEDGE_PERCENTILE) if settings.JAGRITI_HEDGE_ENABLED else None
+        if delay is None:
+            return await timed()
+        
+        def allow_hedge() -> bool:
+            if not self._retry_budget.withdraw():
+                return False
+            self._hedges += 1
+            return True
+        
+        return await hedged(timed, max(delay, settings.JAGRITI_HEDGE_MIN_DELAY), allow_hedge)
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Return circuit breaker states and retry, hedge and budget counters"""
+        return {
+            "circuits": {endpoint: breaker.stats() for endpoint, breaker in self._breakers.items()},
+            "retries": self._retries,
+            "hedges": self._hedges,
+            "retry_budget": self._retry_budget.stats(),
+        }
+
+    @asynccontextmanager
+    async def _upstream(self, kind: str) -> AsyncIterator[LimiterPermit]:
+        """
+        Run one upstream request under the adaptive limiter and connection pool
+        
+        The request first waits for a limiter slot, raising
+        UpstreamOverloadedException past JAGRITI_LIMIT_QUEUE_TIMEOUT. Its latency
+        and outcome then feed the limit: 5xx, 429, timeouts and connection errors
+        cut it. httpx raises PoolTimeout when no connection frees up within
+        JAGRITI_POOL_TIMEOUT; that is local saturation rather than an upstream
+        failure, so it is re-raised as ConnectionPoolExhaustedException.
+        
+        Args:
+            kind: Call kind ("states", "commissions" or "search") for latency tracking
+            
+        Yields:
+            The limiter permit, so streaming calls can mark when headers arrived
+        """
+        permit = await self._limiter.acquire(kind)
+        self._requests += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        UPSTREAM_IN_FLIGHT.inc(1, kind)
+        started_at = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield permit
+        except httpx.PoolTimeout as e:
+            outcome = "pool_timeout"
+            permit.release(sample=False)
+            self._pool_timeouts += 1
+            logger.warning(f"Jagriti connection pool exhausted with {self._in_flight} requests in flight")
+            raise ConnectionPoolExhaustedException(settings.JAGRITI_POOL_TIMEOUT) from e
+        except Exception as e:
+            outcome = "error"
+            permit.release(dropped=_is_overload_signal(e))
+            raise
+        except BaseException:
+            # Cancelled or abandoned; says nothing about upstream health
+            outcome = "cancelled"
+            permit.release(sample=False)
+            raise
+        else:
+            permit.release()
+        finally:
+            self._in_flight -= 1
+            UPSTREAM_IN_FLIGHT.dec(1, kind)
+            UPSTREAM_REQUEST_DURATION.observe(time.perf_counter() - started_at, kind, outcome)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool limits and usage"""
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "requests": self._requests,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "saturation": round(self._in_flight / self.limits.max_connections, 3) if self.limits.max_connections else 0.0,
+            "pool_timeouts": self._pool_timeouts,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache, request coalescing, concurrency limit and connection pool counters"""
+        return {
+            "caches": self.cache_stats(),
+            "coalescing": self._inflight.stats(),
+            "limiter": self._limiter.stats(),
+            "resilience": self.resilience_stats(),
+            "pool": self.pool_stats(),
+        }
+
     async def close(self):
         """Close the HTTP client"""
+        await self._states_cache.close()
+        await self._commissions_cache.close()
         await self.client.aclose()
@@ -1,18 +1,122 @@
+import asyncio
 import base64
+import hashlib
 import os
 import logging
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, Optional, Tuple, Union
 from app.config import settings
+from app.utils.exceptions import DocumentTooLargeException, InvalidDocumentException
+from app.utils.json_stream import SpooledBlob, iter_text_chunks
+from app.utils.metrics import PDF_BYTES_WRITTEN
 
 logger = logging.getLogger(__name__)
 
+# Base64 characters decoded per chunk (a multiple of 4, so chunks decode independently)
+BASE64_CHUNK_CHARS = 4 * 64 * 1024
+
+# Every PDF file starts with this header
+PDF_MAGIC = b"%PDF-"
+
+# Characters b64decode would silently discard; stripped per chunk to keep 4-char alignment
+_NON_BASE64 = re.compile(r"[^A-Za-z0-9+/=]")
+
+# Base64 text, either in memory or spooled from a streamed search response
+Base64Data = Union[str, SpooledBlob]
+
+def _release(base64_data: Base64Data) -> None:
+    """Close a spooled blob once nothing will read it again"""
+    if isinstance(base64_data, SpooledBlob):
+        base64_data.close()
+
+class DigestIndex:
+    """
+    Persistent map of download filenames to content digests
+    
+    Stored as an append-only log of "<filename> <digest>" lines (a "-" digest
+    removes the entry), replayed on startup and compacted once it holds more
+    than twice as many lines as live entries.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Dict[str, str] = {}
+        self._lines = 0
+        self._lock = threading.Lock()
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    filename, _, digest = line.rstrip("\n").rpartition(" ")
+                    if not filename:
+                        continue
+                    self._lines += 1
+                    if digest == "-":
+                        self._entries.pop(filename, None)
+                    else:
+                        self._entries[filename] = digest
+    
+    def get(self, filename: str) -> Optional[str]:
+        """Get the digest stored for a filename"""
+        return self._entries.get(filename)
+    
+    def set(self, filename: str, digest: str) -> None:
+        """Point a filename at a digest"""
+        with self._lock:
+            if self._entries.get(filename) == digest:
+                return
+            self._entries[filename] = digest
+            self._append(filename, digest)
+    
+    def remove(self, filename: str) -> bool:
+        """Remove a filename, returning whether it was present"""
+        with self._lock:
+            if self._entries.pop(filename, None) is None:
+                return False
+            self._append(filename, "-")
+            return True
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _append(self, filename: str, digest: str) -> None:
+        """Append one log line, compacting the log when it has grown too long"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(f"{filename} {digest}\n")
+        self._lines += 1
+        if self._lines > 2 * len(self._entries) + 64:
+            self._compact()
+    
+    def _compact(self) -> None:
+        """Rewrite the log with only live entries"""
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for filename, digest in self._entries.items():
+                f.write(f"{filename} {digest}\n")
+        os.replace(temp_path, self.path)
+        self._lines = len(self._entries)
+
 class PDFService:
-    """Service for handling PDF storage and retrieval"""
+    """
+    Service for handling PDF storage and retrieval
+    
+    Documents are stored content-addressed under objects/<aa>/<bb>/<sha256>.pdf,
+    so identical documents are written once. A DigestIndex maps each case's
+    download filename (case_<case number>.pdf) to its digest. Flat files from
+    before the content-addressed layout are still served.
+    """
     
     def __init__(self, storage_dir: str = "pdf_storage"):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(exist_ok=True)
+        self.objects_dir = self.storage_dir / "objects"
+        self.objects_dir.mkdir(exist_ok=True)
+        self.index = DigestIndex(self.storage_dir / "index.log")
         
         # Get base URL from environment or construct from settings
         base_url = os.getenv("BASE_URL")
@@ -34,62 +138,401 @@ class PDFService:
                     base_url = f"http://{settings.HOST}:{settings.PORT}"
         
         self.base_url = base_url
+        
+        # PDF decoding and disk writes run here, off the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.PDF_WRITER_THREADS,
+            thread_name_prefix="pdf-writer"
+        )
+        self._pending_writes: Dict[str, asyncio.Future] = {}
+        
+        # Lazily materialized documents: filename -> (case number, base64 data)
+        self._deferred: "OrderedDict[str, Tuple[str, Base64Data]]" = OrderedDict()
+        self._deferred_bytes = 0
+        self._last_deferred_at = 0.0
+        self._idle_task: Optional[asyncio.Task] = None
+        self._file_digests: Dict[Tuple[str, int, int], str] = {}
         logger.info(f"PDF Service initialized with base URL: {self.base_url}")
     
-    def store_pdf(self, base64_data: str, case_number: str) -> str:
+    def store_pdf(self, base64_data: Base64Data, case_number: str) -> str:
         """
         Store base64 PDF data and return download URL
         
+        The document is hashed first and only written if no object with that
+        digest exists yet. New objects are decoded in chunks into a temporary
+        file that is atomically renamed into place, so readers never see a
+        partially written document. This blocks; async callers should use
+        store_pdf_async.
+        
         Args:
-            base64_data: Base64 encoded PDF data from Jagriti
+            base64_data: Base64 encoded PDF data from Jagriti, as a string or SpooledBlob
             case_number: Case number for filename generation
             
         Returns:
             str: Download URL for the stored PDF
         """
         try:
-            # Decode base64 data
-            pdf_bytes = base64.b64decode(base64_data)
+            filename = self.filename_for_case(case_number)
             
-            # Generate unique filename based on case number
-            safe_case_number = case_number.replace("/", "_").replace(" ", "_")
-            filename = f"case_{safe_case_number}.pdf"
+            hasher = hashlib.sha256()
+            for chunk in self._iter_base64_chunks(base64_data):
+                hasher.update(chunk)
+            digest = hasher.hexdigest()
             
-            # Store file
-            file_path = self.storage_dir / filename
-            with open(file_path, "wb") as f:
-                f.write(pdf_bytes)
+            object_path = self._object_path(digest)
+            if object_path.exists():
+                logger.debug("PDF for case %s already stored as %s, skipping write", case_number, digest)
+            else:
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=object_path.parent, prefix=f".{digest}.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        PDF_BYTES_WRITTEN.inc(self._decode_base64_to(base64_data, f))
+                    os.replace(temp_path, object_path)
+                except BaseException:
+                    os.unlink(temp_path)
+                    raise
+            
+            self.index.set(filename, digest)
             
             # Generate download URL
-            download_url = f"{self.base_url}/cases/download/{filename}"
+            download_url = self._download_url(filename)
             
-            logger.info(f"PDF stored for case {case_number}: {download_url}")
+            logger.debug("PDF stored for case %s: %s", case_number, download_url)
             return download_url
             
         except Exception as e:
             logger.error(f"Error storing PDF for case {case_number}: {e}")
             raise Exception(f"Failed to store PDF: {str(e)}")
     
+    async def store_pdf_stream(self, chunks: AsyncIterator[bytes], case_number: str) -> str:
+        """
+        Store a PDF streamed as raw bytes and return download URL
+        
+        Chunks are hashed and written to a temporary file on the writer thread
+        pool as they arrive, so the whole document is never held in memory.
+        The upload is rejected as soon as it exceeds PDF_MAX_UPLOAD_BYTES or
+        its first bytes are not a PDF header.
+        
+        Args:
+            chunks: Raw document bytes
+            case_number: Case number for filename generation
+            
+        Returns:
+            str: Download URL for the stored PDF
+            
+        Raises:
+            DocumentTooLargeException: If the document exceeds the size limit
+            InvalidDocumentException: If the document is not a PDF
+        """
+        filename = self.filename_for_case(case_number)
+        loop = asyncio.get_running_loop()
+        hasher = hashlib.sha256()
+        size = 0
+        head = b""
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.objects_dir, prefix=".upload.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size > settings.PDF_MAX_UPLOAD_BYTES:
+                        raise DocumentTooLargeException(settings.PDF_MAX_UPLOAD_BYTES)
+                    if len(head) < len(PDF_MAGIC):
+                        head += chunk[:len(PDF_MAGIC) - len(head)]
+                        if not PDF_MAGIC.startswith(head):
+                            raise InvalidDocumentException("Document is not a PDF")
+                    await loop.run_in_executor(self._executor, self._write_chunk, f, hasher, chunk)
+            
+            if head != PDF_MAGIC:
+                raise InvalidDocumentException("Document is not a PDF")
+            
+            digest = hasher.hexdigest()
+            await loop.run_in_executor(self._executor, self._commit_object, temp_path, digest, filename)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        
+        download_url = self._download_url(filename)
+        logger.info(f"PDF uploaded for case {case_number} ({size} bytes): {download_url}")
+        return download_url
+    
+    @staticmethod
+    def _write_chunk(f: BinaryIO, hasher: "hashlib._Hash", chunk: bytes) -> None:
+        """Hash and write one uploaded chunk"""
+        hasher.update(chunk)
+        f.write(chunk)
+        PDF_BYTES_WRITTEN.inc(len(chunk))
+    
+    def _commit_object(self, temp_path: str, digest: str, filename: str) -> None:
+        """
+        Move a fully written temporary file into place as the object for digest
+        
+        The filename is then pointed at the object here too, since the index
+        appends to its log file and may compact it.
+        """
+        object_path = self._object_path(digest)
+        if object_path.exists():
+            os.unlink(temp_path)
+        else:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, object_path)
+        self.index.set(filename, digest)
+    
+    async def store_pdf_async(self, base64_data: Base64Data, case_number: str, wait: bool = False) -> str:
+        """
+        Store base64 PDF data on the writer thread pool and return download URL
+        
+        By default the write is queued behind the response (write-behind) and the
+        URL is returned straight away; downloads of that file wait for the write
+        to finish. At most PDF_WRITE_QUEUE_DEPTH writes are queued at once, after
+        which callers wait for a slot.
+        
+        Args:
+            base64_data: Base64 encoded PDF data from Jagriti
+            case_number: Case number for filename generation
+            wait: Wait for the write to complete, raising if it fails
+            
+        Returns:
+            str: Download URL for the stored PDF
+        """
+        filename = self.filename_for_case(case_number)
+        
+        while len(self._pending_writes) >= settings.PDF_WRITE_QUEUE_DEPTH:
+            await asyncio.wait(list(self._pending_writes.values()), return_when=asyncio.FIRST_COMPLETED)
+        
+        previous = self._pending_writes.get(filename)
+        if previous is not None:
+            # Keep writes for the same file in order
+            await asyncio.wait([previous])
+        
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self.store_pdf, base64_data, case_number)
+        self._pending_writes[filename] = future
+        future.add_done_callback(lambda done: self._write_finished(filename, done))
+        # The spooled data is only read by this write; free its temporary file once done
+        future.add_done_callback(lambda done: _release(base64_data))
+        
+        if wait or not settings.PDF_WRITE_BEHIND:
+            return await asyncio.shield(future)
+        return self._download_url(filename)
+    
+    async def register_pdf(self, base64_data: Base64Data, case_number: str) -> str:
+        """
+        Record a document found in search results and return its download URL
+        
+        With PDF_MATERIALIZATION set to "lazy" the document is only deferred and
+        decoded later; otherwise it is stored straight away.
+        
+        Args:
+            base64_data: Base64 encoded PDF data from Jagriti
+            case_number: Case number for filename generation
+            
+        Returns:
+            str: Download URL for the PDF
+        """
+        if settings.PDF_MATERIALIZATION == "lazy":
+            return await self.defer_pdf(base64_data, case_number)
+        return await self.store_pdf_async(base64_data, case_number)
+    
+    async def defer_pdf(self, base64_data: Base64Data, case_number: str) -> str:
+        """
+        Hold base64 PDF data (a string or spooled blob) and return download URL without decoding it
+        
+        The document is decoded and stored on its first download, or by a
+        background task once searches have been idle for PDF_LAZY_IDLE_SECONDS.
+        Deferred data is capped at PDF_LAZY_MAX_PENDING_BYTES; past that the
+        oldest documents are handed to the write-behind queue.
+        
+        Args:
+            base64_data: Base64 encoded PDF data from Jagriti
+            case_number: Case number for filename generation
+            
+        Returns:
+            str: Download URL for the PDF
+        """
+        filename = self.filename_for_case(case_number)
+        previous = self._deferred.pop(filename, None)
+        if previous is not None:
+            self._deferred_bytes -= len(previous[1])
+            _release(previous[1])
+        self._deferred[filename] = (case_number, base64_data)
+        self._deferred_bytes += len(base64_data)
+        self._last_deferred_at = time.monotonic()
+        
+        while self._deferred_bytes > settings.PDF_LAZY_MAX_PENDING_BYTES and len(self._deferred) > 1:
+            oldest = next(iter(self._deferred))
+            await self.store_pdf_async(*self._pop_deferred(oldest))
+        
+        if self._idle_task is None:
+            self._idle_task = asyncio.get_running_loop().create_task(self._materialize_when_idle())
+        return self._download_url(filename)
+    
+    async def wait_for_pdf(self, filename: str) -> None:
+        """Wait for filename to be stored, materializing it first if it was deferred"""
+        if filename in self._deferred:
+            try:
+                await self.store_pdf_async(*self._pop_deferred(filename), wait=True)
+            except Exception as e:
+                logger.warning(f"Failed to materialize deferred PDF {filename}: {e}")
+            return
+        future = self._pending_writes.get(filename)
+        if future is not None:
+            await asyncio.wait([future])
+    
+    async def wait_for_pdf_by_case_number(self, case_number: str) -> None:
+        """Wait for a case's PDF to be stored, materializing it first if it was deferred"""
+        await self.wait_for_pdf(self.filename_for_case(case_number))
+    
+    def _pop_deferred(self, filename: str) -> Tuple[Base64Data, str]:
+        """Remove a deferred document, returning (base64 data, case number)"""
+        case_number, base64_data = self._deferred.pop(filename)
+        self._deferred_bytes -= len(base64_data)
+        return base64_data, case_number
+    
+    async def _materialize_when_idle(self) -> None:
+        """Store deferred documents one at a time whenever no new ones have arrived for a while"""
+        idle_seconds = settings.PDF_LAZY_IDLE_SECONDS
+        while True:
+            await asyncio.sleep(idle_seconds)
+            while self._deferred and time.monotonic() - self._last_deferred_at >= idle_seconds:
+                filename = next(iter(self._deferred))
+                try:
+                    await self.store_pdf_async(*self._pop_deferred(filename), wait=True)
+                except Exception as e:
+                    logger.warning(f"Idle materialization of {filename} failed: {e}")
+    
+    def _write_finished(self, filename: str, future: asyncio.Future) -> None:
+        """Forget a completed write, logging write-behind failures"""
+        if self._pending_writes.get(filename) is future:
+            del self._pending_writes[filename]
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Background PDF write failed for {filename}: {future.exception()}")
+    
+    @staticmethod
+    def _iter_base64_chunks(base64_data: Base64Data) -> Iterator[bytes]:
+        """
+        Decode base64 text chunk by chunk
+        
+        Args:
+            base64_data: Base64 encoded data, as a string or SpooledBlob
+            
+        Yields:
+            Decoded bytes, one chunk at a time
+        """
+        carry = ""
+        for piece in iter_text_chunks(base64_data, BASE64_CHUNK_CHARS):
+            chunk = carry + piece
+            if _NON_BASE64.search(chunk):
+                chunk = _NON_BASE64.sub("", chunk)
+            usable = len(chunk) - len(chunk) % 4
+            carry = chunk[usable:]
+            if usable:
+                yield base64.b64decode(chunk[:usable])
+        if carry:
+            yield base64.b64decode(carry)
+    
+    @classmethod
+    def _decode_base64_to(cls, base64_data: Base64Data, out: BinaryIO) -> int:
+        """
+        Decode base64 text into a binary file chunk by chunk
+        
+        Args:
+            base64_data: Base64 encoded data
+            out: Binary file to write to
+            
+        Returns:
+            Number of bytes written
+        """
+        return sum(out.write(chunk) for chunk in cls._iter_base64_chunks(base64_data))
+    
+    def _object_path(self, digest: str) -> Path:
+        """Path of the content-addressed object for a digest"""
+        return self.objects_dir / digest[:2] / digest[2:4] / f"{digest}.pdf"
+    
+    @staticmethod
+    def filename_for_case(case_number: str) -> str:
+        """Build the stored filename for a case number"""
+        safe_case_number = case_number.replace("/", "_").replace(" ", "_")
+        return f"case_{safe_case_number}.pdf"
+    
+    def _download_url(self, filename: str) -> str:
+        """Build the download URL for a stored filename"""
+        return f"{self.base_url}/cases/download/{filename}"
+    
+    async def close(self) -> None:
+        """Store deferred documents, wait for queued writes and stop the writer threads"""
+        if self._idle_task is not None:
+            self._idle_task.cancel()
+            await asyncio.gather(self._idle_task, return_exceptions=True)
+            self._idle_task = None
+        while self._deferred:
+            await self.store_pdf_async(*self._pop_deferred(next(iter(self._deferred))))
+        if self._pending_writes:
+            await asyncio.wait(list(self._pending_writes.values()))
+        self._executor.shutdown(wait=True)
+    
     def get_pdf_path(self, filename: str) -> Optional[Path]:
-        """Get file path for download"""
+        """Get file path for download, resolving the filename through the digest index"""
+        digest = self.index.get(filename)
+        if digest is not None:
+            object_path = self._object_path(digest)
+            if object_path.exists():
+                return object_path
+        
+        # Documents stored before the content-addressed layout
         file_path = self.storage_dir / filename
-        return file_path if file_path.exists() else None
+        return file_path if file_path.is_file() else None
+    
+    def get_pdf_digest(self, filename: str) -> Optional[str]:
+        """Get the SHA-256 digest of a stored document, if it is content-addressed"""
+        return self.index.get(filename)
+    
+    def hash_pdf_file(self, file_path: Path) -> str:
+        """
+        Compute the SHA-256 digest of a stored file, memoized by path, size and mtime
+        
+        Used for documents stored before the content-addressed layout. This
+        blocks; async callers should run it in a thread.
+        """
+        stat = file_path.stat()
+        key = (str(file_path), stat.st_size, stat.st_mtime_ns)
+        digest = self._file_digests.get(key)
+        if digest is None:
+            hasher = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._file_digests[key] = digest
+        return digest
     
     def get_pdf_by_case_number(self, case_number: str) -> Optional[Path]:
         """Get PDF file path by case number"""
-        safe_case_number = case_number.replace("/", "_").replace(" ", "_")
-        filename = f"case_{safe_case_number}.pdf"
-        return self.get_pdf_path(filename)
+        return self.get_pdf_path(self.filename_for_case(case_number))
     
     def delete_pdf(self, filename: str) -> bool:
-        """Delete PDF file"""
+        """
+        Delete PDF file
+        
+        Removes the filename from the digest index; the content-addressed object
+        itself is kept, since other cases may share it.
+        """
         try:
+            deleted = self.index.remove(filename)
+            if filename in self._deferred:
+                _release(self._pop_deferred(filename)[0])
+                deleted = True
             file_path = self.storage_dir / filename
-            if file_path.exists():
+            if file_path.is_file():
                 file_path.unlink()
+                deleted = True
+            if deleted:
                 logger.info(f"PDF deleted: {filename}")
-                return True
-            return False
+            return deleted
         except Exception as e:
             logger.error(f"Error deleting PDF {filename}: {e}")
             return False
@@ -0,0 +1,283 @@
+"""
+Background sync of recent filings for a fixed set of commissions
+"""
+import asyncio
+import logging
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.models.case import CaseSearchRequest
+from app.services.case_service import CaseService
+from app.services.case_store import CaseStore
+from app.utils.concurrency import TokenBucket
+from app.utils.exceptions import CaseStoreWriteException, UpstreamUnavailableException
+
+logger = logging.getLogger(__name__)
+
+SYNC_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sync_state (
+        commission_id INTEGER PRIMARY KEY,
+        synced_through TEXT,
+        window_from TEXT,
+        window_to TEXT,
+        next_page INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL NOT NULL
+    )
+"""
+
+_SAVE_STATE = """
+    INSERT INTO sync_state (commission_id, synced_through, window_from, window_to, next_page, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (commission_id) DO UPDATE SET
+    synced_through = excluded.synced_through,
+    window_from = excluded.window_from,
+    window_to = excluded.window_to,
+    next_page = excluded.next_page,
+    updated_at = excluded.updated_at
+"""
+
+# Largest page CaseSearchRequest accepts
+MAX_PAGE_SIZE = 100
+
+# (synced_through, window_from, window_to, next_page)
+SyncState = Tuple[Optional[str], Optional[str], Optional[str], int]
+
+class SyncService:
+    """
+    Crawler keeping the case store current for configured commissions
+
+    Each run walks every commission from its high-water mark (the last filing
+    date fully fetched, less ``overlap_days`` to pick up late entries) up to
+    today, in date windows of ``window_days``, paging through each window.
+    Pages go through CaseService.refresh_search, so their cases land in the
+    case store.
+
+    Progress is saved in the case store database after every page, once the
+    page's cases have been written, so a crashed or restarted run resumes at
+    the next page of the window it was in. Commissions sync ``concurrency`` at
+    a time and pages are paced to ``rate`` requests per second across all of
+    them, on top of the Jagriti client's own limits.
+
+    The service registers ``covers`` as the case service's store coverage, so
+    "auto" searches are answered locally only for synced commissions and
+    filing date windows the sync has fully fetched.
+    """
+
+    def __init__(
+        self,
+        case_service: CaseService,
+        case_store: CaseStore,
+        commission_ids: Sequence[int],
+        search_type: int = 1,
+        search_value: str = "",
+        start_date: str = "2025-01-01",
+        window_days: int = 7,
+        overlap_days: int = 1,
+        page_size: int = 100,
+        concurrency: int = 2,
+        rate: float = 2.0,
+        interval: float = 900.0
+    ):
+        self.case_service = case_service
+        self.case_store = case_store
+        self.commission_ids = list(commission_ids)
+        self.search_type = search_type
+        self.search_value = search_value
+        self.start_date = date.fromisoformat(start_date)
+        self.window_days = max(1, window_days)
+        self.overlap_days = max(0, overlap_days)
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            logger.warning(f"Sync page size {page_size} is outside 1-{MAX_PAGE_SIZE}; clamping it")
+        self.page_size = min(max(1, page_size), MAX_PAGE_SIZE)
+        self.concurrency = max(1, concurrency)
+        self.interval = interval
+        self._rate = TokenBucket(rate)
+        self._task: Optional[asyncio.Task] = None
+        self._schema_ready = False
+        self.runs = 0
+        self.pages = 0
+        self.cases = 0
+        self.errors = 0
+        self.last_run_at: Optional[float] = None
+        # High-water marks by commission, loaded from the database on first use
+        self._synced_through: Dict[int, Optional[str]] = {}
+        case_service.store_coverage = self.covers
+
+    async def _ensure_schema(self) -> None:
+        if not self._schema_ready:
+            await self.case_store.run_write(lambda conn: conn.execute(SYNC_SCHEMA))
+            self._schema_ready = True
+
+    async def _load_state(self, commission_id: int) -> SyncState:
+        def query(conn: sqlite3.Connection) -> Optional[SyncState]:
+            return conn.execute(
+                "SELECT synced_through, window_from, window_to, next_page FROM sync_state WHERE commission_id = ?",
+                (commission_id,)
+            ).fetchone()
+
+        return await self.case_store.run_read(query) or (None, None, None, 0)
+
+    async def _save_state(self, commission_id: int, state: SyncState) -> None:
+        await self.case_store.run_write(
+            lambda conn: conn.execute(_SAVE_STATE, (commission_id, *state, time.time()))
+        )
+        self._synced_through[commission_id] = state[0]
+
+    async def covers(self, commission_id: int, from_date: str, to_date: str) -> bool:
+        """
+        Report whether the case store holds every case a commission filed in a date window
+
+        Args:
+            commission_id: Commission being searched
+            from_date: Start of the filing date window (YYYY-MM-DD)
+            to_date: End of the filing date window (YYYY-MM-DD)
+
+        Returns:
+            True if the commission is synced without a search value narrowing
+            the listing, and the window lies between start_date and the
+            commission's high-water mark
+        """
+        if self.search_value or commission_id not in self.commission_ids:
+            return False
+        if from_date < self.start_date.isoformat():
+            return False
+        if commission_id not in self._synced_through:
+            await self._ensure_schema()
+            self._synced_through[commission_id] = (await self._load_state(commission_id))[0]
+        synced_through = self._synced_through[commission_id]
+        return synced_through is not None and to_date <= synced_through
+
+    async def run_once(self, today: Optional[date] = None) -> None:
+        """
+        Sync every configured commission up to today
+
+        Args:
+            today: Last filing date to fetch, defaults to the current date
+        """
+        await self._ensure_schema()
+        today = today or date.today()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def sync(commission_id: int) -> None:
+            async with semaphore:
+                await self._sync_commission(commission_id, today)
+
+        await asyncio.gather(*(sync(commission_id) for commission_id in self.commission_ids))
+        self.runs += 1
+        self.last_run_at = time.time()
+
+    async def _sync_commission(self, commission_id: int, today: date) -> None:
+        """Fetch every window from the commission's high-water mark to today, logging failures"""
+        synced_through, window_from, window_to, page = await self._load_state(commission_id)
+        # Only the first window of a run reaches back past the high-water mark
+        overlap = self.overlap_days
+        try:
+            while True:
+                if window_from is None:
+                    # Start a new window after the high-water mark
+                    if synced_through is None:
+                        start = self.start_date
+                    else:
+                        start = date.fromisoformat(synced_through) + timedelta(days=1 - overlap)
+                    if start > today:
+                        return
+                    window_from = start.isoformat()
+                    window_to = min(start + timedelta(days=self.window_days - 1), today).isoformat()
+                    page = 0
+
+                await self._sync_window(commission_id, synced_through, window_from, window_to, page)
+                synced_through, window_from, page, overlap = window_to, None, 0, 0
+                await self._save_state(commission_id, (synced_through, None, None, 0))
+                if synced_through >= today.isoformat():
+                    return
+        except UpstreamUnavailableException as e:
+            # Circuit open or upstream saturated: pick up from the saved page next run
+            self.errors += 1
+            logger.warning(f"Sync of commission {commission_id} paused: {e}")
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Sync of commission {commission_id} failed: {e}")
+
+    async def _sync_window(
+        self,
+        commission_id: int,
+        synced_through: Optional[str],
+        window_from: str,
+        window_to: str,
+        page: int
+    ) -> None:
+        """Page through one date window, saving progress after every page"""
+        while True:
+            await self._rate.acquire()
+            failed = self.case_store.failed
+            request = CaseSearchRequest(
+                state="",
+                commission="",
+                search_value=self.search_value,
+                page=page,
+                size=self.page_size,
+                from_date=window_from,
+                to_date=window_to
+            )
+            response = await self.case_service.refresh_search(commission_id, request, self.search_type)
+            self.pages += 1
+            self.cases += len(response.cases)
+
+            # Cases must be on disk before the saved progress moves past them
+            await self.case_store.flush()
+            if self.case_store.failed > failed:
+                raise CaseStoreWriteException(self.case_store.failed - failed)
+            page += 1
+            if not response.cases or page * self.page_size >= response.total_count:
+                return
+            await self._save_state(commission_id, (synced_through, window_from, window_to, page))
+
+    async def _run_periodically(self) -> None:
+        """Run a sync every interval seconds until cancelled"""
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_once()
+                await self.case_store.flush()
+            except Exception as e:
+                logger.error(f"Sync run failed: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Start syncing in the background"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run_periodically())
+            logger.info(f"Sync started for {len(self.commission_ids)} commissions")
+
+    async def stop(self) -> None:
+        """Stop the background sync; an interrupted run resumes from its saved page"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def progress(self) -> List[Dict[str, Any]]:
+        """Return the saved high-water mark and window of every synced commission"""
+        await self._ensure_schema()
+        rows = await self.case_store.run_read(
+            lambda conn: conn.execute(
+                "SELECT commission_id, synced_through, window_from, window_to, next_page FROM sync_state "
+                "ORDER BY commission_id"
+            ).fetchall()
+        )
+        keys = ("commission_id", "synced_through", "window_from", "window_to", "next_page")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return run counters and the rate budget"""
+        return {
+            "running": self._task is not None,
+            "commissions": len(self.commission_ids),
+            "runs": self.runs,
+            "pages": self.pages,
+            "cases": self.cases,
+            "errors": self.errors,
+            "last_run_at": self.last_run_at,
+            "rate": self._rate.stats(),
+        }
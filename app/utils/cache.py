@@ -0,0 +1,217 @@
+"""
+In-process caching primitives
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+class _CacheEntry:
+    """Cached value with the monotonic time it was stored"""
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: Any, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+class TTLCache:
+    """
+    Async cache with TTL expiry and stale-while-revalidate semantics
+
+    A cold key is loaded inline. Once an entry is older than ``ttl`` it keeps
+    being served as-is while a single background task reloads it; if that
+    refresh fails the stale value stays in place and the next read retries.
+    When ``max_entries`` is set the least recently used keys are evicted.
+    """
+
+    def __init__(self, ttl: float, name: str = "cache", max_entries: Optional[int] = None):
+        self.ttl = ttl
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, loader: Loader) -> Any:
+        """
+        Get a value, loading it on a miss and refreshing it in the background when stale
+
+        Args:
+            key: Cache key
+            loader: Coroutine factory producing a fresh value for the key
+
+        Returns:
+            Cached (possibly stale) or freshly loaded value
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        self._entries.move_to_end(key)
+        if time.monotonic() - entry.stored_at >= self.ttl:
+            self.stale_hits += 1
+            self._schedule_refresh(key, loader)
+        else:
+            self.hits += 1
+        return entry.value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (fresh or stale) without loading it"""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value and reset its age, evicting the least recently used keys if full"""
+        self._entries[key] = _CacheEntry(value, time.monotonic())
+        self._entries.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters"""
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _schedule_refresh(self, key: Hashable, loader: Loader) -> None:
+        """Start a background refresh for key unless one is already running"""
+        if key in self._refreshing:
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh(key, loader))
+        self._refreshing[key] = task
+
+    async def _refresh(self, key: Hashable, loader: Loader) -> None:
+        """Reload key in the background, keeping the stale value on failure"""
+        try:
+            self.set(key, await loader())
+            logger.debug("%s: refreshed %r", self.name, key)
+        except Exception as e:
+            logger.warning(f"{self.name}: background refresh of {key!r} failed, serving stale data: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def close(self) -> None:
+        """Cancel any background refreshes still running"""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+class _SizedEntry:
+    """Cached value with its size in bytes and expiry time"""
+    __slots__ = ("value", "size", "expires_at")
+
+    def __init__(self, value: Any, size: int, expires_at: float):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+
+class ByteLRUCache:
+    """
+    LRU cache bounded by the total size of its values in bytes
+
+    Each entry carries its own TTL. Expired entries are not returned by
+    ``get`` but stay in place until evicted, so callers can still fall back
+    to them with ``get_stale`` when the upstream is unavailable.
+    """
+
+    def __init__(self, max_bytes: int, name: str = "cache"):
+        self.max_bytes = max_bytes
+        self.name = name
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, _SizedEntry]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value for key if present and not expired"""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return the value for key even if it has expired"""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def set(self, key: Hashable, value: Any, size: int, ttl: float) -> bool:
+        """
+        Store a value, evicting least recently used entries to stay within budget
+
+        Args:
+            key: Cache key
+            value: Value to store
+            size: Size of the value in bytes
+            ttl: Seconds until the entry expires
+
+        Returns:
+            False if the value is larger than the whole budget and was not stored
+        """
+        self.invalidate(key)
+        if size > self.max_bytes or ttl <= 0:
+            return False
+        self._entries[key] = _SizedEntry(value, size, time.monotonic() + ttl)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+            self.evictions += 1
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size, memory and hit/miss counters"""
+        return {
+            "size": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,234 @@
+"""
+Adaptive concurrency limiting and rate pacing for upstream calls
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from app.utils.exceptions import UpstreamOverloadedException
+
+# Weight of a new sample in the short-term latency average
+LATENCY_SMOOTHING = 0.3
+
+# Fraction of the gap to the short-term average the baseline drifts up per sample,
+# so the baseline follows a genuinely slower upstream instead of pinning its best case
+BASELINE_DRIFT = 0.01
+
+class LimiterPermit:
+    """A granted slot of an AdaptiveLimiter, released once the call finishes"""
+
+    def __init__(self, limiter: "AdaptiveLimiter", kind: str, saturated: bool):
+        self._limiter = limiter
+        self.kind = kind
+        self.saturated = saturated
+        self.started_at = time.monotonic()
+        self.latency: Optional[float] = None
+        self._released = False
+
+    def responded(self) -> None:
+        """Record the latency now, e.g. once response headers arrive, so body size does not count"""
+        if self.latency is None:
+            self.latency = time.monotonic() - self.started_at
+
+    def release(self, dropped: bool = False, sample: bool = True) -> None:
+        """
+        Return the slot and feed the call's outcome to the limit
+
+        Args:
+            dropped: The upstream failed under load (5xx, 429, timeout, connection error)
+            sample: Whether the call says anything about upstream health
+        """
+        if self._released:
+            return
+        self._released = True
+        self.responded()
+        self._limiter._release(self, dropped, sample)
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on concurrent calls to an upstream
+
+    The limit grows by ``increase`` per window of successful calls made while
+    the limit was in use, and is multiplied by ``backoff`` when a call is
+    dropped or the short-term latency average rises past ``latency_tolerance``
+    times its baseline. Calls started before the last cut cannot cut again, so
+    one burst of failures halves the limit once rather than collapsing it.
+    Latency baselines are tracked per call kind, since catalog lookups and
+    searches take very different times, while the limit is shared.
+
+    Callers over the limit queue in FIFO order for at most ``queue_timeout``
+    seconds before UpstreamOverloadedException is raised.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        queue_timeout: Optional[float] = 10.0,
+        name: str = "limiter"
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.queue_timeout = queue_timeout
+        self.name = name
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latency: Dict[str, float] = {}
+        self._baseline: Dict[str, float] = {}
+        self._last_decrease_at = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    async def acquire(self, kind: str = "default", timeout: Optional[float] = None) -> LimiterPermit:
+        """
+        Wait for a slot under the current limit
+
+        Args:
+            kind: Call kind whose latency baseline the call is measured against
+            timeout: Seconds to wait in the queue (defaults to queue_timeout)
+
+        Returns:
+            Permit to release when the call finishes
+
+        Raises:
+            UpstreamOverloadedException: If no slot frees up within the timeout
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            return self._grant(kind)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        timeout = self.queue_timeout if timeout is None else timeout
+        try:
+            await asyncio.wait([waiter], timeout=timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as this caller was cancelled; pass it on
+                self.in_flight -= 1
+                self._wake()
+            else:
+                waiter.cancel()
+                self._remove_waiter(waiter)
+            raise
+
+        if not waiter.done():
+            waiter.cancel()
+            self._remove_waiter(waiter)
+            self.rejected += 1
+            raise UpstreamOverloadedException(self.name, timeout)
+        # _wake already counted the slot as in flight
+        return LimiterPermit(self, kind, saturated=True)
+
+    def _grant(self, kind: str) -> LimiterPermit:
+        """Take a free slot"""
+        self.in_flight += 1
+        return LimiterPermit(self, kind, saturated=self.in_flight * 2 >= self.limit)
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _wake(self) -> None:
+        """Hand free slots to queued callers in arrival order"""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _release(self, permit: LimiterPermit, dropped: bool, sample: bool) -> None:
+        """Return a slot and adjust the limit from the call's outcome"""
+        self.in_flight -= 1
+        if dropped:
+            self.dropped += 1
+            self._decrease(permit)
+        elif sample:
+            if self._latency_grew(permit.kind, permit.latency):
+                self._decrease(permit)
+            elif permit.saturated and self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+                self.increases += 1
+        self._wake()
+
+    def _latency_grew(self, kind: str, latency: float) -> bool:
+        """Update the latency averages for kind and check them against its baseline"""
+        average = self._latency.get(kind)
+        average = latency if average is None else average + LATENCY_SMOOTHING * (latency - average)
+        self._latency[kind] = average
+
+        baseline = self._baseline.get(kind, latency)
+        baseline = min(baseline, latency)
+        if average > baseline:
+            baseline += BASELINE_DRIFT * (average - baseline)
+        self._baseline[kind] = baseline
+        return average > baseline * self.latency_tolerance
+
+    def _decrease(self, permit: LimiterPermit) -> None:
+        """Cut the limit once per congestion event"""
+        if permit.started_at < self._last_decrease_at:
+            return
+        self._last_decrease_at = time.monotonic()
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        self.decreases += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current limit, queue and adjustment counters"""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "latency": {kind: round(value, 4) for kind, value in self._latency.items()},
+            "baseline_latency": {kind: round(value, 4) for kind, value in self._baseline.items()},
+        }
+
+class TokenBucket:
+    """
+    Token bucket pacing calls to a steady rate
+
+    Tokens accrue at ``rate`` per second up to ``burst``. Each call takes one
+    token, waiting for it to accrue if the bucket is empty.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self.waited = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Take a token, sleeping until one is available"""
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            delay = (1 - self._tokens) / self.rate
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the rate and token balance"""
+        self._refill()
+        return {"rate": self.rate, "tokens": round(self._tokens, 2), "waited": round(self.waited, 3)}
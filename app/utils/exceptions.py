@@ -30,3 +30,47 @@ class CaseSearchException(JagritiAPIException):
     def __init__(self, message: str, search_type: str = None):
         self.search_type = search_type
         super().__init__(message)
+
+class UpstreamUnavailableException(JagritiAPIException):
+    """Exception raised when the Jagriti API cannot be called right now"""
+    def __init__(self, message: str, retry_after: float = 1.0):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+class ConnectionPoolExhaustedException(UpstreamUnavailableException):
+    """Exception raised when no pooled connection frees up within the pool timeout"""
+    def __init__(self, pool_timeout: float):
+        self.pool_timeout = pool_timeout
+        super().__init__(f"No upstream connection available within {pool_timeout}s")
+
+class UpstreamOverloadedException(UpstreamUnavailableException):
+    """Exception raised when a call waits too long for a concurrency limiter slot"""
+    def __init__(self, upstream: str, queue_timeout: float):
+        self.queue_timeout = queue_timeout
+        super().__init__(f"{upstream} is overloaded; no request slot within {queue_timeout}s")
+
+class CircuitOpenException(UpstreamUnavailableException):
+    """Exception raised when calls to a failing upstream endpoint are short-circuited"""
+    def __init__(self, endpoint: str, retry_after: float):
+        self.endpoint = endpoint
+        super().__init__(f"Jagriti {endpoint} endpoint is failing; circuit open", retry_after=retry_after)
+
+class CaseStoreWriteException(Exception):
+    """Exception raised when cases could not be written to the local case store"""
+    def __init__(self, dropped: int):
+        self.dropped = dropped
+        super().__init__(f"{dropped} cases could not be written to the local case store")
+
+class DocumentException(Exception):
+    """Base exception for document storage errors"""
+    pass
+
+class DocumentTooLargeException(DocumentException):
+    """Exception raised when an uploaded document exceeds the size limit"""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Document exceeds the {max_bytes} byte upload limit")
+
+class InvalidDocumentException(DocumentException):
+    """Exception raised when an uploaded document is not a PDF"""
+    pass
@@ -1,7 +1,7 @@
 """
 Helper functions for data transformation and validation
 """
-from typing import Dict, Any, List
+from typing import Dict, Any
 from datetime import datetime
 import logging
 
@@ -15,17 +15,18 @@ def transform_case_data(case_data: Dict[str, Any]) -> Dict[str, str]:
         case_data: Raw case data from Jagriti API
         
     Returns:
-        Transformed case data in our format
+        Transformed case data in our format, every value a string and the
+        filing date in ISO format, as the local case store serves it
     """
     return {
-        "case_number": case_data.get("caseNumber") or "",
-        "case_stage": case_data.get("caseStageName") or "",
-        "filing_date": case_data.get("caseFilingDate") or "",
-        "complainant": case_data.get("complainantName") or "",
-        "complainant_advocate": case_data.get("complainantAdvocateName") or "",
-        "respondent": case_data.get("respondentName") or "",
-        "respondent_advocate": case_data.get("respondentAdvocateName") or "",
-        "document_link": case_data.get("documentLink") or "https://e-jagriti.gov.in/.../case123"
+        "case_number": str(case_data.get("caseNumber") or ""),
+        "case_stage": str(case_data.get("caseStageName") or ""),
+        "filing_date": normalize_date(str(case_data.get("caseFilingDate") or "")),
+        "complainant": str(case_data.get("complainantName") or ""),
+        "complainant_advocate": str(case_data.get("complainantAdvocateName") or ""),
+        "respondent": str(case_data.get("respondentName") or ""),
+        "respondent_advocate": str(case_data.get("respondentAdvocateName") or ""),
+        "document_link": str(case_data.get("documentLink") or "https://e-jagriti.gov.in/.../case123")
     }
 
 def validate_date_format(date_string: str) -> bool:
@@ -44,6 +45,29 @@ def validate_date_format(date_string: str) -> bool:
     except ValueError:
         return False
 
+# Day-first layouts Jagriti dates have been seen in, besides ISO
+_DATE_FORMATS = ("%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%d-%b-%Y")
+
+def normalize_date(date_string: str) -> str:
+    """
+    Normalize a date to ISO format (YYYY-MM-DD) so dates sort and compare as text
+    
+    Args:
+        date_string: Date as returned by Jagriti, optionally with a time part
+        
+    Returns:
+        ISO date, or the value unchanged if it is empty or not a known format
+    """
+    if len(date_string) >= 10 and date_string[4] == "-" and date_string[7] == "-":
+        return date_string[:10]
+    day = date_string.split(" ", 1)[0]
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(day, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return date_string
+
 def sanitize_search_value(search_value: str) -> str:
     """
     Sanitize search value by trimming whitespace and handling special characters
@@ -65,32 +89,6 @@ def sanitize_search_value(search_value: str) -> str:
     
     return sanitized
 
-def find_matching_item(items: List[Dict[str, Any]], name_field: str, search_name: str) -> Dict[str, Any]:
-    """
-    Find matching item in a list by name with fuzzy matching
-    
-    Args:
-        items: List of items to search
-        name_field: Field name containing the name to match
-        search_name: Name to search for
-        
-    Returns:
-        Matching item or None if not found
-    """
-    search_name_upper = search_name.upper().strip()
-    
-    # First try exact match
-    for item in items:
-        if item.get(name_field, "").upper() == search_name_upper:
-            return item
-    
-    # Then try partial match
-    for item in items:
-        if search_name_upper in item.get(name_field, "").upper():
-            return item
-    
-    return None
-
 def format_error_message(error: Exception, context: str = "") -> str:
     """
     Format error message with context
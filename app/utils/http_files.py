@@ -0,0 +1,208 @@
+"""
+Conditional and range-aware file responses
+"""
+import os
+import secrets
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.utils.metrics import Counter
+
+# Bytes read from disk per chunk when streaming a file
+READ_CHUNK_SIZE = 64 * 1024
+
+# More ranges than this in one request are served as a full response
+MAX_RANGES = 16
+
+ByteRange = Tuple[int, int]
+
+def parse_range_header(header: str, size: int) -> Optional[List[ByteRange]]:
+    """
+    Parse a Range header into inclusive byte ranges
+
+    Args:
+        header: Range header value (e.g. "bytes=0-1023,-500")
+        size: Size of the file in bytes
+
+    Returns:
+        Satisfiable (start, end) ranges, an empty list if none are satisfiable,
+        or None if the header is malformed and should be ignored
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    ranges = []
+    for part in spec.split(","):
+        start_text, dash, end_text = part.strip().partition("-")
+        if not dash:
+            return None
+        start_text, end_text = start_text.strip(), end_text.strip()
+        try:
+            if not start_text:
+                # Suffix range: the last N bytes
+                length = int(end_text)
+                if length == 0:
+                    continue
+                ranges.append((max(0, size - length), size - 1))
+                continue
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        except ValueError:
+            return None
+        if end_text and start > end:
+            return None
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison"""
+    if header.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+def _not_modified_since(header: str, mtime: float) -> bool:
+    """Check whether a file is unchanged since an If-Modified-Since date"""
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+def _if_range_matches(header: str, etag: str, last_modified: str) -> bool:
+    """Check an If-Range header; ranges are only honoured when it still matches"""
+    header = header.strip()
+    if header.startswith('"') or header.startswith("W/"):
+        # If-Range requires a strong comparison
+        return header == etag and not etag.startswith("W/")
+    return header == last_modified
+
+async def _read_ranges(
+    path: Path,
+    ranges: List[ByteRange],
+    bytes_read: Optional[Counter] = None
+) -> AsyncIterator[bytes]:
+    """Read byte ranges from a file off the event loop, counting them in bytes_read"""
+    f = await run_in_threadpool(open, path, "rb")
+    try:
+        for start, end in ranges:
+            await run_in_threadpool(f.seek, start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await run_in_threadpool(f.read, min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                if bytes_read is not None:
+                    bytes_read.inc(len(chunk))
+                yield chunk
+    finally:
+        await run_in_threadpool(f.close)
+
+async def _multipart_ranges(
+    path: Path,
+    ranges: List[ByteRange],
+    size: int,
+    media_type: str,
+    boundary: str,
+    bytes_read: Optional[Counter] = None
+) -> AsyncIterator[bytes]:
+    """Stream a multipart/byteranges body"""
+    for start, end in ranges:
+        yield (
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode("latin-1")
+        async for chunk in _read_ranges(path, [(start, end)], bytes_read):
+            yield chunk
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode("latin-1")
+
+def file_response(
+    request: Request,
+    path: Path,
+    etag: str,
+    media_type: str = "application/pdf",
+    headers: Optional[Dict[str, str]] = None,
+    cache_control: str = "no-cache",
+    bytes_read: Optional[Counter] = None
+) -> Response:
+    """
+    Build a file response honouring conditional and Range requests
+
+    Returns 304 when If-None-Match (or, without it, If-Modified-Since) shows
+    the client copy is current, 206 for satisfiable single or multiple byte
+    ranges, 416 for unsatisfiable ranges and 200 with the whole file otherwise.
+
+    Args:
+        request: Incoming request
+        path: File to serve
+        etag: Quoted entity tag for the file's content
+        media_type: Content type of the file
+        headers: Extra headers for the response (e.g. Content-Disposition)
+        cache_control: Cache-Control header value
+        bytes_read: Counter incremented with the bytes read from the file
+
+    Returns:
+        Response for the request
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    response_headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        **(headers or {}),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=response_headers)
+    elif request.headers.get("if-modified-since"):
+        if _not_modified_since(request.headers["if-modified-since"], stat.st_mtime):
+            return Response(status_code=304, headers=response_headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or _if_range_matches(if_range, etag, last_modified)):
+        ranges = parse_range_header(range_header, size)
+        if ranges == []:
+            response_headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=response_headers)
+        if ranges and len(ranges) == 1:
+            start, end = ranges[0]
+            response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response_headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                _read_ranges(path, ranges, bytes_read), status_code=206, media_type=media_type, headers=response_headers
+            )
+        if ranges:
+            boundary = secrets.token_hex(16)
+            return StreamingResponse(
+                _multipart_ranges(path, ranges, size, media_type, boundary, bytes_read),
+                status_code=206,
+                media_type=f"multipart/byteranges; boundary={boundary}",
+                headers=response_headers
+            )
+
+    response_headers["Content-Length"] = str(size)
+    return StreamingResponse(
+        _read_ranges(path, [(0, size - 1)], bytes_read), media_type=media_type, headers=response_headers
+    )
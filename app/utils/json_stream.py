@@ -0,0 +1,324 @@
+"""
+Incremental parsing of large JSON API responses
+"""
+import codecs
+import json
+import re
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+_WHITESPACE = " \t\r\n"
+_VALUE_END = _WHITESPACE + ",]}"
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SIMPLE_ESCAPES = {
+    '"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"
+}
+_decoder = json.JSONDecoder()
+
+class SpooledBlob:
+    """
+    Large JSON string value kept out of Python memory
+
+    The text is written to a SpooledTemporaryFile, which stays in memory up to
+    ``max_memory`` bytes and moves to disk beyond that. Reads are safe from
+    several threads at once.
+    """
+
+    def __init__(self, max_memory: int):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._lock = threading.Lock()
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        """Append text to the blob"""
+        data = text.encode("utf-8")
+        with self._lock:
+            self._file.write(data)
+        self._size += len(data)
+
+    def iter_text(self, chunk_size: int = 256 * 1024) -> Iterator[str]:
+        """
+        Read the blob back as text
+
+        Args:
+            chunk_size: Bytes read per chunk
+
+        Yields:
+            Text chunks in order
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        position = 0
+        while True:
+            with self._lock:
+                self._file.seek(position)
+                data = self._file.read(chunk_size)
+            if not data:
+                break
+            position += len(data)
+            yield decoder.decode(data)
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def read_text(self) -> str:
+        """Read the whole blob as one string"""
+        return "".join(self.iter_text())
+
+    def close(self) -> None:
+        """Release the spool"""
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"<SpooledBlob {self._size} bytes>"
+
+def iter_text_chunks(value: Any, chunk_size: int) -> Iterable[str]:
+    """
+    Split a string or SpooledBlob into text chunks
+
+    Args:
+        value: String or SpooledBlob
+        chunk_size: Characters (or bytes, for blobs) per chunk
+
+    Returns:
+        Iterable of text chunks
+    """
+    if isinstance(value, SpooledBlob):
+        return value.iter_text(chunk_size)
+    return (value[start:start + chunk_size] for start in range(0, len(value), chunk_size))
+
+class _Incomplete(Exception):
+    """Raised internally when more input is needed"""
+
+class StreamingObjectParser:
+    """
+    Incremental parser for a JSON object holding one large array of objects
+
+    Feed it the response body chunk by chunk. Elements of ``array_key`` are
+    returned from ``feed`` as soon as they are complete. Top-level fields other
+    than the array are collected and returned by ``close``. String values of
+    ``spool_fields`` inside array elements are written straight to a
+    SpooledBlob instead of being built as Python strings.
+    """
+
+    def __init__(self, array_key: str = "data", spool_fields: Iterable[str] = (), spool_memory: int = 256 * 1024):
+        self.array_key = array_key
+        self.spool_fields = frozenset(spool_fields)
+        self.spool_memory = spool_memory
+        self.fields: Dict[str, Any] = {}
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._element: Optional[Dict[str, Any]] = None
+        self._blob: Optional[SpooledBlob] = None
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Parse the next chunk of the document
+
+        Args:
+            data: Raw response bytes
+
+        Returns:
+            Array elements completed by this chunk
+        """
+        self._buf = self._buf[self._pos:] + self._text_decoder.decode(data)
+        self._pos = 0
+        return self._run(final=False)
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Finish parsing
+
+        Returns:
+            Top-level fields other than the streamed array
+
+        Raises:
+            ValueError: If the document is incomplete or malformed
+        """
+        self._buf = self._buf[self._pos:] + self._text_decoder.decode(b"", final=True)
+        self._pos = 0
+        leftover = self._run(final=True)
+        if leftover or self._state != "done":
+            raise ValueError("Incomplete JSON document")
+        return self.fields
+
+    def _run(self, final: bool) -> List[Any]:
+        """Advance the state machine as far as the buffered input allows"""
+        elements: List[Any] = []
+        try:
+            while self._state != "done":
+                handler = getattr(self, f"_state_{self._state}")
+                element = handler(final)
+                if element is not None:
+                    elements.append(element)
+        except _Incomplete:
+            if final:
+                raise ValueError("Incomplete JSON document")
+        return elements
+
+    # Buffer helpers
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, without consuming it"""
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        if pos >= len(buf):
+            raise _Incomplete()
+        return buf[pos]
+
+    def _expect(self, char: str) -> None:
+        """Consume an expected structural character"""
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos}")
+        self._pos += 1
+
+    def _read_string(self) -> str:
+        """Read a complete JSON string starting at the current quote"""
+        try:
+            value, end = json.decoder.scanstring(self._buf, self._pos + 1)
+        except json.JSONDecodeError:
+            raise _Incomplete()
+        self._pos = end
+        return value
+
+    def _read_value(self, final: bool) -> Any:
+        """Read a complete JSON value, waiting for its delimiter so numbers are not cut off"""
+        self._peek()
+        try:
+            value, end = _decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            raise _Incomplete()
+        if not final and (end >= len(self._buf) or self._buf[end] not in _VALUE_END):
+            raise _Incomplete()
+        self._pos = end
+        return value
+
+    # States
+
+    def _state_start(self, final: bool) -> None:
+        self._expect("{")
+        self._state = "top_key"
+
+    def _state_top_key(self, final: bool) -> None:
+        char = self._peek()
+        if char == "}":
+            self._pos += 1
+            self._state = "done"
+            return
+        if char == ",":
+            self._pos += 1
+            return
+        if char != '"':
+            raise ValueError(f"Expected object key at offset {self._pos}")
+        start = self._pos
+        key = self._read_string()
+        try:
+            self._expect(":")
+        except _Incomplete:
+            self._pos = start
+            raise
+        self._key = key
+        self._state = "top_value"
+
+    def _state_top_value(self, final: bool) -> None:
+        if self._key == self.array_key and self._peek() == "[":
+            self._pos += 1
+            self.fields[self._key] = []
+            self._state = "array"
+            return
+        self.fields[self._key] = self._read_value(final)
+        self._state = "top_key"
+
+    def _state_array(self, final: bool) -> Optional[Any]:
+        char = self._peek()
+        if char == "]":
+            self._pos += 1
+            self._state = "top_key"
+            return None
+        if char == ",":
+            self._pos += 1
+            return None
+        if char == "{":
+            self._pos += 1
+            self._element = {}
+            self._state = "element_key"
+            return None
+        return self._read_value(final)
+
+    def _state_element_key(self, final: bool) -> Optional[Any]:
+        char = self._peek()
+        if char == "}":
+            self._pos += 1
+            element, self._element = self._element, None
+            self._state = "array"
+            return element
+        if char == ",":
+            self._pos += 1
+            return None
+        if char != '"':
+            raise ValueError(f"Expected object key at offset {self._pos}")
+        start = self._pos
+        key = self._read_string()
+        try:
+            self._expect(":")
+        except _Incomplete:
+            self._pos = start
+            raise
+        self._key = key
+        self._state = "element_value"
+        return None
+
+    def _state_element_value(self, final: bool) -> None:
+        if self._key in self.spool_fields and self._peek() == '"':
+            self._pos += 1
+            self._blob = SpooledBlob(self.spool_memory)
+            self._state = "spool"
+            return
+        self._element[self._key] = self._read_value(final)
+        self._state = "element_key"
+
+    def _state_spool(self, final: bool) -> None:
+        """Copy a string value into the blob, decoding escapes, without buffering it whole"""
+        buf = self._buf
+        while True:
+            match = _STRING_SPECIAL.search(buf, self._pos)
+            if match is None:
+                if self._pos < len(buf):
+                    self._blob.write(buf[self._pos:])
+                    self._pos = len(buf)
+                raise _Incomplete()
+
+            index = match.start()
+            if index > self._pos:
+                self._blob.write(buf[self._pos:index])
+            self._pos = index
+
+            if buf[index] == '"':
+                self._pos = index + 1
+                self._element[self._key] = self._blob
+                self._blob = None
+                self._state = "element_key"
+                return
+
+            # Backslash escape
+            if index + 1 >= len(buf):
+                raise _Incomplete()
+            escape = buf[index + 1]
+            if escape == "u":
+                if index + 6 > len(buf):
+                    raise _Incomplete()
+                self._blob.write(chr(int(buf[index + 2:index + 6], 16)))
+                self._pos = index + 6
+            elif escape in _SIMPLE_ESCAPES:
+                self._blob.write(_SIMPLE_ESCAPES[escape])
+                self._pos = index + 2
+            else:
+                raise ValueError(f"Invalid escape at offset {index}")
@@ -0,0 +1,95 @@
+"""
+Structured, non-blocking logging
+
+Records are put on an in-memory queue by a QueueHandler and formatted and
+written by a QueueListener on a background thread, so request handlers never
+wait on log I/O. The formatter emits one JSON object per line.
+"""
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, TextIO
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+# Loggers that uvicorn gives their own synchronous stream handlers
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects, including ``extra`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves all formatting to the listener thread
+
+    The stock handler merges the message arguments and formats the record
+    before queueing it, on the logging thread. Here the record is queued as
+    is, so arguments must not be mutated after the logging call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+def setup_logging(
+    level: str = "INFO",
+    json_format: bool = True,
+    stream: Optional[TextIO] = None
+) -> QueueListener:
+    """
+    Route all logging through a queue to a background writer thread
+
+    Replaces the root logger's handlers, and uvicorn's, with a single queue
+    handler and starts the listener that writes the records to stream.
+
+    Args:
+        level: Root logging level name
+        json_format: Write JSON lines instead of plain text
+        stream: Stream to write to (default: stderr)
+
+    Returns:
+        Started listener; call ``stop()`` to flush and end the writer thread
+    """
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+    listener = QueueListener(records, writer, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(records))
+    root.setLevel(getattr(logging, level.upper()))
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    listener.start()
+    return listener
+
+def sampled(rate: float) -> bool:
+    """Return True for roughly a rate fraction of calls"""
+    return rate >= 1 or (rate > 0 and random.random() < rate)
@@ -0,0 +1,205 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format
+"""
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from cache-speed lookups to slow upstream searches
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+class _Metric:
+    """
+    Base for labelled metrics recorded into per-thread cells
+
+    Each thread only ever updates its own cell, a dict of label values to a
+    list of floats, so recording takes no lock: a dict lookup and an in-place
+    add. Rendering sums the cells of every thread that has recorded.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._cells: Dict[int, Dict[Labels, List[float]]] = {}
+
+    def _slots(self) -> int:
+        return 1
+
+    def _values(self, labels: Labels) -> List[float]:
+        """This thread's values for a label set, created on first use"""
+        cell = self._cells.get(threading.get_ident())
+        if cell is None:
+            cell = self._cells.setdefault(threading.get_ident(), {})
+        values = cell.get(labels)
+        if values is None:
+            values = cell.setdefault(labels, [0.0] * self._slots())
+        return values
+
+    def _totals(self) -> Dict[Labels, List[float]]:
+        """Values summed over every thread's cell"""
+        totals: Dict[Labels, List[float]] = {}
+        for cell in list(self._cells.values()):
+            for labels, values in list(cell.items()):
+                total = totals.get(labels)
+                if total is None:
+                    totals[labels] = list(values)
+                else:
+                    for i, value in enumerate(values):
+                        total[i] += value
+        return totals
+
+    def _label_text(self, labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)]
+        if extra:
+            pairs.append(f'{extra[0]}="{extra[1]}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _samples(self) -> Iterable[str]:
+        for labels, values in sorted(self._totals().items()):
+            yield f"{self.name}{self._label_text(labels)} {_format_value(values[0])}"
+
+    def render(self) -> List[str]:
+        """Render HELP, TYPE and sample lines"""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        """Add amount to the count for the given label values"""
+        self._values(labels)[0] += amount
+
+class Gauge(_Metric):
+    """Value that goes up and down, such as requests in flight"""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        """Raise the gauge for the given label values"""
+        self._values(labels)[0] += amount
+
+    def dec(self, amount: float = 1.0, *labels: str) -> None:
+        """Lower the gauge for the given label values"""
+        self._values(labels)[0] -= amount
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _slots(self) -> int:
+        # One count per bucket (non-cumulative), then the sum and the total count
+        return len(self.buckets) + 2
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the given label values"""
+        values = self._values(labels)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                values[i] += 1
+                break
+        values[-2] += value
+        values[-1] += 1
+
+    def _samples(self) -> Iterable[str]:
+        for labels, values in sorted(self._totals().items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                yield f"{self.name}_bucket{self._label_text(labels, ('le', _format_value(bound)))} {_format_value(cumulative)}"
+            yield f"{self.name}_bucket{self._label_text(labels, ('le', '+Inf'))} {_format_value(values[-1])}"
+            yield f"{self.name}_sum{self._label_text(labels)} {_format_value(values[-2])}"
+            yield f"{self.name}_count{self._label_text(labels)} {_format_value(values[-1])}"
+
+class Registry:
+    """Set of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric, returning it"""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+# Upstream Jagriti calls, one observation per HTTP request (retries and hedges included)
+UPSTREAM_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "jagriti_request_duration_seconds",
+    "Duration of requests to Jagriti by endpoint and outcome",
+    ("endpoint", "outcome")
+))
+UPSTREAM_IN_FLIGHT = REGISTRY.register(Gauge(
+    "jagriti_requests_in_flight",
+    "Requests to Jagriti currently in flight by endpoint",
+    ("endpoint",)
+))
+
+# API requests, labelled by route template rather than raw path
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "Duration of API requests by route, method and status",
+    ("route", "method", "status")
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight",
+    "API requests currently being handled",
+))
+SEARCH_CACHE_RESULTS = REGISTRY.register(Counter(
+    "search_cache_results_total",
+    "Searches by route and how they were answered (the X-Cache header: HIT, MISS, STALE, LOCAL or BYPASS)",
+    ("route", "status")
+))
+
+# Local case store
+CASE_STORE_FAILED_ROWS = REGISTRY.register(Counter(
+    "case_store_failed_rows_total",
+    "Cases dropped after every attempt to write them to the local case store failed",
+))
+
+# PDF storage
+PDF_BYTES_WRITTEN = REGISTRY.register(Counter(
+    "pdf_bytes_written_total",
+    "Bytes of PDF documents written to storage",
+))
+PDF_BYTES_READ = REGISTRY.register(Counter(
+    "pdf_bytes_read_total",
+    "Bytes of stored PDF documents read for downloads",
+))
@@ -0,0 +1,198 @@
+"""
+Retries, retry budgets, circuit breaking and hedging for upstream calls
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+Attempt = Callable[[], Awaitable[Any]]
+
+class RetryBudget:
+    """
+    Token bucket capping retries to a fraction of regular traffic
+
+    Every call deposits ``ratio`` tokens and a retry spends one, so retries add
+    at most ``ratio`` extra load on top of normal traffic. ``min_per_second``
+    tokens trickle in regardless, letting a quiet service still retry, and the
+    bucket never holds more than ``max_tokens``.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+        self.spent = 0
+        self.exhausted = 0
+
+    def _refill(self, amount: float = 0.0) -> None:
+        now = time.monotonic()
+        amount += (now - self._updated_at) * self.min_per_second
+        self._updated_at = now
+        self._tokens = min(self.max_tokens, self._tokens + amount)
+
+    def deposit(self) -> None:
+        """Credit the budget for one regular call"""
+        self._refill(self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend a token for a retry or hedge, returning False if the budget is exhausted"""
+        self._refill()
+        if self._tokens < 1:
+            self.exhausted += 1
+            return False
+        self._tokens -= 1
+        self.spent += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the token balance and spend counters"""
+        self._refill()
+        return {"tokens": round(self._tokens, 2), "spent": self.spent, "exhausted": self.exhausted}
+
+def backoff_delay(retry: int, base_delay: float, max_delay: float) -> float:
+    """
+    Exponential backoff with full jitter
+
+    Args:
+        retry: Retry number, starting at 1
+        base_delay: Upper bound of the first delay in seconds
+        max_delay: Cap on the delay in seconds
+
+    Returns:
+        Seconds to sleep before the retry
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (retry - 1)))
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail fast for ``reset_timeout`` seconds. It then lets a single probe call
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Check whether a call may go ahead, claiming the probe slot when half-open"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                self.rejected += 1
+                return False
+            self._probing = True
+        return True
+
+    def retry_after(self) -> float:
+        """Seconds until the open circuit lets a probe through"""
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        """Record a call the upstream answered"""
+        self._failures = 0
+        self._probing = False
+        self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Record a call that failed because of the upstream"""
+        self._failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def record_ignored(self) -> None:
+        """Release a probe slot for a call that says nothing about the upstream, e.g. a cancelled one"""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the circuit state and counters"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+class LatencyWindow:
+    """Rolling window of call latencies for percentile estimates"""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, latency: float) -> None:
+        """Add a latency sample in seconds"""
+        self._samples.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Latency below which the given fraction of recent calls finished
+
+        Returns:
+            Latency in seconds, or None until min_samples calls have been seen
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def hedged(attempt: Attempt, delay: float, allow_hedge: Callable[[], bool]) -> Any:
+    """
+    Run an attempt, starting a second one if the first is still running after delay
+
+    The first attempt to succeed wins and the other is cancelled. If one
+    attempt fails the other is still awaited; only when both fail is the last
+    error raised.
+
+    Args:
+        attempt: Coroutine factory for one attempt of the call
+        delay: Seconds to wait before hedging
+        allow_hedge: Called before hedging; returning False skips the second attempt
+
+    Returns:
+        Result of the winning attempt
+    """
+    first = asyncio.ensure_future(attempt())
+    tasks = {first}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done or not allow_hedge():
+            return await first
+        tasks.add(asyncio.ensure_future(attempt()))
+        error: Optional[BaseException] = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
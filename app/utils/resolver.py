@@ -0,0 +1,113 @@
+"""
+Prebuilt name resolution index for state and commission catalogs
+"""
+from typing import Any, Dict, List, Optional
+
+# Marks memoized lookups that found nothing
+_NOT_FOUND: Dict[str, Any] = {}
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a catalog or query name for matching
+
+    Args:
+        name: Raw name
+
+    Returns:
+        Upper-cased name with whitespace collapsed
+    """
+    return " ".join((name or "").upper().split())
+
+class NameIndex:
+    """
+    Lookup index over a list of named catalog items
+
+    Exact matches go through a hash map of normalized names. Partial matches
+    use a trigram index to narrow candidates before the substring check, and
+    ambiguous partial matches are ranked by match position, then name length,
+    then catalog order. Lookups are memoized per raw query string, so repeat
+    lookups are a single dict access; the memo is discarded with the index
+    whenever the catalog is refreshed.
+    """
+
+    NGRAM_SIZE = 3
+    MEMO_SIZE = 1024
+
+    def __init__(
+        self,
+        items: List[Dict[str, Any]],
+        name_field: str = "commissionNameEn",
+        id_field: str = "commissionId"
+    ):
+        self.items = items
+        self.name_field = name_field
+        self.id_field = id_field
+        self._names: List[str] = []
+        self._exact: Dict[str, Dict[str, Any]] = {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._grams: Dict[str, List[int]] = {}
+        self._memo: Dict[str, Dict[str, Any]] = {}
+
+        for position, item in enumerate(items):
+            name = normalize_name(item.get(name_field, ""))
+            self._names.append(name)
+            self._exact.setdefault(name, item)
+            self._by_id.setdefault(str(item.get(id_field)), item)
+            for gram in {name[i:i + self.NGRAM_SIZE] for i in range(len(name) - self.NGRAM_SIZE + 1)}:
+                self._grams.setdefault(gram, []).append(position)
+
+    def find(self, search_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the best matching item for a name
+
+        Args:
+            search_name: Name to search for
+
+        Returns:
+            Matching item or None if not found
+        """
+        item = self._memo.get(search_name)
+        if item is None:
+            item = self._lookup(normalize_name(search_name)) or _NOT_FOUND
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[search_name] = item
+        return item if item is not _NOT_FOUND else None
+
+    def find_id(self, search_name: str) -> Optional[Any]:
+        """Find the ID of the best matching item, or None if not found"""
+        item = self.find(search_name)
+        return item.get(self.id_field) if item is not None else None
+
+    def get_by_id(self, item_id: Any) -> Optional[Dict[str, Any]]:
+        """Get an item by its ID"""
+        return self._by_id.get(str(item_id))
+
+    def _lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """Resolve a normalized name: exact match first, then ranked partial match"""
+        item = self._exact.get(name)
+        if item is not None or not name:
+            return item
+
+        if len(name) < self.NGRAM_SIZE:
+            candidates = range(len(self._names))
+        else:
+            postings = []
+            for i in range(len(name) - self.NGRAM_SIZE + 1):
+                posting = self._grams.get(name[i:i + self.NGRAM_SIZE])
+                if posting is None:
+                    return None
+                postings.append(posting)
+            candidates = min(postings, key=len)
+
+        best = None
+        best_rank = None
+        for position in candidates:
+            offset = self._names[position].find(name)
+            if offset < 0:
+                continue
+            rank = (offset, len(self._names[position]), position)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = position, rank
+
+        return self.items[best] if best is not None else None
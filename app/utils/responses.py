@@ -0,0 +1,84 @@
+"""
+JSON responses that skip FastAPI's response model round trip
+
+When an endpoint returns a model, FastAPI dumps it to a dict, validates the
+dict against the response_model again and then encodes it. Endpoints that
+already hold a correct model return one of these responses instead, so the
+model is serialized once, straight to bytes.
+"""
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library encoder is used instead
+    orjson = None
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse that renders models with their compiled serializer
+
+    Pydantic models are encoded directly with ``model_dump_json``. Other
+    content is encoded with orjson when it is installed, and with the same
+    compact standard library encoding as JSONResponse otherwise.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class SerializedBodyCache:
+    """
+    Pre-serialized JSON bodies for catalog lists
+
+    A body is built once per list object and reused for as long as the caller
+    keeps getting that same object back, e.g. from a catalog cache that only
+    replaces its list on refresh.
+    """
+
+    def __init__(self, build: Callable[[Any], BaseModel], max_entries: int = 256):
+        """
+        Create the cache
+
+        Args:
+            build: Builds the response model for a list
+            max_entries: Bodies kept before the oldest is dropped
+        """
+        self.build = build
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def body(self, key: Hashable, items: Any) -> bytes:
+        """
+        Get the serialized body for a list
+
+        Args:
+            key: Cache key, e.g. the state ID
+            items: List to serialize; compared by identity with the cached one
+
+        Returns:
+            UTF-8 JSON body
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is items:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        body = self.build(items).model_dump_json().encode("utf-8")
+        self._entries[key] = (items, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return body
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss counters"""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
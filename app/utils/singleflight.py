@@ -0,0 +1,56 @@
+"""
+Request coalescing for concurrent identical calls
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers with the same key
+
+    The first caller starts the call as a task; callers arriving while it is
+    running await the same task and receive its result or exception. Waiters
+    are shielded, so one caller being cancelled does not cancel the call for
+    the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once for all concurrent callers using key
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine factory performing the call
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.get_running_loop().create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished call and mark its exception as retrieved"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Return call, coalesced and in-flight counts"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,109 @@
+"""
+Per-request phase timing for Server-Timing headers and slow request logs
+"""
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple
+
+_request_timer: ContextVar[Optional["RequestTimer"]] = ContextVar("request_timer", default=None)
+
+class RequestTimer:
+    """
+    Accumulated time per phase of one request
+
+    A phase can be entered many times (one PDF write per case, one upstream
+    search per commission); its durations and entry count add up. Spans in
+    concurrent tasks of the same request add up too, so a phase can exceed
+    the request's wall-clock time.
+    """
+
+    __slots__ = ("started_at", "phases")
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        # Phase name -> [total seconds, count], in first-entered order
+        self.phases: Dict[str, List[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one timed entry of a phase"""
+        phase = self.phases.get(name)
+        if phase is None:
+            self.phases[name] = [seconds, 1]
+        else:
+            phase[0] += seconds
+            phase[1] += 1
+
+    def elapsed(self) -> float:
+        """Seconds since the request started"""
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self) -> str:
+        """
+        Format the phases as a Server-Timing header value
+
+        Returns:
+            e.g. 'upstream;dur=812.4, pdf;dur=35.0;desc="30 calls", total;dur=870.1'
+        """
+        entries = []
+        for name, (seconds, count) in list(self.phases.items()):
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                entry += f';desc="{int(count)} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+    def breakdown(self) -> str:
+        """Format the phases for a log line, e.g. 'state=1.2ms upstream=812.4ms pdf=35.0ms/30'"""
+        parts = []
+        for name, (seconds, count) in list(self.phases.items()):
+            part = f"{name}={seconds * 1000:.1f}ms"
+            if count > 1:
+                part += f"/{int(count)}"
+            parts.append(part)
+        return " ".join(parts) or "no phases recorded"
+
+def start_request_timer() -> Tuple[RequestTimer, Token]:
+    """
+    Start timing a request in the current context
+
+    Returns:
+        The timer and the token to pass to end_request_timer
+    """
+    timer = RequestTimer()
+    return timer, _request_timer.set(timer)
+
+def end_request_timer(token: Token) -> None:
+    """Stop attributing spans in the current context to the request timer"""
+    _request_timer.reset(token)
+
+def current_timer() -> Optional[RequestTimer]:
+    """Get the timer of the request being handled, if any"""
+    return _request_timer.get()
+
+class span:
+    """
+    Time a phase of the current request
+
+    Usable around sync or async code. Outside a timed request (background
+    sync, tests) it only costs the context variable lookup.
+
+    Example:
+        with span("upstream"):
+            result = await client.get_case_details_by_search(...)
+    """
+
+    __slots__ = ("name", "timer", "started_at")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "span":
+        self.timer = _request_timer.get()
+        if self.timer is not None:
+            self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.timer is not None:
+            self.timer.record(self.name, time.perf_counter() - self.started_at)
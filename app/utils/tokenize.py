@@ -0,0 +1,178 @@
+"""
+Tokenization and normalization of party and advocate names for full-text search
+"""
+import re
+from functools import lru_cache
+from typing import Iterator, List, NamedTuple, Tuple
+
+# Relations written between names, e.g. "Ramesh S/o Suresh"; the letters on
+# either side of the slash are dropped along with it
+_RELATION = re.compile(r"\b[sdwc]\s*/\s*o\b\.?", re.IGNORECASE)
+# "M/s" ahead of firm names
+_MESSRS = re.compile(r"\bm\s*/\s*s\b\.?", re.IGNORECASE)
+_WORD = re.compile(r"[^\W_]+")
+
+# Titles and honorifics that carry no identifying information
+HONORIFICS = frozenset({
+    "adv", "advs", "advocate", "advocates", "ld", "learned", "counsel",
+    "mr", "mrs", "ms", "miss", "master", "messrs",
+    "shri", "sri", "shree", "sh", "smt", "shrimati", "srimati", "sushri", "kumari", "kum", "km",
+    "dr", "prof", "er", "capt", "col", "maj", "lt", "gen", "retd", "late",
+    "and", "the", "of",
+})
+
+# Spelling variants mapped to one form before folding
+VARIANTS = {
+    "md": "mohammad",
+    "mohd": "mohammad",
+    "mohamad": "mohammad",
+    "mohamed": "mohammad",
+    "mohammed": "mohammad",
+    "muhammad": "mohammad",
+    "muhammed": "mohammad",
+    "ltd": "limited",
+    "pvt": "private",
+    "co": "company",
+    "corp": "corporation",
+    "corpn": "corporation",
+    "govt": "government",
+    "dept": "department",
+    "bros": "brothers",
+    "intl": "international",
+    "mgr": "manager",
+}
+
+# Transliteration folds applied in order, so that common spellings of the same
+# Indian name (Laxmi/Lakshmi, Chaudhary/Choudhary, Sharma/Sarma) index alike
+_FOLDS = [
+    (re.compile(r"ksh|ks"), "x"),
+    (re.compile(r"au|ou|ow|aw"), "o"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"([bdgjkt])h"), r"\1"),
+    (re.compile(r"sh"), "s"),
+    (re.compile(r"ch"), "c"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"ee|ea"), "i"),
+    (re.compile(r"oo"), "u"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+# Folds that only hold for a complete word; a truncated query word such as
+# "Jay" (for "Jayant") must not get them
+_FINAL_FOLDS = [
+    (re.compile(r"(?<=.)(?:y|ey)$"), "i"),
+]
+
+# Letters that may complete a fold started by the last letters of a truncated
+# word, e.g. "Lak" + "sh" folds to "lax", a prefix of "laxmi"
+_CONTINUATIONS = ("h", "s", "sh", "u", "w", "e", "a", "o")
+
+class QueryTerm(NamedTuple):
+    """A query word as its complete-word fold and the prefixes it can match"""
+    term: str
+    prefixes: Tuple[str, ...]
+
+# Shortest token worth indexing; single initials would match most names
+MIN_TOKEN_LENGTH = 2
+
+def _fold(token: str) -> str:
+    """Apply the transliteration folds that hold for partial words too"""
+    for pattern, replacement in _FOLDS:
+        token = pattern.sub(replacement, token)
+    return token
+
+@lru_cache(maxsize=65536)
+def fold_token(token: str) -> str:
+    """
+    Fold a lower-cased word to its canonical spelling
+
+    Args:
+        token: Lower-cased word
+
+    Returns:
+        Variant-mapped, transliteration-folded word
+    """
+    token = _fold(VARIANTS.get(token, token))
+    for pattern, replacement in _FINAL_FOLDS:
+        token = pattern.sub(replacement, token)
+    return token
+
+@lru_cache(maxsize=65536)
+def fold_prefix(token: str) -> Tuple[str, ...]:
+    """
+    Fold a lower-cased word that may be the start of a longer word
+
+    Folds that need the whole word are skipped, and letters at the end that
+    may begin a multi-letter fold are also tried completed, so every folded
+    word starting with token starts with one of the returned prefixes.
+
+    Args:
+        token: Lower-cased word or word prefix
+
+    Returns:
+        Folded prefixes, the plain fold first
+    """
+    base = _fold(token)
+    prefixes = [base]
+    for continuation in _CONTINUATIONS:
+        prefix = _fold(token + continuation)
+        # Prefixes extending the plain fold only match a subset of its words
+        if not prefix.startswith(base) and prefix not in prefixes:
+            prefixes.append(prefix)
+    return tuple(prefixes)
+
+def _words(name: str) -> Iterator[str]:
+    """Yield the lower-cased words of a name that are worth indexing"""
+    text = _MESSRS.sub(" ", _RELATION.sub(" ", name or ""))
+    for word in _WORD.findall(text.lower()):
+        if word not in HONORIFICS and len(word) >= MIN_TOKEN_LENGTH:
+            yield word
+
+def tokenize_name(name: str) -> List[str]:
+    """
+    Split a party or advocate name into normalized search terms
+
+    Honorifics, relation markers and initials are dropped and each remaining
+    word is folded with fold_token. Terms are de-duplicated, keeping their
+    first position.
+
+    Args:
+        name: Raw name, e.g. "Adv. Mohd. Lakshmi Narayan S/o Late Ramesh"
+
+    Returns:
+        Search terms in name order
+    """
+    terms: List[str] = []
+    for word in _words(name):
+        term = fold_token(word)
+        if len(term) >= MIN_TOKEN_LENGTH and term not in terms:
+            terms.append(term)
+    return terms
+
+def tokenize_query(query: str) -> List[QueryTerm]:
+    """
+    Split a name query into terms matched exactly or as prefixes
+
+    Each word is tokenized like tokenize_name for exact matching. Since the
+    last word may be cut short while typing and any word may be an
+    abbreviation, every word also carries prefixes folded as a partial word
+    (see fold_prefix), along with its complete-word fold.
+
+    Args:
+        query: Raw query, e.g. "Adv. Lak"
+
+    Returns:
+        Query terms in query order, de-duplicated by complete-word fold
+    """
+    terms: List[QueryTerm] = []
+    for word in _words(query):
+        term = fold_token(word)
+        if len(term) < MIN_TOKEN_LENGTH or any(existing.term == term for existing in terms):
+            continue
+        prefixes = [prefix for prefix in fold_prefix(word) if len(prefix) >= MIN_TOKEN_LENGTH]
+        if term not in prefixes:
+            prefixes.append(term)
+        terms.append(QueryTerm(term, tuple(prefixes)))
+    return terms
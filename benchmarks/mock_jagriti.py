@@ -0,0 +1,141 @@
+"""
+Local stand-in for the e-jagriti endpoints used by JagritiClient
+
+Run it as an ASGI app (``uvicorn benchmarks.mock_jagriti:app``) configured
+through MOCK_* environment variables, or in-process by passing
+``httpx.ASGITransport(app=create_app(config))`` to JagritiClient.
+"""
+import asyncio
+import base64
+import json
+import os
+import random
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+FIRST_NAMES = ["Lakshmi", "Ramesh", "Suresh", "Mohammed", "Anita", "Priya", "Rajesh", "Sunita", "Venkat", "Fatima"]
+LAST_NAMES = ["Reddy", "Sharma", "Choudhary", "Iyer", "Khan", "Patel", "Nair", "Gupta", "Rao", "Singh"]
+FIRMS = ["XYZ Pvt. Ltd.", "Bharat Motors", "City Builders Ltd.", "National Insurance Co.", "Sunrise Telecom"]
+
+@dataclass
+class MockConfig:
+    """Shape and behaviour of the mock upstream"""
+    latency: float = 0.05              # mean seconds per request
+    jitter: float = 0.5                # latency varies by +/- this fraction
+    error_rate: float = 0.0            # fraction of requests answered with 503
+    states: int = 4
+    commissions_per_state: int = 8
+    cases: int = 120                   # matching cases per search; pages follow from the page size
+    pdf_bytes: int = 0                 # decoded PDF size per case, 0 for no documentBase64
+    seed: int = 1
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        """Build a config from MOCK_<FIELD> environment variables"""
+        values = {}
+        for field in fields(cls):
+            raw = os.getenv(f"MOCK_{field.name.upper()}")
+            if raw is not None:
+                values[field.name] = type(field.default)(raw)
+        return cls(**values)
+
+class MockJagriti:
+    """Deterministic catalog and case data with configurable latency and failures"""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.requests = 0
+        self.states = [
+            {"commissionId": 11000000 + i * 10000, "commissionNameEn": f"STATE {i}",
+             "circuitAdditionBenchStatus": False, "activeStatus": True}
+            for i in range(config.states)
+        ]
+        self.commissions = {
+            state["commissionId"]: [
+                {"commissionId": state["commissionId"] + j + 1, "commissionNameEn": f"District {i}-{j}",
+                 "circuitAdditionBenchStatus": False, "activeStatus": True}
+                for j in range(config.commissions_per_state)
+            ]
+            for i, state in enumerate(self.states)
+        }
+        pdf = b"%PDF-1.4\n" + bytes(max(0, config.pdf_bytes - 9))
+        self.pdf_base64 = base64.b64encode(pdf).decode("ascii") if config.pdf_bytes else None
+
+    def case(self, commission_id: int, number: int) -> Dict[str, Any]:
+        """Build the raw record of one case"""
+        rng = random.Random(commission_id * 100003 + number)
+        case = {
+            "caseNumber": f"DC/{commission_id % 10000}/CC/{number}/2025",
+            "caseStageName": rng.choice(["Admission", "Hearing", "Evidence", "Disposed"]),
+            "caseFilingDate": f"2025-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}",
+            "complainantName": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "complainantAdvocateName": f"Adv. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "respondentName": f"M/s {rng.choice(FIRMS)}",
+            "respondentAdvocateName": f"Adv. {rng.choice(LAST_NAMES)}",
+        }
+        if self.pdf_base64:
+            case["documentBase64"] = self.pdf_base64
+        return case
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a getCaseDetailsBySearchType request body"""
+        start = body["page"] * body["size"]
+        end = min(start + body["size"], self.config.cases)
+        data = [self.case(body["commissionId"], number) for number in range(start, end)]
+        return {"status": 200, "message": "Success", "data": data, "totalCount": self.config.cases}
+
+    async def delay(self) -> bool:
+        """Sleep for one request's latency; returns False if the request should fail"""
+        self.requests += 1
+        config = self.config
+        if config.latency > 0:
+            await asyncio.sleep(config.latency * self.random.uniform(1 - config.jitter, 1 + config.jitter))
+        return self.random.random() >= config.error_rate
+
+def create_app(config: MockConfig) -> Starlette:
+    """Build the mock upstream as an ASGI app"""
+    mock = MockJagriti(config)
+
+    def unavailable() -> Response:
+        return Response(status_code=503)
+
+    async def states(request: Request) -> Response:
+        if not await mock.delay():
+            return unavailable()
+        return JSONResponse({"status": 200, "data": mock.states})
+
+    async def commissions(request: Request) -> Response:
+        if not await mock.delay():
+            return unavailable()
+        state_id = int(request.query_params.get("commissionId", 0))
+        return JSONResponse({"status": 200, "data": mock.commissions.get(state_id, [])})
+
+    async def search(request: Request) -> Response:
+        if not await mock.delay():
+            return unavailable()
+        body = json.loads(await request.body())
+        return JSONResponse(mock.search(body))
+
+    app = Starlette(routes=[
+        Route("/services/report/report/getStateCommissionAndCircuitBench", states),
+        Route("/services/report/report/getDistrictCommissionByCommissionId", commissions),
+        Route("/services/case/caseFilingService/v2/getCaseDetailsBySearchType", search, methods=["POST"]),
+    ])
+    app.state.mock = mock
+    return app
+
+app = create_app(MockConfig.from_env())
+
+def catalog(config: MockConfig) -> List[Dict[str, Any]]:
+    """State and commission names the mock serves, for building load scenarios"""
+    mock = MockJagriti(config)
+    return [
+        {"state": state["commissionNameEn"], "state_id": state["commissionId"],
+         "commissions": [c["commissionNameEn"] for c in mock.commissions[state["commissionId"]]]}
+        for state in mock.states
+    ]
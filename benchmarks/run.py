@@ -0,0 +1,280 @@
+"""
+Load generator for the API, run against a local mock Jagriti server
+
+Starts the mock upstream and the API as uvicorn subprocesses, drives every
+route with concurrent requests and reports throughput, p50/p95/p99 latency
+and the API's peak RSS. Results can be saved as baselines and later runs
+compared against them:
+
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run --compare          # exits 1 on a regression
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import httpx
+from benchmarks.mock_jagriti import MockConfig, catalog
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+
+SEARCH_ROUTES = [
+    "by-case-number",
+    "by-complainant",
+    "by-respondent",
+    "by-complainant-advocate",
+    "by-respondent-advocate",
+    "by-industry-type",
+    "by-judge",
+]
+
+# Distinct search values per route; repeats exercise the result cache
+SEARCH_VALUES = 50
+
+PDF_BODY = b"%PDF-1.4\n" + bytes(64 * 1024)
+
+Scenario = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def peak_rss_mb(pid: int) -> Optional[float]:
+    """Peak resident set size of a process in MiB, from /proc on Linux"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def build_scenarios(config: MockConfig) -> Dict[str, Scenario]:
+    """Map scenario names to request functions taking (client, request number)"""
+    states = catalog(config)
+
+    def search_body(i: int) -> Dict[str, Any]:
+        state = states[i % len(states)]
+        return {
+            "state": state["state"],
+            "commission": state["commissions"][i % len(state["commissions"])],
+            "search_value": f"value {i % SEARCH_VALUES}",
+            "size": 30,
+        }
+
+    scenarios: Dict[str, Scenario] = {
+        "states": lambda client, i: client.get("/states"),
+        "commissions": lambda client, i: client.get(f"/commissions/{states[i % len(states)]['state_id']}"),
+    }
+    for route in SEARCH_ROUTES:
+        scenarios[route] = lambda client, i, route=route: client.post(f"/cases/{route}", json=search_body(i))
+    scenarios.update({
+        "state-wide": lambda client, i: client.post(
+            "/cases/by-respondent/state-wide",
+            json={"state": states[i % len(states)]["state"], "search_value": f"value {i % SEARCH_VALUES}"}
+        ),
+        "stream": lambda client, i: client.post("/cases/by-complainant/stream", json={**search_body(i), "size": 100}),
+        "batch": lambda client, i: client.post(
+            "/cases/batch",
+            json={"items": [{"search_type": "by-case-number", "request": search_body(i * 20 + j)} for j in range(20)]}
+        ),
+        "local-search": lambda client, i: client.get("/cases/local-search", params={"q": ["Lakshmi", "Reddy", "sharma ram"][i % 3]}),
+        "upload-document": lambda client, i: client.post(
+            "/cases/upload-document",
+            json={"case_number": f"BENCH/{i}", "base64_data": base64.b64encode(PDF_BODY).decode("ascii")}
+        ),
+        "upload-document-stream": lambda client, i: client.post(
+            "/cases/upload-document/stream", params={"case_number": f"BENCH-STREAM/{i}"}, content=PDF_BODY,
+            headers={"Content-Type": "application/pdf"}
+        ),
+        "download": lambda client, i: client.get(f"/cases/download/case_BENCH_{i % 20}.pdf"),
+        "download-case": lambda client, i: client.get(f"/cases/download/case/BENCH/{i % 20}"),
+    })
+    return scenarios
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Send requests through a scenario with fixed concurrency and summarize the latencies"""
+    latencies: List[float] = []
+    errors = 0
+    numbers = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in numbers:
+            started_at = time.perf_counter()
+            try:
+                response = await scenario(client, i)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started_at)
+            errors += failed
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _start(app: str, port: int, env: Dict[str, str], cwd: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "PYTHONPATH": str(ROOT), **env},
+        cwd=cwd,
+    )
+
+async def _wait_ready(process: subprocess.Popen, url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Server for {url} exited with code {process.returncode}")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{url} did not come up within {timeout} seconds")
+                await asyncio.sleep(0.1)
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Start the servers, run every selected scenario and collect the results"""
+    config = MockConfig(
+        latency=args.mock_latency,
+        error_rate=args.mock_error_rate,
+        cases=args.mock_cases,
+        pdf_bytes=args.mock_pdf_bytes,
+    )
+    scenarios = build_scenarios(config)
+    selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+
+    mock_port, api_port = _free_port(), _free_port()
+    workdir = tempfile.mkdtemp(prefix="lexi-bench-")
+    mock_env = {f"MOCK_{name.upper()}": str(value) for name, value in vars(config).items()}
+    api_env = {
+        "JAGRITI_BASE_URL": f"http://127.0.0.1:{mock_port}",
+        "CASE_STORE_PATH": os.path.join(workdir, "cases.db"),
+        "LOG_LEVEL": "WARNING",
+    }
+    processes = [
+        _start("benchmarks.mock_jagriti:app", mock_port, mock_env, workdir),
+        _start("app.main:app", api_port, api_env, workdir),
+    ]
+    results: Dict[str, Any] = {"scenarios": {}}
+    try:
+        base_url = f"http://127.0.0.1:{api_port}"
+        await _wait_ready(processes[0], f"http://127.0.0.1:{mock_port}/")
+        await _wait_ready(processes[1], f"{base_url}/")
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            # Documents the download scenarios fetch, and cases for local search
+            for i in range(20):
+                await scenarios["upload-document"](client, i)
+            await run_scenario(client, scenarios["by-complainant"], 40, args.concurrency)
+
+            for name in selected:
+                await run_scenario(client, scenarios[name], args.warmup, args.concurrency)
+                result = await run_scenario(client, scenarios[name], args.requests, args.concurrency)
+                results["scenarios"][name] = result
+                print(
+                    f"{name:<26} {result['rps']:>8} req/s  p50 {result['p50_ms']:>8} ms  "
+                    f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  errors {result['errors']}"
+                )
+        results["peak_rss_mb"] = peak_rss_mb(processes[1].pid)
+        print(f"API peak RSS: {results['peak_rss_mb']} MiB")
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+    results["settings"] = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "mock": vars(config),
+    }
+    return results
+
+def compare(results: Dict[str, Any], baselines: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    List regressions against saved baselines
+
+    A scenario regresses when its p95 latency grows or its throughput drops by
+    more than tolerance (a fraction), or when it has errors its baseline did not.
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baselines.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+        if result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['rps']} req/s vs baseline {base['rps']} req/s")
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{name}: {result['errors']} errors vs baseline {base['errors']}")
+    base_rss, rss = baselines.get("peak_rss_mb"), results.get("peak_rss_mb")
+    if base_rss and rss and rss > base_rss * (1 + tolerance):
+        regressions.append(f"peak RSS {rss:.1f} MiB vs baseline {base_rss:.1f} MiB")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario first")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once")
+    parser.add_argument("--scenarios", default="", help="Comma-separated scenarios to run (default: all)")
+    parser.add_argument("--mock-latency", type=float, default=0.05, help="Mean upstream latency in seconds")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0, help="Fraction of upstream requests failing with 503")
+    parser.add_argument("--mock-cases", type=int, default=120, help="Matching cases per upstream search")
+    parser.add_argument("--mock-pdf-bytes", type=int, default=32 * 1024, help="PDF size per case, 0 for none")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", default=str(BASELINES_PATH), help="Baselines file")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baselines")
+    parser.add_argument("--compare", action="store_true", help="Exit 1 if any scenario regressed against the baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression as a fraction")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baselines saved to {args.baseline}")
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Shared test fixtures
+"""
+import json
+import httpx
+import pytest
+from app.services.jagriti_client import JagritiClient
+
+STATES = [
+    {"commissionId": 11290000, "commissionNameEn": "KARNATAKA", "circuitAdditionBenchStatus": False, "activeStatus": True},
+    {"commissionId": 11330000, "commissionNameEn": "TAMIL NADU", "circuitAdditionBenchStatus": False, "activeStatus": True},
+]
+
+COMMISSIONS = [
+    {"commissionId": 11290525, "commissionNameEn": "Bangalore 1st & Rural Additional", "circuitAdditionBenchStatus": False, "activeStatus": True},
+    {"commissionId": 11290526, "commissionNameEn": "Mysore", "circuitAdditionBenchStatus": False, "activeStatus": True},
+]
+
+def make_case(case_number: str, **fields):
+    """Build a raw Jagriti case record"""
+    case = {
+        "caseNumber": case_number,
+        "caseStageName": "Hearing",
+        "caseFilingDate": "2025-02-01",
+        "complainantName": "John Doe",
+        "complainantAdvocateName": "Adv. Reddy",
+        "respondentName": "XYZ Ltd.",
+        "respondentAdvocateName": "Adv. Mehta",
+    }
+    case.update(fields)
+    return case
+
+class FakeJagriti:
+    """In-memory stand-in for the Jagriti endpoints used by JagritiClient"""
+
+    def __init__(self):
+        self.cases = [make_case("DC/79/CC/35/2025")]
+        self.calls = []
+        # Set to answer catalog requests with a JSON error body instead
+        self.catalog_error = None
+
+    def search(self, body):
+        """Return a page of self.cases for a search request body"""
+        start = body["page"] * body["size"]
+        return {"status": 200, "data": self.cases[start:start + body["size"]], "totalCount": len(self.cases)}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        if self.catalog_error is not None and "Commission" in request.url.path:
+            return httpx.Response(200, json=self.catalog_error)
+        if request.url.path.endswith("getStateCommissionAndCircuitBench"):
+            return httpx.Response(200, json={"status": 200, "data": STATES})
+        if request.url.path.endswith("getDistrictCommissionByCommissionId"):
+            return httpx.Response(200, json={"status": 200, "data": [dict(c) for c in COMMISSIONS]})
+        if request.url.path.endswith("getCaseDetailsBySearchType"):
+            return httpx.Response(200, json=self.search(json.loads(request.content)))
+        return httpx.Response(404)
+
+@pytest.fixture
+def fake_jagriti():
+    return FakeJagriti()
+
+@pytest.fixture
+def jagriti_client(fake_jagriti):
+    return JagritiClient(transport=httpx.MockTransport(fake_jagriti.handler))
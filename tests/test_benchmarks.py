@@ -0,0 +1,65 @@
+"""
+Tests for the benchmark harness's mock upstream and result helpers
+"""
+import asyncio
+import httpx
+import pytest
+from app.services.jagriti_client import JagritiClient
+from app.utils.exceptions import JagritiAPIException
+from benchmarks.mock_jagriti import MockConfig, catalog, create_app
+from benchmarks.run import compare, percentile
+
+def test_mock_serves_client_requests():
+    """Test that JagritiClient can resolve and page through the mock upstream"""
+    config = MockConfig(latency=0, cases=45, pdf_bytes=1024)
+    state = catalog(config)[1]
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.ASGITransport(app=create_app(config)))
+        try:
+            state_id, commission_id = await client.resolve(state["state"], state["commissions"][2])
+            last_page = await client.get_case_details_by_search(commission_id, 1, "x", page=1, size=30)
+            return state_id, commission_id, last_page
+        finally:
+            await client.close()
+
+    state_id, commission_id, last_page = asyncio.run(scenario())
+    assert state_id == state["state_id"]
+    assert commission_id == state_id + 3
+    assert last_page["totalCount"] == 45
+    assert len(last_page["data"]) == 15
+    assert last_page["data"][0]["caseNumber"] == f"DC/{commission_id % 10000}/CC/30/2025"
+    assert len(last_page["data"][0]["documentBase64"]) == 1368
+
+def test_mock_error_rate():
+    """Test that a mock with every request failing surfaces as an upstream error"""
+    config = MockConfig(latency=0, error_rate=1.0)
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.ASGITransport(app=create_app(config)))
+        try:
+            await client.get_states()
+        finally:
+            await client.close()
+
+    with pytest.raises(JagritiAPIException):
+        asyncio.run(scenario())
+
+def test_percentile_and_compare():
+    """Test nearest-rank percentiles and regression detection against baselines"""
+    values = [i / 100 for i in range(1, 101)]
+    assert percentile(values, 0.50) == 0.50
+    assert percentile(values, 0.99) == 0.99
+    assert percentile([], 0.95) == 0.0
+
+    baselines = {
+        "scenarios": {"states": {"rps": 100.0, "p95_ms": 10.0, "errors": 0}},
+        "peak_rss_mb": 100.0,
+    }
+    within = {"scenarios": {"states": {"rps": 90.0, "p95_ms": 12.0, "errors": 0}}, "peak_rss_mb": 110.0}
+    assert compare(within, baselines, tolerance=0.25) == []
+
+    worse = {"scenarios": {"states": {"rps": 50.0, "p95_ms": 20.0, "errors": 2}}, "peak_rss_mb": 200.0}
+    regressions = compare(worse, baselines, tolerance=0.25)
+    assert len(regressions) == 4
+    assert regressions[0].startswith("states: p95 20.0 ms")
@@ -0,0 +1,76 @@
+"""
+Tests for caching primitives
+"""
+import asyncio
+from app.utils.cache import TTLCache
+
+def test_ttl_cache_serves_stale_while_refreshing():
+    """Test that a stale entry is served while one background refresh runs"""
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def scenario():
+        cache = TTLCache(ttl=0)
+        assert await cache.get("states", loader) == 1
+        # Entry is immediately stale: both reads get the old value, one refresh runs
+        assert await cache.get("states", loader) == 1
+        assert await cache.get("states", loader) == 1
+        await asyncio.sleep(0.05)
+        assert len(calls) == 2
+        assert cache.peek("states") == 2
+        await cache.close()
+
+    asyncio.run(scenario())
+
+def test_ttl_cache_keeps_stale_value_on_refresh_failure():
+    """Test that a failed background refresh keeps the previous value"""
+    async def failing_loader():
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        cache = TTLCache(ttl=0)
+        cache.set("states", ["KARNATAKA"])
+        assert await cache.get("states", failing_loader) == ["KARNATAKA"]
+        await asyncio.sleep(0.01)
+        assert cache.peek("states") == ["KARNATAKA"]
+        await cache.close()
+
+    asyncio.run(scenario())
+
+def test_ttl_cache_lru_eviction_and_counters():
+    """Test LRU bounds and hit/miss counters"""
+    async def scenario():
+        cache = TTLCache(ttl=60, max_entries=2)
+
+        async def load_a():
+            return "a"
+
+        await cache.get("a", load_a)
+        await cache.get("a", load_a)
+        cache.set("b", "b")
+        cache.set("c", "c")
+        assert cache.peek("a") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert len(cache) == 2
+
+    asyncio.run(scenario())
+
+def test_byte_lru_cache_evicts_by_size():
+    """Test that the byte-bounded cache evicts least recently used entries"""
+    from app.utils.cache import ByteLRUCache
+
+    cache = ByteLRUCache(max_bytes=100)
+    cache.set("a", "a", size=40, ttl=60)
+    cache.set("b", "b", size=40, ttl=60)
+    assert cache.get("a") == "a"
+    cache.set("c", "c", size=40, ttl=60)
+    assert cache.get("b") is None
+    assert cache.total_bytes == 80
+    assert not cache.set("huge", "x", size=101, ttl=60)
+    cache.set("expired", "x", size=10, ttl=-1)
+    assert cache.get("expired") is None
@@ -0,0 +1,133 @@
+"""
+Tests for the case service
+"""
+import asyncio
+from app.models.base import SearchType
+from app.models.case import CaseSearchRequest
+from app.services.case_service import CaseService, get_cache_status
+from tests.conftest import make_case
+
+def _request(**fields):
+    fields.setdefault("commission", "Bangalore 1st")
+    fields.setdefault("search_value", "DC/79/CC/35/2025")
+    return CaseSearchRequest(state="karnataka", **fields)
+
+def test_search_results_are_cached(jagriti_client, fake_jagriti):
+    """Test that repeat searches are served from the result cache"""
+    async def scenario():
+        service = CaseService(jagriti_client)
+        first = await service.search_cases(_request(), SearchType.CASE_NUMBER)
+        assert get_cache_status() == "MISS"
+        second = await service.search_cases(_request(search_value="  DC/79/CC/35/2025 "), SearchType.CASE_NUMBER)
+        assert get_cache_status() == "HIT"
+        assert second is first
+        assert first.cases[0].case_number == "DC/79/CC/35/2025"
+        assert fake_jagriti.calls.count("/services/case/caseFilingService/v2/getCaseDetailsBySearchType") == 1
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
+
+def test_empty_results_are_negatively_cached(jagriti_client, fake_jagriti):
+    """Test that empty results are cached too"""
+    fake_jagriti.cases = []
+
+    async def scenario():
+        service = CaseService(jagriti_client)
+        await service.search_cases(_request(), SearchType.RESPONDENT)
+        result = await service.search_cases(_request(), SearchType.RESPONDENT)
+        assert get_cache_status() == "HIT"
+        assert result.total_count == 0
+        assert service.result_cache.total_bytes > 0
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
+
+def test_state_wide_search_merges_and_reports_failures(jagriti_client, fake_jagriti):
+    """Test fan-out across commissions with de-duplication and partial failures"""
+    from app.models.case import StateWideSearchRequest
+
+    search = fake_jagriti.search
+
+    def flaky_search(body):
+        if body["commissionId"] == 11290526:
+            return {"status": 500, "message": "Mysore is down"}
+        return search(body)
+
+    fake_jagriti.search = flaky_search
+    fake_jagriti.cases = [make_case("A/1/2025"), make_case("A/1/2025"), make_case("B/2/2025")]
+
+    async def scenario():
+        service = CaseService(jagriti_client)
+        result = await service.search_state_wide(
+            StateWideSearchRequest(state="KARNATAKA", search_value="XYZ"), SearchType.RESPONDENT
+        )
+        assert [case.case_number for case in result.cases] == ["A/1/2025", "B/2/2025"]
+        assert result.total_count == 2
+        assert result.commissions_searched == 2
+        assert [(total.commission, total.total_count) for total in result.commission_totals] == [("Bangalore 1st & Rural Additional", 3)]
+        assert [failure.commission for failure in result.failures] == ["Mysore"]
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
+
+def test_iter_cases_walks_every_page(jagriti_client, fake_jagriti):
+    """Test auto-pagination using totalCount"""
+    fake_jagriti.cases = [make_case(f"C/{i}/2025") for i in range(5)]
+
+    async def scenario():
+        service = CaseService(jagriti_client)
+        request = _request(size=2)
+        commission_id = await service.resolve_commission(request)
+        cases = [case async for case in service.iter_cases(commission_id, request, SearchType.RESPONDENT)]
+        assert [case.case_number for case in cases] == [f"C/{i}/2025" for i in range(5)]
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
+
+def test_batch_search_returns_results_in_order(jagriti_client, fake_jagriti):
+    """Test batch searches with grouped resolution and per-item status"""
+    from app.models.base import SearchRoute
+    from app.models.case import BatchSearchItem
+
+    async def scenario():
+        service = CaseService(jagriti_client)
+        items = [
+            BatchSearchItem(search_type=SearchRoute.CASE_NUMBER, request=_request(search_value="A")),
+            BatchSearchItem(search_type=SearchRoute.CASE_NUMBER, request=_request(commission="Nowhere")),
+            BatchSearchItem(search_type=SearchRoute.RESPONDENT, request=_request(search_value="B")),
+        ]
+        response = await service.search_batch(items)
+        assert [result.index for result in response.results] == [0, 1, 2]
+        assert [result.status for result in response.results] == [200, 404, 200]
+        assert response.results[2].result.cases[0].case_number == "DC/79/CC/35/2025"
+        assert fake_jagriti.calls.count("/services/report/report/getDistrictCommissionByCommissionId") == 1
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
+
+def test_concurrent_identical_searches_share_one_pass(jagriti_client, fake_jagriti):
+    """Test that coalesced searches share the transformed response and store PDFs once"""
+    fake_jagriti.cases = [make_case("DC/79/CC/35/2025", documentBase64="JVBERi0=")]
+
+    async def scenario():
+        service = CaseService(jagriti_client)
+        registered = []
+
+        async def register_pdf(base64_data, case_number):
+            registered.append(case_number)
+            await asyncio.sleep(0.01)
+            return f"http://test/{case_number}"
+
+        service.pdf_service.register_pdf = register_pdf
+        responses = await asyncio.gather(*(
+            service.search_cases(_request(), SearchType.CASE_NUMBER) for _ in range(5)
+        ))
+        await jagriti_client.close()
+        return service, registered, responses
+
+    service, registered, responses = asyncio.run(scenario())
+    assert registered == ["DC/79/CC/35/2025"]
+    assert all(response is responses[0] for response in responses)
+    assert responses[0].cases[0].document_link == "http://test/DC/79/CC/35/2025"
+    assert service.coalescing_stats()["calls"] == 1
+    assert fake_jagriti.calls.count("/services/case/caseFilingService/v2/getCaseDetailsBySearchType") == 1
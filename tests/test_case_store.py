@@ -0,0 +1,289 @@
+"""
+Tests for the local SQLite case store
+"""
+import asyncio
+import sqlite3
+import pytest
+from app.models.base import SearchSource, SearchType
+from app.models.case import CaseResponse
+from app.services.case_service import CaseService, get_cache_status
+from app.services import case_store
+from app.services.case_store import CaseStore
+from app.utils.tokenize import tokenize_name
+from app.utils.exceptions import CaseSearchException
+from tests.conftest import make_case
+from tests.test_case_service import _request
+
+def _case(case_number: str, filing_date: str, complainant: str = "John Doe") -> CaseResponse:
+    return CaseResponse(
+        case_number=case_number,
+        case_stage="Hearing",
+        filing_date=filing_date,
+        complainant=complainant,
+        complainant_advocate="Adv. Reddy",
+        respondent="XYZ Ltd.",
+        respondent_advocate="Adv. Mehta",
+        document_link="",
+    )
+
+def test_cases_are_upserted_and_survive_reopening(tmp_path):
+    """Test batched upserts, indexed lookups and persistence"""
+    path = tmp_path / "cases.db"
+
+    async def write():
+        store = CaseStore(str(path), batch_size=2)
+        await store.put(1, [_case("A/1", "2025-01-10"), _case("A/2", "2025-02-10", "Jane 50% Doe")])
+        await store.put(1, [_case("A/1", "2025-01-10", "John Updated")])
+        await store.put(2, [_case("A/1", "2025-03-01")])
+        await store.close()
+        assert store.stats()["written"] == 4
+
+    async def read():
+        store = CaseStore(str(path))
+        assert await store.count() == 3
+
+        cases, total = await store.search(1, SearchType.CASE_NUMBER, "a/1", "2025-01-01", "2025-12-31", 0, 10)
+        assert total == 1
+        assert cases[0].complainant == "John Updated"
+
+        cases, total = await store.search(1, SearchType.COMPLAINANT, "doe", "2025-01-01", "2025-12-31", 0, 10)
+        assert [case.case_number for case in cases] == ["A/2"]
+        # LIKE wildcards in the search value match literally
+        _, total = await store.search(1, SearchType.COMPLAINANT, "50%", "2025-01-01", "2025-12-31", 0, 10)
+        assert total == 1
+
+        _, total = await store.search(1, SearchType.RESPONDENT, "xyz", "2025-02-01", "2025-12-31", 0, 10)
+        assert total == 1
+        await store.close()
+
+    asyncio.run(write())
+    asyncio.run(read())
+
+def test_failed_writes_are_retried_then_counted(tmp_path, monkeypatch):
+    """Test that a failing batch is retried a bounded number of times before it is dropped"""
+    monkeypatch.setattr(case_store, "WRITE_RETRY_DELAY", 0)
+    attempts = []
+    write_batch = CaseStore._write_batch
+
+    def flaky_write(conn, batch):
+        attempts.append(len(batch))
+        if len(attempts) in (1, 2) or len(attempts) >= 4:
+            raise sqlite3.OperationalError("database is locked")
+        write_batch(conn, batch)
+
+    monkeypatch.setattr(CaseStore, "_write_batch", staticmethod(flaky_write))
+
+    async def scenario():
+        store = CaseStore(str(tmp_path / "cases.db"))
+        await store.put(1, [_case("A/1", "2025-01-10")])
+        await store.flush()
+        assert (store.written, store.failed) == (1, 0)
+
+        await store.put(1, [_case("A/2", "2025-01-11")])
+        await store.flush()
+        assert len(attempts) == 3 + case_store.WRITE_ATTEMPTS
+        assert store.stats()["failed"] == 1
+        assert store.stats()["pending"] == 0
+        assert await store.count() == 1
+        await store.close()
+
+    asyncio.run(scenario())
+
+def test_search_sources(tmp_path, jagriti_client, fake_jagriti):
+    """Test local, auto and upstream answering of searches"""
+    fake_jagriti.cases = [make_case("DC/79/CC/35/2025", caseFilingDate="2025-02-01")]
+
+    async def scenario():
+        store = CaseStore(str(tmp_path / "cases.db"))
+        service = CaseService(jagriti_client, case_store=store)
+
+        # Nothing stored yet: auto falls through to the upstream search
+        await service.search_cases(_request(), SearchType.CASE_NUMBER, SearchSource.AUTO)
+        assert get_cache_status() == "MISS"
+        await store.flush()
+
+        # Stored rows are only what earlier searches returned, so auto keeps going upstream
+        await service.search_cases(_request(), SearchType.CASE_NUMBER, SearchSource.AUTO)
+        assert get_cache_status() == "HIT"
+
+        result = await service.search_cases(_request(), SearchType.CASE_NUMBER, SearchSource.LOCAL)
+        assert get_cache_status() == "LOCAL"
+        assert result.total_count == 1
+        assert result.cases[0].case_number == "DC/79/CC/35/2025"
+
+        empty = await service.search_cases(_request(search_value="nope"), SearchType.CASE_NUMBER, SearchSource.LOCAL)
+        assert empty.total_count == 0
+
+        with pytest.raises(CaseSearchException):
+            await service.search_cases(_request(), SearchType.JUDGE, SearchSource.LOCAL)
+
+        await store.close()
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
+
+def test_filing_dates_are_stored_as_iso(tmp_path):
+    """Test that day-first upstream dates are normalized so date range filters match them"""
+    async def scenario():
+        store = CaseStore(str(tmp_path / "cases.db"))
+        await store.put(1, [_case("A/1", "15-01-2025"), _case("A/2", "03/02/2025 10:30:00"), _case("A/3", "")])
+        await store.flush()
+
+        cases, total = await store.search(1, SearchType.RESPONDENT, "xyz", "2025-01-01", "2025-01-31", 0, 10)
+        assert total == 1
+        assert cases[0].filing_date == "2025-01-15"
+        cases, _ = await store.search(1, SearchType.RESPONDENT, "xyz", "2025-02-01", "2025-02-28", 0, 10)
+        assert [case.filing_date for case in cases] == ["2025-02-03"]
+        await store.close()
+
+    asyncio.run(scenario())
+
+def test_cases_serialize_alike_from_upstream_and_store(tmp_path, jagriti_client, fake_jagriti):
+    """Test that upstream and local answers carry the same ISO filing date"""
+    fake_jagriti.cases = [make_case("DC/79/CC/35/2025", caseFilingDate="01/02/2025")]
+
+    async def scenario():
+        store = CaseStore(str(tmp_path / "cases.db"))
+        service = CaseService(jagriti_client, case_store=store)
+        upstream = await service.search_cases(_request(), SearchType.CASE_NUMBER, SearchSource.UPSTREAM)
+        await store.flush()
+        local = await service.search_cases(_request(), SearchType.CASE_NUMBER, SearchSource.LOCAL)
+        assert upstream.cases[0].filing_date == "2025-02-01"
+        assert local.cases[0].model_dump() == upstream.cases[0].model_dump()
+        await store.close()
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
+
+def test_auto_search_falls_back_upstream_when_the_store_fails(tmp_path, jagriti_client, fake_jagriti):
+    """Test that a failing store only fails searches that require it"""
+    async def scenario():
+        store = CaseStore(str(tmp_path / "cases.db"))
+        service = CaseService(jagriti_client, case_store=store)
+
+        async def covered(*args):
+            return True
+
+        async def locked(*args):
+            raise sqlite3.OperationalError("database is locked")
+
+        service.store_coverage = covered
+        store.search = locked
+        result = await service.search_cases(_request(), SearchType.CASE_NUMBER, SearchSource.AUTO)
+        assert get_cache_status() == "MISS"
+        assert result.cases[0].case_number == fake_jagriti.cases[0]["caseNumber"]
+
+        with pytest.raises(CaseSearchException):
+            await service.search_cases(_request(), SearchType.CASE_NUMBER, SearchSource.LOCAL)
+
+        await store.close()
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
+
+def test_names_are_tokenized_and_normalized():
+    """Test honorific removal and folding of spelling variants"""
+    assert tokenize_name("Adv. Mohd. Lakshmi Narayan S/o Late Ramesh") == ["mohamad", "laxmi", "narayan", "rames"]
+    assert tokenize_name("M/s ABC Pvt. Ltd.") == tokenize_name("ABC Private Limited")
+    assert tokenize_name("Smt. Laxmi Choudhary") == tokenize_name("Lakshmi Chaudhary")
+    assert tokenize_name("Reddy") == tokenize_name("REDDI")
+    assert tokenize_name("Adv. M/s") == []
+
+def test_name_search_ranks_matches_across_commissions(tmp_path):
+    """Test prefix matching, ranking and field filters of the full-text index"""
+    async def scenario():
+        store = CaseStore(str(tmp_path / "cases.db"))
+        await store.put(1, [
+            _case("A/1", "2025-01-10", "Shri Lakshmi Narayan"),
+            _case("A/2", "2025-02-10", "Laxman Rao"),
+        ])
+        await store.put(2, [_case("B/1", "2025-03-01", "Narayan Traders")])
+        # A re-upserted case drops its old postings
+        await store.put(2, [_case("B/2", "2025-04-01", "Laxmi Devi"), _case("B/2", "2025-04-01", "Sita Devi")])
+        await store.flush()
+
+        terms, matches, total = await store.search_names("Laxmi Narayan")
+        assert terms == ["laxmi", "narayan"]
+        assert (total, matches[0].commission_id, matches[0].case.case_number) == (1, 1, "A/1")
+
+        # Prefix matches span commissions; exact beats prefix, then newest first
+        _, matches, total = await store.search_names("Narayan")
+        assert [match.case.case_number for match in matches] == ["B/1", "A/1"]
+        _, matches, total = await store.search_names("lax")
+        assert [match.case.case_number for match in matches] == ["A/2", "A/1"]
+        assert matches[0].fields == ["complainant"]
+
+        _, _, total = await store.search_names("reddy", fields=["respondent_advocate"])
+        assert total == 0
+        _, _, total = await store.search_names("reddy", fields=["complainant_advocate"], from_date="2025-02-01")
+        assert total == 3
+        await store.close()
+
+    asyncio.run(scenario())
+
+def test_name_search_matches_truncated_words(tmp_path):
+    """Test that prefixes cut short before or inside a folded spelling still match"""
+    async def scenario():
+        store = CaseStore(str(tmp_path / "cases.db"))
+        await store.put(1, [
+            _case("A/1", "2025-01-10", "Jayant Kumar"),
+            _case("A/2", "2025-02-10", "Lakshmi Devi"),
+            _case("A/3", "2025-03-10", "Jay Prakash"),
+            _case("A/4", "2025-04-10", "Choudhary Motors"),
+        ])
+        await store.flush()
+
+        found = {}
+        for query in ("Jay", "Lak", "Laks", "Lakshm", "Chaud", "Jayant Ku"):
+            _, matches, _ = await store.search_names(query)
+            found[query] = [match.case.case_number for match in matches]
+        await store.close()
+        return found
+
+    found = asyncio.run(scenario())
+    # The complete word "Jay" ranks above "Jayant" matched as a prefix
+    assert found["Jay"] == ["A/3", "A/1"]
+    assert found["Lak"] == found["Laks"] == found["Lakshm"] == ["A/2"]
+    assert found["Chaud"] == ["A/4"]
+    assert found["Jayant Ku"] == ["A/1"]
+
+def test_existing_databases_are_indexed_on_open(tmp_path):
+    """Test that stores written before the index existed are backfilled"""
+    path = tmp_path / "cases.db"
+
+    async def write():
+        store = CaseStore(str(path))
+        await store.put(3, [_case("C/1", "2025-01-10", "Mohd. Irfan")])
+        await store.close()
+
+    async def read():
+        store = CaseStore(str(path))
+        _, matches, _ = await store.search_names("Mohammed Irfan")
+        assert [match.case.case_number for match in matches] == ["C/1"]
+        await store.close()
+
+    asyncio.run(write())
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM postings")
+    asyncio.run(read())
+
+def test_local_search_service(tmp_path, jagriti_client):
+    """Test the cross-commission search through the case service"""
+    async def scenario():
+        service = CaseService(jagriti_client)
+        with pytest.raises(CaseSearchException):
+            await service.local_search("Laxmi")
+
+        service = CaseService(jagriti_client, case_store=CaseStore(str(tmp_path / "cases.db")))
+        await service.case_store.put(1, [_case("A/1", "2025-01-10", "Laxmi Devi")])
+        await service.case_store.flush()
+        result = await service.local_search("Lakshmi")
+        assert get_cache_status() == "LOCAL"
+        assert result.total_count == 1
+        assert result.hits[0].case.case_number == "A/1"
+        with pytest.raises(CaseSearchException):
+            await service.local_search("Adv.")
+        await service.case_store.close()
+        await jagriti_client.close()
+
+    asyncio.run(scenario())
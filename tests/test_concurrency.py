@@ -0,0 +1,76 @@
+"""
+Tests for the adaptive concurrency limiter
+"""
+import asyncio
+import pytest
+from app.utils.concurrency import AdaptiveLimiter
+from app.utils.exceptions import UpstreamOverloadedException
+
+def test_limit_grows_when_healthy_and_halves_on_errors():
+    """Test additive increase under load and one multiplicative cut per congestion event"""
+    async def scenario():
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=10)
+        for _ in range(20):
+            permits = [await limiter.acquire() for _ in range(int(limiter.limit))]
+            for permit in permits:
+                permit.latency = 0.01
+                permit.release()
+        assert limiter.limit > 4
+
+        grown = limiter.limit
+        permits = [await limiter.acquire() for _ in range(3)]
+        for permit in permits:
+            permit.release(dropped=True)
+        # The burst shares one congestion event
+        assert limiter.limit == pytest.approx(grown / 2)
+        assert limiter.stats()["decreases"] == 1
+
+    asyncio.run(scenario())
+
+def test_latency_growth_cuts_the_limit():
+    """Test that latency well above the baseline counts as congestion"""
+    async def scenario():
+        limiter = AdaptiveLimiter(initial_limit=8)
+        for latency in (0.1, 0.1, 0.1):
+            permit = await limiter.acquire("search")
+            permit.latency = latency
+            permit.release()
+        assert limiter.limit == 8
+
+        for _ in range(5):
+            permit = await limiter.acquire("search")
+            permit.latency = 1.0
+            permit.release()
+        assert limiter.limit < 8
+        # Catalog calls keep their own baseline
+        assert "states" not in limiter.stats()["baseline_latency"]
+
+    asyncio.run(scenario())
+
+def test_queued_callers_wait_with_a_deadline():
+    """Test FIFO handoff of freed slots and rejection after the queue timeout"""
+    async def scenario():
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1, queue_timeout=0.05)
+        held = await limiter.acquire()
+
+        with pytest.raises(UpstreamOverloadedException):
+            await limiter.acquire()
+        assert limiter.stats()["rejected"] == 1
+
+        waiter = asyncio.ensure_future(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        assert limiter.stats()["queued"] == 1
+        held.release(sample=False)
+        permit = await waiter
+        assert limiter.in_flight == 1
+
+        # A cancelled waiter gives up its place without leaking a slot
+        cancelled = asyncio.ensure_future(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        permit.release(sample=False)
+        assert limiter.in_flight == 0
+        assert limiter.stats()["queued"] == 0
+
+    asyncio.run(scenario())
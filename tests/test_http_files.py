@@ -0,0 +1,52 @@
+"""
+Tests for conditional and range-aware file responses
+"""
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.utils.http_files import file_response, parse_range_header
+
+def test_parse_range_header():
+    """Test single, suffix, open-ended, multiple and invalid ranges"""
+    assert parse_range_header("bytes=0-99", 1000) == [(0, 99)]
+    assert parse_range_header("bytes=-100", 1000) == [(900, 999)]
+    assert parse_range_header("bytes=990-", 1000) == [(990, 999)]
+    assert parse_range_header("bytes=0-1,5-9", 1000) == [(0, 1), (5, 9)]
+    assert parse_range_header("bytes=2000-", 1000) == []
+    assert parse_range_header("items=0-1", 1000) is None
+    assert parse_range_header("bytes=5-1", 1000) is None
+
+def _client(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-" + bytes(range(100)))
+    app = FastAPI()
+
+    @app.get("/doc")
+    async def doc(request: Request):
+        return file_response(request, path, etag='"abc"')
+
+    return TestClient(app)
+
+def test_conditional_get_and_ranges(tmp_path):
+    """Test 304, 206 and 416 responses"""
+    client = _client(tmp_path)
+    full = client.get("/doc")
+    assert full.status_code == 200
+    assert full.headers["etag"] == '"abc"'
+    assert full.headers["accept-ranges"] == "bytes"
+
+    assert client.get("/doc", headers={"If-None-Match": '"abc"'}).status_code == 304
+    assert client.get("/doc", headers={"If-Modified-Since": full.headers["last-modified"]}).status_code == 304
+
+    partial = client.get("/doc", headers={"Range": "bytes=0-4"})
+    assert partial.status_code == 206
+    assert partial.content == b"%PDF-"
+    assert partial.headers["content-range"] == "bytes 0-4/105"
+
+    multi = client.get("/doc", headers={"Range": "bytes=0-1,-2"})
+    assert multi.status_code == 206
+    assert multi.headers["content-type"].startswith("multipart/byteranges")
+    assert b"Content-Range: bytes 103-104/105" in multi.content
+
+    stale = client.get("/doc", headers={"Range": "bytes=0-4", "If-Range": '"old"'})
+    assert stale.status_code == 200
+    assert client.get("/doc", headers={"Range": "bytes=500-"}).status_code == 416
@@ -0,0 +1,96 @@
+"""
+Tests for the Jagriti client's connection handling
+"""
+import asyncio
+import httpx
+import pytest
+from app.services.jagriti_client import JagritiClient
+from app.utils.exceptions import ConnectionPoolExhaustedException, JagritiAPIError
+
+def test_pool_timeouts_are_reported_distinctly():
+    """Test that pool saturation is not reported as an upstream failure"""
+    def handler(request):
+        raise httpx.PoolTimeout("pool exhausted", request=request)
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.MockTransport(handler))
+        with pytest.raises(ConnectionPoolExhaustedException):
+            await client.get_states()
+        with pytest.raises(ConnectionPoolExhaustedException):
+            await client.get_case_details_by_search(11290525, 1, "DC")
+        pool = client.stats()["pool"]
+        assert pool["pool_timeouts"] == 2
+        assert pool["in_flight"] == 0
+        await client.close()
+
+    asyncio.run(scenario())
+
+def test_pool_stats_track_in_flight_requests(jagriti_client):
+    """Test request and peak in-flight counters"""
+    async def scenario():
+        await asyncio.gather(*(
+            jagriti_client.get_case_details_by_search(11290525, 1, f"DC/{i}") for i in range(3)
+        ))
+        pool = jagriti_client.pool_stats()
+        assert pool["requests"] == 3
+        assert pool["in_flight"] == 0
+        assert 1 <= pool["peak_in_flight"] <= 3
+        assert pool["pool_timeouts"] == 0
+
+    asyncio.run(scenario())
+
+def test_upstream_errors_stay_api_errors():
+    """Test that ordinary upstream failures keep their existing exception"""
+    async def scenario():
+        client = JagritiClient(transport=httpx.MockTransport(lambda request: httpx.Response(502)))
+        with pytest.raises(JagritiAPIError):
+            await client.get_commissions("11290000")
+        # 5xx responses still feed the adaptive limiter
+        assert client.stats()["limiter"]["dropped"] >= 1
+        await client.close()
+
+    asyncio.run(scenario())
+
+def test_state_catalog_errors_are_not_cached(jagriti_client, fake_jagriti):
+    """Test that an error body neither caches an empty catalog nor replaces a good one"""
+    async def scenario():
+        fake_jagriti.catalog_error = {"status": 500, "message": "maintenance"}
+        with pytest.raises(JagritiAPIError):
+            await jagriti_client.get_states()
+
+        fake_jagriti.catalog_error = None
+        states = await jagriti_client.get_states()
+
+        # A failed stale-while-revalidate refresh keeps serving the old catalog
+        jagriti_client._states_cache.ttl = 0
+        fake_jagriti.catalog_error = {"status": 500}
+        assert await jagriti_client.get_states() == states
+        await asyncio.sleep(0.01)
+        assert fake_jagriti.calls.count("/services/report/report/getStateCommissionAndCircuitBench") == 3
+        assert await jagriti_client.find_state_id_by_name("karnataka") == 11290000
+        await jagriti_client.close()
+        return states
+
+    assert len(asyncio.run(scenario())) == 2
+
+def test_commission_errors_keep_the_warm_entry(jagriti_client, fake_jagriti):
+    """Test that a state's commissions survive an upstream error body after warm-up"""
+    async def scenario():
+        assert await jagriti_client.prewarm_catalog() == 2
+        jagriti_client._commissions_cache.ttl = 0
+        fake_jagriti.catalog_error = {"status": 500}
+        commissions = await jagriti_client.get_commissions("11290000")
+        await asyncio.sleep(0.01)
+        commission_id = await jagriti_client.find_commission_id_by_name(11290000, "Mysore")
+
+        # A cold state is not seeded with an empty list
+        jagriti_client._commissions_cache.clear()
+        with pytest.raises(JagritiAPIError):
+            await jagriti_client.get_commissions("11290000")
+        assert len(jagriti_client._commissions_cache) == 0
+        await jagriti_client.close()
+        return commissions, commission_id
+
+    commissions, commission_id = asyncio.run(scenario())
+    assert len(commissions) == 2
+    assert commission_id == 11290526
@@ -0,0 +1,69 @@
+"""
+Tests for incremental JSON parsing of search responses
+"""
+import asyncio
+import base64
+import json
+import pytest
+from app.utils.json_stream import SpooledBlob, StreamingObjectParser
+from tests.conftest import make_case
+
+def _feed_all(parser, data: bytes, chunk_size: int):
+    elements = []
+    for start in range(0, len(data), chunk_size):
+        elements.extend(parser.feed(data[start:start + chunk_size]))
+    return elements, parser.close()
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_elements_are_yielded_incrementally(chunk_size):
+    """Test that array elements and top-level fields survive any chunking"""
+    document = {
+        "status": 200,
+        "message": "ok é",
+        "data": [make_case(f"DC/{i}/2025", score=i * 1.5, tags=["a", {"b": None}]) for i in range(3)],
+        "totalCount": 3,
+    }
+    parser = StreamingObjectParser(array_key="data")
+    elements, fields = _feed_all(parser, json.dumps(document, ensure_ascii=False).encode(), chunk_size)
+    assert elements == document["data"]
+    assert fields == {"status": 200, "message": "ok é", "data": [], "totalCount": 3}
+
+def test_spool_fields_are_diverted_to_blobs():
+    """Test that large string fields become SpooledBlobs, spilling to disk past the memory limit"""
+    pdf = b"%PDF-1.4 " + bytes(range(256)) * 200
+    encoded = base64.b64encode(pdf).decode()
+    document = {"status": 200, "data": [make_case("DC/1/2025", documentBase64=encoded)]}
+    # Escaped slashes are valid JSON and must be decoded on the way into the spool
+    body = json.dumps(document).replace("/", "\\/").encode()
+
+    parser = StreamingObjectParser(array_key="data", spool_fields=("documentBase64",), spool_memory=1024)
+    elements, _ = _feed_all(parser, body, 333)
+    blob = elements[0]["documentBase64"]
+    assert isinstance(blob, SpooledBlob)
+    assert elements[0]["caseNumber"] == "DC/1/2025"
+    assert len(blob) == len(encoded)
+    assert blob.read_text() == encoded
+    assert "".join(blob.iter_text(1000)) == encoded
+
+def test_truncated_and_malformed_documents_raise():
+    """Test that broken documents are reported as ValueError"""
+    parser = StreamingObjectParser()
+    parser.feed(b'{"status": 200, "data": [{"a": 1}')
+    with pytest.raises(ValueError):
+        parser.close()
+
+    with pytest.raises(ValueError):
+        StreamingObjectParser().feed(b"<html>")
+
+def test_client_streams_search_results(jagriti_client, fake_jagriti):
+    """Test the client's streaming search path end to end"""
+    encoded = base64.b64encode(b"%PDF-1.4 test").decode()
+    fake_jagriti.cases = [make_case("DC/1/2025", documentBase64=encoded), make_case("DC/2/2025")]
+
+    async def scenario():
+        data = await jagriti_client.get_case_details_by_search(11290525, 1, "DC")
+        assert data["totalCount"] == 2
+        assert [case["caseNumber"] for case in data["data"]] == ["DC/1/2025", "DC/2/2025"]
+        assert data["data"][0]["documentBase64"].read_text() == encoded
+
+    asyncio.run(scenario())
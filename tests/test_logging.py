@@ -0,0 +1,81 @@
+"""
+Tests for queued JSON logging and sampled per-case search logs
+"""
+import asyncio
+import importlib
+import io
+import json
+import logging
+import threading
+from app.config import settings
+from app.models.base import SearchType
+from app.services.case_service import CaseService
+from app.utils.logs import UVICORN_LOGGERS, setup_logging
+from tests.test_case_service import _request
+
+def test_records_are_written_as_json_by_the_listener():
+    """Test that records pass through the queue and are formatted on the writer thread"""
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level, {name: logging.getLogger(name).handlers[:] for name in UVICORN_LOGGERS}
+    stream = io.StringIO()
+    threads = []
+
+    class ThreadRecordingStream(io.StringIO):
+        def write(self, text):
+            threads.append(threading.current_thread())
+            return stream.write(text)
+
+    listener = setup_logging("INFO", stream=ThreadRecordingStream())
+    try:
+        logger = logging.getLogger("tests.logging")
+        logger.debug("not written %s", "at INFO")
+        logger.info("Searched %s cases", 30, extra={"commission_id": 11290525})
+        try:
+            raise ValueError("bad page")
+        except ValueError:
+            logger.exception("Search failed")
+        logging.getLogger("uvicorn.access").info('%s - "%s %s"', "127.0.0.1", "GET", "/states")
+    finally:
+        listener.stop()
+        root.handlers[:] = saved[0]
+        root.setLevel(saved[1])
+        for name, handlers in saved[2].items():
+            logging.getLogger(name).handlers[:] = handlers
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == [
+        "Searched 30 cases", "Search failed", '127.0.0.1 - "GET /states"'
+    ]
+    assert lines[0]["level"] == "INFO"
+    assert lines[0]["logger"] == "tests.logging"
+    assert lines[0]["commission_id"] == 11290525
+    assert "ValueError: bad page" in lines[1]["exception"]
+    assert threading.main_thread() not in threads
+
+def test_importing_the_app_leaves_logging_alone():
+    """Test that logging is only set up by the app lifespan, not as an import side effect"""
+    import app.main
+
+    root = logging.getLogger()
+    handlers, threads = root.handlers[:], threading.active_count()
+    importlib.reload(app.main)
+    assert root.handlers == handlers
+    assert threading.active_count() == threads
+
+def test_case_logs_are_sampled_debug(jagriti_client, fake_jagriti, monkeypatch, caplog):
+    """Test that per-case diagnostics are DEBUG only and follow the sample rate"""
+    fake_jagriti.cases = [dict(fake_jagriti.cases[0], caseNumber=f"DC/79/CC/{i}/2025") for i in range(20)]
+
+    def search(sample_rate, level):
+        monkeypatch.setattr(settings, "CASE_LOG_SAMPLE_RATE", sample_rate)
+        caplog.clear()
+        with caplog.at_level(level, logger="app.services.case_service"):
+            asyncio.run(CaseService(jagriti_client).search_cases(_request(size=30), SearchType.CASE_NUMBER))
+        return [r for r in caplog.records if r.getMessage().startswith("Case DC/79/CC/")]
+
+    assert search(1.0, logging.INFO) == []
+    assert search(0.0, logging.DEBUG) == []
+    records = search(1.0, logging.DEBUG)
+    assert len(records) == 20
+    assert records[0].levelno == logging.DEBUG
+    assert "fields: ['caseFilingDate'" in records[0].getMessage()
@@ -0,0 +1,63 @@
+"""
+Tests for metrics recording and the Prometheus text rendering
+"""
+import asyncio
+import threading
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.testclient import TestClient
+from app.middleware.metrics import setup_metrics
+from app.utils.metrics import REGISTRY, Counter, Histogram
+
+def test_metrics_sum_thread_cells_and_render():
+    """Test that per-thread recordings are summed into cumulative buckets"""
+    counter = Counter("test_bytes_total", "Bytes", ("kind",))
+    histogram = Histogram("test_duration_seconds", "Duration", ("endpoint",), buckets=(0.1, 1.0))
+
+    def record():
+        for _ in range(1000):
+            counter.inc(2, "pdf")
+        histogram.observe(0.5, "search")
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    histogram.observe(0.05, "search")
+
+    assert 'test_bytes_total{kind="pdf"} 8000' in counter.render()
+    lines = histogram.render()
+    assert 'test_duration_seconds_bucket{endpoint="search",le="0.1"} 1' in lines
+    assert 'test_duration_seconds_bucket{endpoint="search",le="1"} 5' in lines
+    assert 'test_duration_seconds_bucket{endpoint="search",le="+Inf"} 5' in lines
+    assert 'test_duration_seconds_count{endpoint="search"} 5' in lines
+
+def test_requests_are_recorded_by_route_template(jagriti_client):
+    """Test route, status and cache labels from the middleware, and upstream timings"""
+    router = APIRouter(prefix="/cases")
+
+    @router.get("/download/{filename}")
+    async def download(filename: str, response: Response):
+        response.headers["X-Cache"] = "HIT"
+        return {"filename": filename}
+
+    app = FastAPI()
+    app.include_router(router)
+    setup_metrics(app)
+    client = TestClient(app)
+    assert client.get("/cases/download/a.pdf").status_code == 200
+    assert client.get("/cases/download/b.pdf").status_code == 200
+    assert client.get("/elsewhere").status_code == 404
+
+    async def fetch_states():
+        await jagriti_client.get_states()
+        await jagriti_client.close()
+
+    asyncio.run(fetch_states())
+
+    text = REGISTRY.render()
+    assert 'http_request_duration_seconds_count{route="/cases/download/{filename}",method="GET",status="200"}' in text
+    assert 'search_cache_results_total{route="/cases/download/{filename}",status="HIT"}' in text
+    assert "/elsewhere" not in text
+    assert 'jagriti_request_duration_seconds_count{endpoint="states",outcome="ok"}' in text
+    assert 'jagriti_requests_in_flight{endpoint="states"} 0' in text
@@ -0,0 +1,123 @@
+"""
+Tests for PDF storage
+"""
+import asyncio
+import base64
+import io
+import threading
+from app.services.pdf_service import PDFService, BASE64_CHUNK_CHARS
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 2000 + b"\n%%EOF"
+
+def test_chunked_decode_matches_b64decode():
+    """Test chunked decoding across chunk boundaries and embedded newlines"""
+    encoded = base64.encodebytes(PDF_BYTES).decode()
+    assert len(encoded) > BASE64_CHUNK_CHARS
+    out = io.BytesIO()
+    assert PDFService._decode_base64_to(encoded, out) == len(PDF_BYTES)
+    assert out.getvalue() == PDF_BYTES
+
+def test_write_behind_store_is_visible_after_wait(tmp_path):
+    """Test that write-behind returns the URL first and downloads wait for the write"""
+    async def scenario():
+        service = PDFService(storage_dir=str(tmp_path))
+        url = await service.store_pdf_async(base64.b64encode(PDF_BYTES).decode(), "DC/79/CC/35/2025")
+        assert url.endswith("/cases/download/case_DC_79_CC_35_2025.pdf")
+        await service.wait_for_pdf_by_case_number("DC/79/CC/35/2025")
+        assert service.get_pdf_by_case_number("DC/79/CC/35/2025").read_bytes() == PDF_BYTES
+        assert not list(tmp_path.glob("*.tmp"))
+        await service.close()
+
+    asyncio.run(scenario())
+
+def test_identical_documents_are_stored_once(tmp_path):
+    """Test content-addressed dedupe and the persisted filename index"""
+    encoded = base64.b64encode(PDF_BYTES).decode()
+    service = PDFService(storage_dir=str(tmp_path))
+    service.store_pdf(encoded, "A/1/2025")
+    service.store_pdf(encoded, "B/2/2025")
+    objects = list((tmp_path / "objects").rglob("*.pdf"))
+    assert len(objects) == 1
+    assert service.get_pdf_by_case_number("A/1/2025") == objects[0]
+
+    reopened = PDFService(storage_dir=str(tmp_path))
+    assert reopened.get_pdf_path("case_B_2_2025.pdf") == objects[0]
+    assert reopened.delete_pdf("case_B_2_2025.pdf")
+    assert PDFService(storage_dir=str(tmp_path)).get_pdf_path("case_B_2_2025.pdf") is None
+
+def test_streamed_upload_is_validated_and_stored(tmp_path):
+    """Test raw streaming uploads: magic-byte check, size limit and storage"""
+    import pytest
+    from app.config import settings
+    from app.utils.exceptions import DocumentTooLargeException, InvalidDocumentException
+
+    async def chunks(data, size=4096):
+        # A short first chunk splits the PDF header across chunks
+        yield data[:3]
+        for start in range(3, len(data), size):
+            yield data[start:start + size]
+
+    async def scenario():
+        service = PDFService(storage_dir=str(tmp_path))
+        index_threads = []
+        index_set = service.index.set
+        service.index.set = lambda *args: index_threads.append(threading.current_thread()) or index_set(*args)
+        await service.store_pdf_stream(chunks(PDF_BYTES), "A/1/2025")
+        assert service.get_pdf_by_case_number("A/1/2025").read_bytes() == PDF_BYTES
+        # The index log is appended to off the event loop
+        assert index_threads and threading.main_thread() not in index_threads
+        with pytest.raises(InvalidDocumentException):
+            await service.store_pdf_stream(chunks(b"GIF89a" + PDF_BYTES), "A/2/2025")
+        limit = settings.PDF_MAX_UPLOAD_BYTES
+        settings.PDF_MAX_UPLOAD_BYTES = 1024
+        try:
+            with pytest.raises(DocumentTooLargeException):
+                await service.store_pdf_stream(chunks(PDF_BYTES), "A/3/2025")
+        finally:
+            settings.PDF_MAX_UPLOAD_BYTES = limit
+        assert not list(tmp_path.rglob("*.tmp"))
+        await service.close()
+
+    asyncio.run(scenario())
+
+def test_deferred_pdf_is_materialized_on_download(tmp_path):
+    """Test lazy mode: nothing is written until the document is requested"""
+    async def scenario():
+        service = PDFService(storage_dir=str(tmp_path))
+        url = await service.defer_pdf(base64.b64encode(PDF_BYTES).decode(), "A/1/2025")
+        assert url.endswith("/cases/download/case_A_1_2025.pdf")
+        assert service.get_pdf_path("case_A_1_2025.pdf") is None
+        await service.wait_for_pdf("case_A_1_2025.pdf")
+        assert service.get_pdf_path("case_A_1_2025.pdf").read_bytes() == PDF_BYTES
+
+        # Deferred documents left at shutdown are still stored
+        await service.defer_pdf(base64.b64encode(b"%PDF-2").decode(), "B/2/2025")
+        await service.close()
+        assert service.get_pdf_by_case_number("B/2/2025").read_bytes() == b"%PDF-2"
+
+    asyncio.run(scenario())
+
+def test_spooled_blobs_are_closed_once_stored(tmp_path):
+    """Test that spooled base64 data is released after its write and when a deferred copy is replaced"""
+    from app.utils.json_stream import SpooledBlob
+
+    def blob():
+        spooled = SpooledBlob(max_memory=16)
+        spooled.write(base64.b64encode(PDF_BYTES).decode())
+        return spooled
+
+    async def scenario():
+        service = PDFService(storage_dir=str(tmp_path))
+        stored, replaced, deferred = blob(), blob(), blob()
+        await service.store_pdf_async(stored, "DC/1/2025", wait=True)
+        await service.defer_pdf(replaced, "DC/2/2025")
+        await service.defer_pdf(deferred, "DC/2/2025")
+        assert replaced._file.closed and not deferred._file.closed
+        await service.wait_for_pdf_by_case_number("DC/2/2025")
+        await asyncio.sleep(0)
+        assert service.get_pdf_by_case_number("DC/2/2025").read_bytes() == PDF_BYTES
+        await service.close()
+        return stored, deferred
+
+    stored, deferred = asyncio.run(scenario())
+    assert stored._file.closed and deferred._file.closed
@@ -0,0 +1,144 @@
+"""
+Tests for retries, circuit breaking and hedging
+"""
+import asyncio
+import httpx
+import pytest
+from app.config import settings
+from app.models.base import SearchType
+from app.services.case_service import CaseService, get_cache_status
+from app.services.jagriti_client import JagritiClient
+from app.utils.exceptions import CaseSearchException, CircuitOpenException
+from app.utils.resilience import CircuitBreaker, RetryBudget, backoff_delay, hedged
+from tests.conftest import FakeJagriti
+from tests.test_case_service import _request
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "JAGRITI_RETRY_BASE_DELAY", 0.001)
+    monkeypatch.setattr(settings, "JAGRITI_RETRY_MAX_DELAY", 0.001)
+
+def test_backoff_budget_and_breaker():
+    """Test jittered backoff bounds, budget exhaustion and breaker transitions"""
+    assert all(0 <= backoff_delay(retry, 0.1, 0.5) <= min(0.5, 0.1 * 2 ** (retry - 1)) for retry in range(1, 8))
+
+    budget = RetryBudget(ratio=0.5, min_per_second=0, max_tokens=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+    breaker = CircuitBreaker("search", failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    # reset_timeout has passed, so a single probe is let through
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_hedged_takes_the_first_response():
+    """Test that a slow attempt is raced by a hedge and then cancelled"""
+    started = []
+
+    async def attempt():
+        started.append(1)
+        await asyncio.sleep(1 if len(started) == 1 else 0.01)
+        return len(started)
+
+    async def scenario():
+        assert await hedged(attempt, 0.02, lambda: True) == 2
+        assert len(started) == 2
+
+    asyncio.run(scenario())
+
+def test_transient_errors_are_retried():
+    """Test that a 503 followed by a good response succeeds"""
+    fake = FakeJagriti()
+    responses = [httpx.Response(503)]
+
+    def handler(request):
+        if responses:
+            return responses.pop()
+        return fake.handler(request)
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.MockTransport(handler))
+        states = await client.get_states()
+        assert len(states) == 2
+        assert client.resilience_stats()["retries"] == 1
+        await client.close()
+
+    asyncio.run(scenario())
+
+def test_open_circuit_fails_fast_and_serves_stale_results(monkeypatch):
+    """Test that an open search circuit short-circuits calls and falls back to cached results"""
+    monkeypatch.setattr(settings, "JAGRITI_BREAKER_FAILURE_THRESHOLD", 1)
+    monkeypatch.setattr(settings, "JAGRITI_RETRY_ATTEMPTS", 1)
+    fake = FakeJagriti()
+    upstream = {"down": False, "searches": 0}
+
+    def handler(request):
+        if request.url.path.endswith("getCaseDetailsBySearchType"):
+            upstream["searches"] += 1
+            if upstream["down"]:
+                return httpx.Response(502)
+        return fake.handler(request)
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.MockTransport(handler))
+        service = CaseService(client)
+        await service.search_cases(_request(), SearchType.CASE_NUMBER)
+        # Expire the cached result without dropping it
+        for entry in service.result_cache._entries.values():
+            entry.expires_at = 0
+
+        upstream["down"] = True
+        with pytest.raises(CaseSearchException):
+            await client.get_case_details_by_search(11290525, 1, "other")
+        assert client.resilience_stats()["circuits"]["search"]["state"] == "open"
+
+        searches = upstream["searches"]
+        with pytest.raises(CircuitOpenException):
+            await client.get_case_details_by_search(11290525, 1, "other")
+
+        result = await service.search_cases(_request(), SearchType.CASE_NUMBER)
+        assert get_cache_status() == "STALE"
+        assert result.cases[0].case_number == "DC/79/CC/35/2025"
+        # Neither call reached the upstream
+        assert upstream["searches"] == searches
+        await client.close()
+
+    asyncio.run(scenario())
+
+def test_cancelled_probe_releases_the_circuit(monkeypatch):
+    """Test that cancelling a half-open probe lets the next call probe again"""
+    monkeypatch.setattr(settings, "JAGRITI_BREAKER_FAILURE_THRESHOLD", 1)
+    monkeypatch.setattr(settings, "JAGRITI_RETRY_ATTEMPTS", 1)
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.MockTransport(FakeJagriti().handler))
+        breaker = client._breakers["states"]
+        breaker.record_failure()
+        breaker.reset_timeout = 0
+        hanging = asyncio.Event()
+
+        async def hang():
+            await hanging.wait()
+
+        probe = asyncio.ensure_future(client._resilient("states", hang))
+        await asyncio.sleep(0)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert await client._resilient("states", lambda: asyncio.sleep(0, "ok")) == "ok"
+        assert breaker.state == CircuitBreaker.CLOSED
+        await client.close()
+
+    asyncio.run(scenario())
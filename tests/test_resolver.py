@@ -0,0 +1,33 @@
+"""
+Tests for the name resolution index
+"""
+from app.utils.resolver import NameIndex
+
+COMMISSIONS = [
+    {"commissionId": 1, "commissionNameEn": "Bangalore 1st & Rural Additional"},
+    {"commissionId": 2, "commissionNameEn": "Bangalore Urban"},
+    {"commissionId": 3, "commissionNameEn": "Mysore"},
+    {"commissionId": 4, "commissionNameEn": "Rural Bangalore"},
+]
+
+def test_exact_match_is_case_and_whitespace_insensitive():
+    """Test exact matches through the normalized hash map"""
+    index = NameIndex(COMMISSIONS)
+    assert index.find_id("  mysore ") == 3
+    assert index.find_id("bangalore   urban") == 2
+
+def test_partial_match_ranking_is_deterministic():
+    """Test ranking of ambiguous partial matches"""
+    index = NameIndex(COMMISSIONS)
+    # Prefix matches beat later matches, shorter names beat longer ones
+    assert index.find_id("BANGALORE") == 2
+    assert index.find_id("rural") == 4
+    assert index.find_id("1st") == 1
+
+def test_missing_names_and_id_lookup():
+    """Test misses, short queries and lookups by ID"""
+    index = NameIndex(COMMISSIONS)
+    assert index.find("Chennai") is None
+    assert index.find("Chennai") is None
+    assert index.find_id("my") == 3
+    assert index.get_by_id("4")["commissionNameEn"] == "Rural Bangalore"
@@ -0,0 +1,66 @@
+"""
+Tests for pre-serialized catalog bodies and direct model responses
+"""
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.dependencies import get_case_service, get_jagriti_client
+from app.api.v1 import cases, commissions, states
+from app.models.case import CaseResponse, CaseSearchResponse
+from app.services.case_service import CaseService
+from app.utils.helpers import transform_case_data
+from app.utils.responses import FastJSONResponse
+from tests.conftest import COMMISSIONS, STATES, make_case
+
+def _app(jagriti_client):
+    app = FastAPI()
+    for module in (states, commissions, cases):
+        app.include_router(module.router)
+    app.dependency_overrides[get_jagriti_client] = lambda: jagriti_client
+    app.dependency_overrides[get_case_service] = lambda: CaseService(jagriti_client)
+    return app
+
+def test_catalog_bodies_are_serialized_once(jagriti_client, fake_jagriti):
+    """Test that /states and /commissions reuse their body until the catalog changes"""
+    with TestClient(_app(jagriti_client)) as client:
+        first = client.get("/states")
+        second = client.get("/states")
+        commission_list = client.get("/commissions/11290000")
+
+    assert first.headers["content-type"] == "application/json"
+    assert first.json() == {"success": True, "message": "Success", "states": STATES}
+    assert second.content == first.content
+    assert states._bodies.stats()["hits"] >= 1
+    assert commission_list.json()["commissions"] == COMMISSIONS
+    assert fake_jagriti.calls.count("/services/report/report/getStateCommissionAndCircuitBench") == 1
+
+def test_search_response_matches_validated_model(jagriti_client, fake_jagriti):
+    """Test that the unvalidated search path serializes exactly like the validated model"""
+    fake_jagriti.cases = [make_case("DC/79/CC/35/2025", caseFilingDate=None, complainantName=1234)]
+    body = {"state": "karnataka", "commission": "Bangalore 1st", "search_value": "DC/79/CC/35/2025"}
+    with TestClient(_app(jagriti_client)) as client:
+        response = client.post("/cases/by-case-number", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "MISS"
+    expected = CaseSearchResponse(
+        cases=[CaseResponse(**transform_case_data(fake_jagriti.cases[0]))], total_count=1, page=0, size=30
+    )
+    assert response.content == expected.model_dump_json().encode()
+    assert response.json()["cases"][0]["complainant"] == "1234"
+    assert response.json()["cases"][0]["filing_date"] == ""
+
+def test_null_total_count_falls_back_to_the_page(jagriti_client, fake_jagriti):
+    """Test that a null totalCount from upstream does not fail the search"""
+    fake_jagriti.search = lambda body: {"status": 200, "data": fake_jagriti.cases, "totalCount": None}
+    body = {"state": "karnataka", "commission": "Bangalore 1st", "search_value": "DC/79/CC/35/2025"}
+    with TestClient(_app(jagriti_client)) as client:
+        response = client.post("/cases/by-case-number", json=body)
+
+    assert response.status_code == 200
+    assert response.json()["total_count"] == len(fake_jagriti.cases)
+
+def test_plain_content_is_compact_json():
+    """Test that non-model content is encoded like JSONResponse"""
+    assert json.loads(FastJSONResponse({"a": [1, "न"]}).body) == {"a": [1, "न"]}
+    assert b" " not in FastJSONResponse({"a": [1, 2]}).body
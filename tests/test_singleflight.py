@@ -0,0 +1,43 @@
+"""
+Tests for request coalescing
+"""
+import asyncio
+import pytest
+from app.utils.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_result():
+    """Test that identical concurrent calls run once"""
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"status": 200}
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("states", fetch) for _ in range(5)))
+        assert all(result is results[0] for result in results)
+        assert len(calls) == 1
+        assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    asyncio.run(scenario())
+
+def test_errors_propagate_to_every_waiter():
+    """Test that a failed call raises for all coalesced callers"""
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(
+            *(flight.do("search", fetch) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        # A later call starts a fresh request
+        with pytest.raises(RuntimeError):
+            await flight.do("search", fetch)
+        assert flight.calls == 2
+
+    asyncio.run(scenario())
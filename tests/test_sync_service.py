@@ -0,0 +1,173 @@
+"""
+Tests for the background commission sync
+"""
+import asyncio
+import json
+import sqlite3
+from datetime import date
+import httpx
+from app.config import settings
+from app.models.base import SearchSource, SearchType
+from app.services.case_service import CaseService, get_cache_status
+from app.services import case_store
+from app.services.case_store import CaseStore
+from app.services.jagriti_client import JagritiClient
+from app.services.sync_service import SyncService
+from app.utils.concurrency import TokenBucket
+from tests.conftest import FakeJagriti, make_case
+from tests.test_case_service import _request
+
+class DatedJagriti(FakeJagriti):
+    """Fake Jagriti that filters searches by filing date and can fail chosen requests"""
+
+    def __init__(self):
+        super().__init__()
+        self.cases = [make_case(f"DC/{day}/2025", caseFilingDate=f"2025-01-{day:02d}") for day in range(1, 21)]
+        self.searches = []
+        self.fail = None
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("getCaseDetailsBySearchType"):
+            body = json.loads(request.content)
+            self.searches.append((body["fromDate"], body["toDate"], body["page"]))
+            if self.fail and self.fail(body):
+                return httpx.Response(502)
+        return super().handler(request)
+
+    def search(self, body):
+        cases = [case for case in self.cases if body["fromDate"] <= case["caseFilingDate"] <= body["toDate"]]
+        start = body["page"] * body["size"]
+        return {"status": 200, "data": cases[start:start + body["size"]], "totalCount": len(cases)}
+
+def test_token_bucket_paces_calls():
+    """Test that calls beyond the burst wait for tokens"""
+    async def scenario():
+        bucket = TokenBucket(rate=100, burst=2)
+        for _ in range(4):
+            await bucket.acquire()
+        assert bucket.waited > 0
+
+    asyncio.run(scenario())
+
+def test_sync_resumes_and_fetches_only_new_filings(tmp_path, monkeypatch):
+    """Test windowed paging, crash resume, incremental runs and local answers"""
+    monkeypatch.setattr(settings, "JAGRITI_RETRY_ATTEMPTS", 1)
+    fake = DatedJagriti()
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.MockTransport(fake.handler))
+        store = CaseStore(str(tmp_path / "cases.db"))
+        service = CaseService(client, case_store=store)
+
+        def make_sync():
+            return SyncService(
+                service, store, [11290525], start_date="2025-01-01", window_days=7, page_size=2, rate=1000
+            )
+
+        # The second window fails on its second page
+        fake.fail = lambda body: body["fromDate"] == "2025-01-08" and body["page"] == 1
+        sync = make_sync()
+        await sync.run_once(today=date(2025, 1, 20))
+        assert sync.stats()["errors"] == 1
+        assert await sync.progress() == [{
+            "commission_id": 11290525,
+            "synced_through": "2025-01-07",
+            "window_from": "2025-01-08",
+            "window_to": "2025-01-14",
+            "next_page": 1,
+        }]
+
+        # A new instance, as after a restart, resumes at the failed page
+        fake.fail = None
+        fake.searches.clear()
+        await make_sync().run_once(today=date(2025, 1, 20))
+        assert fake.searches[0] == ("2025-01-08", "2025-01-14", 1)
+        assert await store.count() == 20
+        assert (await sync.progress())[0]["synced_through"] == "2025-01-20"
+
+        # Later runs only fetch from the high-water mark, less the overlap day
+        fake.cases.append(make_case("DC/21/2025", caseFilingDate="2025-01-21"))
+        fake.searches.clear()
+        await make_sync().run_once(today=date(2025, 1, 21))
+        assert fake.searches == [("2025-01-20", "2025-01-21", 0)]
+        assert await store.count() == 21
+
+        # Synced cases answer user searches in synced windows without an upstream call
+        searches = len(fake.searches)
+        synced = dict(from_date="2025-01-01", to_date="2025-01-21")
+        result = await service.search_cases(_request(search_value="DC/21/2025", **synced), SearchType.CASE_NUMBER, SearchSource.AUTO)
+        assert get_cache_status() == "LOCAL"
+        assert result.cases[0].case_number == "DC/21/2025"
+        empty = await service.search_cases(_request(search_value="DC/99/2025", **synced), SearchType.CASE_NUMBER, SearchSource.AUTO)
+        assert get_cache_status() == "LOCAL"
+        assert empty.total_count == 0
+        assert len(fake.searches) == searches
+
+        # Windows past the high-water mark, and unsynced commissions, are searched upstream
+        await service.search_cases(_request(search_value="DC/21/2025", to_date="2025-01-31"), SearchType.CASE_NUMBER, SearchSource.AUTO)
+        assert get_cache_status() == "MISS"
+        await service.search_cases(
+            _request(search_value="DC/21/2025", commission="Mysore", **synced), SearchType.CASE_NUMBER, SearchSource.AUTO
+        )
+        assert get_cache_status() == "MISS"
+        assert len(fake.searches) == searches + 2
+
+        await store.close()
+        await client.close()
+
+    asyncio.run(scenario())
+
+def test_sync_does_not_advance_past_dropped_cases(tmp_path, monkeypatch):
+    """Test that a page whose cases the store dropped is fetched again on the next run"""
+    monkeypatch.setattr(case_store, "WRITE_RETRY_DELAY", 0)
+    fake = DatedJagriti()
+    write_batch = CaseStore._write_batch
+    broken = [True]
+
+    def failing_write(conn, batch):
+        if broken[0]:
+            raise sqlite3.OperationalError("disk I/O error")
+        write_batch(conn, batch)
+
+    monkeypatch.setattr(CaseStore, "_write_batch", staticmethod(failing_write))
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.MockTransport(fake.handler))
+        store = CaseStore(str(tmp_path / "cases.db"))
+        sync = SyncService(CaseService(client, case_store=store), store, [11290525], page_size=10, rate=1000)
+
+        await sync.run_once(today=date(2025, 1, 7))
+        assert sync.stats()["errors"] == 1
+        assert await sync.progress() == []
+        assert not await sync.covers(11290525, "2025-01-01", "2025-01-07")
+
+        broken[0] = False
+        await sync.run_once(today=date(2025, 1, 7))
+        assert await store.count() == 7
+        assert await sync.covers(11290525, "2025-01-01", "2025-01-07")
+
+        await store.close()
+        await client.close()
+
+    asyncio.run(scenario())
+
+def test_sync_pages_skip_the_result_cache(tmp_path):
+    """Test that sync pages are clamped to a valid size and stay out of the result cache"""
+    fake = DatedJagriti()
+
+    async def scenario():
+        client = JagritiClient(transport=httpx.MockTransport(fake.handler))
+        store = CaseStore(str(tmp_path / "cases.db"))
+        service = CaseService(client, case_store=store)
+        sync = SyncService(service, store, [11290525], page_size=500, rate=1000)
+        assert sync.page_size == 100
+
+        await sync.run_once(today=date(2025, 1, 7))
+        assert sync.stats()["errors"] == 0
+        assert await store.count() == 7
+        assert len(service.result_cache) == 0
+
+        await store.close()
+        await client.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,53 @@
+"""
+Tests for request phase timing and the Server-Timing header
+"""
+import asyncio
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.timing import setup_server_timing
+from app.models.base import SearchType
+from app.services.case_service import CaseService
+from app.utils.timing import current_timer, end_request_timer, span, start_request_timer
+from tests.test_case_service import _request
+
+def test_search_phases_are_timed(jagriti_client):
+    """Test that a search reports its resolution, upstream and per-case phases"""
+    async def scenario():
+        timer, token = start_request_timer()
+        try:
+            await CaseService(jagriti_client).search_cases(_request(), SearchType.CASE_NUMBER)
+        finally:
+            end_request_timer(token)
+        await jagriti_client.close()
+        return timer
+
+    timer = asyncio.run(scenario())
+    assert list(timer.phases) == ["state", "commission", "upstream", "transform"]
+    assert timer.phases["transform"][1] == 1
+    assert current_timer() is None
+
+    # Outside a timed request spans are no-ops
+    with span("upstream"):
+        pass
+
+def test_server_timing_header_and_slow_log(caplog):
+    """Test the header on responses and the slow request log line"""
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        for _ in range(3):
+            with span("pdf"):
+                await asyncio.sleep(0.01)
+        return {}
+
+    setup_server_timing(app, slow_request_seconds=0.02)
+    with caplog.at_level(logging.WARNING, logger="app.middleware.timing"):
+        response = TestClient(app).get("/work")
+
+    header = response.headers["server-timing"]
+    assert header.startswith('pdf;dur=')
+    assert ';desc="3 calls", total;dur=' in header
+    assert "Slow request GET /work" in caplog.text
+    assert "pdf=" in caplog.text